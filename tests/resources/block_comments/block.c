@@ -0,0 +1,6 @@
+/*
+ * TODO Title | Body of a block comment #docs
+ */
+int main() {
+    return 0; // FIXME line comment
+}
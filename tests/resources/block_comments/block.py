@@ -0,0 +1,12 @@
+def documented():
+    '''
+    TODO Document this function
+    '''
+    return 1
+
+
+def flagged():
+    '''
+    FIXME this one is ignored # todoon
+    '''
+    return 2  # TODO a line comment is still found
@@ -0,0 +1,3 @@
+# TODO first
+x = 1
+# FIXME second
@@ -0,0 +1,32 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+RESOURCES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources")
+
+
+class TemporaryDirectoryTestCase(unittest.TestCase):
+    """
+    Runs each test in the CWD of a new temporary directory, removed once the test is done
+    """
+
+    # A directory of tests/resources copied into the temporary directory, e.g. "todo_and_fixme", if any
+    resource = None
+
+    def setUp(self):
+        self.old_dir = os.getcwd()
+        self.directory = os.path.realpath(tempfile.mkdtemp())
+
+        if self.resource is not None:
+            shutil.copytree(
+                os.path.join(RESOURCES, self.resource),
+                self.directory,
+                dirs_exist_ok=True,
+            )
+
+        os.chdir(self.directory)
+
+    def tearDown(self):
+        os.chdir(self.old_dir)
+        shutil.rmtree(self.directory)
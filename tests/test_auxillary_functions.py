@@ -1,3 +1,4 @@
+import io
 import os
 import unittest
 
@@ -37,6 +38,51 @@ class TestLocalization(unittest.TestCase):
         self.assertEqual(region, "windows_nt")
 
 
+class TestPrintWrap(unittest.TestCase):
+    def setUp(self):
+        todo_or_not.utility.flush_output()
+
+    def test_messages_are_only_built_if_printed(self):
+        built = []
+
+        def _build():
+            built.append(True)
+            return "built"
+
+        stream = io.StringIO()
+
+        todo_or_not.utility.print_wrap(
+            _build,
+            msg_level=todo_or_not.utility.LOG_LEVEL_VERBOSE,
+            log_level=todo_or_not.utility.LOG_LEVEL_NORMAL,
+            file=stream,
+        )
+        todo_or_not.utility.flush_output()
+
+        self.assertEqual(built, [])
+        self.assertEqual(stream.getvalue(), "")
+
+        todo_or_not.utility.print_wrap(_build, file=stream)
+        todo_or_not.utility.flush_output()
+
+        self.assertEqual(built, [True])
+        self.assertEqual(stream.getvalue(), "built\n")
+
+    def test_lines_are_buffered_in_order(self):
+        first, second = io.StringIO(), io.StringIO()
+
+        todo_or_not.utility.print_wrap("a", file=first)
+        todo_or_not.utility.print_wrap("b", file=first)
+        self.assertEqual(first.getvalue(), "")
+
+        # A line for another stream writes out the lines before it
+        todo_or_not.utility.print_wrap("c", file=second)
+        self.assertEqual(first.getvalue(), "a\nb\n")
+
+        todo_or_not.utility.flush_output()
+        self.assertEqual(second.getvalue(), "c\n")
+
+
 def test_get_encoding_file_not_exists():
     assert todo_or_not.todo_check.get_encoding("!*&^#(#)@@", []) is None
 
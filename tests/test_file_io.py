@@ -1,3 +1,4 @@
+import io
 import os
 import unittest
 
@@ -47,6 +48,24 @@ class TestFileEncoding(unittest.TestCase):
         self.assertIsNone(encoding)
 
 
+class TestReadPaths(unittest.TestCase):
+    def test_newlines(self):
+        stream = io.BytesIO(b"a.py\r\n\nsub/b.py\nc.py")
+
+        self.assertEqual(
+            list(todo_or_not.todo_check.read_paths(stream)),
+            ["a.py", "sub/b.py", "c.py"],
+        )
+
+    def test_null_across_chunks(self):
+        stream = io.BytesIO(b"with\nnewline.py\0long_name.py\0\0")
+
+        self.assertEqual(
+            list(todo_or_not.todo_check.read_paths(stream, null=True, chunk_size=4)),
+            ["with\nnewline.py", "long_name.py"],
+        )
+
+
 class TestTodoIgnoreHelpers(unittest.TestCase):
 
     def setUp(self):
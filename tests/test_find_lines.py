@@ -6,11 +6,13 @@ import unittest.mock
 import todo_or_not.todo_check
 import todo_or_not.localize
 from todo_or_not.todo_hit import Hit
+from todo_or_not.todo_settings import Settings
 
 
 class TestFindLines(unittest.TestCase):
 
     def setUp(self):
+        self.settings = Settings.resolve()
         self.hit_tests = os.path.join("tests", "resources", "example.py")
         self.unsupported_encoding_test = os.path.join("tests", "resources", "logo.png")
         self.broken_encoding_test = os.path.join(
@@ -25,7 +27,9 @@ class TestFindLines(unittest.TestCase):
     ):
         parsers = {}
 
-        hits, _ = todo_or_not.todo_check.find_hits(self.hit_tests, "# todoon", parsers)
+        hits, _ = todo_or_not.todo_check.find_hits(
+            self.hit_tests, "# todoon", parsers, self.settings
+        )
 
         hits_by_name = {}
         for hit in hits:
@@ -117,12 +121,53 @@ class TestFindLines(unittest.TestCase):
         for hit in hits_by_name:
             assert hits_by_name[hit] == expected_hits_by_name[hit]
 
+    def test_find_lines_in_block_comments(self):
+        python_block = os.path.join("tests", "resources", "block_comments", "block.py")
+        c_block = os.path.join("tests", "resources", "block_comments", "block.c")
+
+        hits, _ = todo_or_not.todo_check.find_hits(
+            python_block, "# todoon", {}, self.settings
+        )
+        self.assertEqual([hit.source_line for hit in hits], [12])
+
+        hits, _ = todo_or_not.todo_check.find_hits(
+            python_block, "# todoon", {}, self.settings, block_comments=True
+        )
+        self.assertEqual([hit.source_line for hit in hits], [3, 12])
+        self.assertEqual(hits[0].found_keys, ["todo"])
+
+        hits, _ = todo_or_not.todo_check.find_hits(
+            c_block, "# todoon", {}, self.settings, block_comments=True
+        )
+        self.assertEqual([hit.source_line for hit in hits], [2, 5])
+        self.assertEqual(hits[0].structured_title, "TODO Title")
+        self.assertEqual(hits[0].structured_body, "Body of a block comment #docs")
+        self.assertEqual(hits[0].structured_labels, ["docs"])
+
+    def test_find_lines_in_extensionless_files(self):
+        resources = os.path.join("tests", "resources", "language_detection")
+        expected = {
+            "Makefile": (2, ["todo"]),
+            "Dockerfile": (2, ["fixme"]),
+            os.path.join("bin", "deploy"): (2, ["todo"]),
+            os.path.join("v1.2", "Makefile"): (1, ["todo"]),
+        }
+
+        for target, (source_line, found_keys) in expected.items():
+            hits, _ = todo_or_not.todo_check.find_hits(
+                os.path.join(resources, target), "# todoon", {}, self.settings
+            )
+
+            self.assertEqual(len(hits), 1, target)
+            self.assertEqual(hits[0].source_line, source_line, target)
+            self.assertEqual(hits[0].found_keys, found_keys, target)
+
     @unittest.mock.patch("sys.stderr", new_callable=io.StringIO)
     def test_non_verbose_print(self, stderr):
         parsers = {}
 
         _, _ = todo_or_not.todo_check.find_hits(
-            self.unsupported_encoding_test, "# todoon", parsers
+            self.unsupported_encoding_test, "# todoon", parsers, self.settings
         )
 
         self.assertEqual(stderr.getvalue(), "")
@@ -132,7 +177,7 @@ class TestFindLines(unittest.TestCase):
         parsers = {}
 
         _, _ = todo_or_not.todo_check.find_hits(
-            self.unsupported_encoding_test, "# todoon", parsers
+            self.unsupported_encoding_test, "# todoon", parsers, self.settings
         )
 
         expected_value = "WARNING: File uses unsupported encoding, we will skip it but consider adding to .todo-ignore (Supported encodings: ['utf-8', 'utf-16']) \n *  tests\\resources\\logo.png"
@@ -147,14 +192,14 @@ class TestFindLines(unittest.TestCase):
         parsers = {}
 
         _, _ = todo_or_not.todo_check.find_hits(
-            self.unsupported_encoding_test, "# todoon", parsers
+            self.unsupported_encoding_test, "# todoon", parsers, self.settings
         )
 
     def test_broken_file_appears_utf(self):
         parsers = {}
 
         hits, encoding = todo_or_not.todo_check.find_hits(
-            self.broken_encoding_test, "# todoon", parsers
+            self.broken_encoding_test, "# todoon", parsers, self.settings
         )
 
         assert len(hits) == 0
@@ -162,7 +207,7 @@ class TestFindLines(unittest.TestCase):
         parsers = {}
 
         hits, encoding = todo_or_not.todo_check.find_hits(
-            self.really_broken_encoding_test, "# todoon", parsers
+            self.really_broken_encoding_test, "# todoon", parsers, self.settings
         )
 
         assert len(hits) == 0
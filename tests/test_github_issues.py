@@ -6,6 +6,7 @@ import pytest
 import todo_or_not.todo_check
 import todo_or_not.todo_hit
 import todo_or_not.utility
+from todo_or_not.todo_settings import Settings
 
 
 @pytest.fixture
@@ -111,11 +112,11 @@ class TestDebugIssueFeatures(unittest.TestCase):
             del os.environ["GITHUB_TRIGGERING_ACTOR"]
 
         self.bot_submitted_issues = todo_or_not.todo_check.get_bot_submitted_issues(
-            _test=True
+            Settings.resolve(), _test=True
         )
 
     def test_unable_to_collect_issues(self):
-        result = todo_or_not.todo_check.get_bot_submitted_issues()
+        result = todo_or_not.todo_check.get_bot_submitted_issues(Settings.resolve())
         assert result is False
 
     def test_bot_submitted_issues_collected(self):
@@ -130,7 +131,9 @@ class TestLiveIssueFeatures(unittest.TestCase):
             ("GITHUB_TRIGGERING_ACTOR", "pytest"),
         ]
 
-        self.bot_submitted_issues = todo_or_not.todo_check.get_bot_submitted_issues()
+        self.bot_submitted_issues = todo_or_not.todo_check.get_bot_submitted_issues(
+            Settings.resolve()
+        )
 
         self.example_hit_todo = todo_or_not.todo_check.Hit(
             "tests\\resources\\example.txt",
@@ -205,7 +208,7 @@ class TestLiveIssueFeatures(unittest.TestCase):
     def test_live_submit_test_issue(self):
         self._environment_up(".", env_variables=self.default_env)
 
-        response = self.example_hit_todo.generate_issue()
+        response = self.example_hit_todo.generate_issue(Settings.resolve())
 
         # If the function in test mode makes it all the way to where it would call
         # the subprocesses, it returns true instead.
@@ -215,13 +218,13 @@ class TestLiveIssueFeatures(unittest.TestCase):
 
 
 def test_debug_submit_test_issue(example_hit_todo):
-    response = example_hit_todo.generate_issue(_test=True)
+    response = example_hit_todo.generate_issue(Settings.resolve(), _test=True)
 
     assert response is True
 
 
 def test_live_submit_formatted_test_issue(example_hit_formatted_todo):
-    response = example_hit_formatted_todo.generate_issue(_test=True)
+    response = example_hit_formatted_todo.generate_issue(Settings.resolve(), _test=True)
 
     assert response is True
 
@@ -0,0 +1,133 @@
+import contextlib
+import dataclasses
+import io
+import os
+import tempfile
+import unittest
+
+import todo_or_not.localize
+import todo_or_not.utility
+from todo_or_not.todo_settings import Settings
+
+
+class TestSettings(unittest.TestCase):
+    def setUp(self):
+        # Start from a clean environment, restored in tearDown
+        self.environment_before = {}
+        for variable in [
+            "REGION",
+            "OS",
+            "DEBUG",
+            "MAXIMUM_ISSUES_GENERATED",
+            "PERTINENT_LINE_LIMIT",
+        ]:
+            self.environment_before[variable] = os.environ.pop(variable, None)
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.pyproject = os.path.join(self.directory.name, "pyproject.toml")
+
+    def tearDown(self):
+        for variable, value in self.environment_before.items():
+            if value is None:
+                os.environ.pop(variable, None)
+            else:
+                os.environ[variable] = value
+
+        self.directory.cleanup()
+
+    def _write_pyproject(self, contents: str):
+        with open(self.pyproject, "w") as pyproject:
+            pyproject.write(contents)
+
+    def _resolve(self, cli_options: dict = None) -> Settings:
+        return Settings.resolve(
+            cli_options,
+            pyproject_path=self.pyproject,
+            log_level=todo_or_not.utility.LOG_LEVEL_NONE,
+        )
+
+    def test_defaults(self):
+        self.assertEqual(self._resolve(), Settings())
+
+    def test_pyproject(self):
+        self._write_pyproject(
+            "[tool.todoon]\n"
+            'region = "ko_kr"\n'
+            "max-issues = 3\n"
+            'engine = "fast"\n'
+            "block-comments = true\n"
+            "not-a-setting = 1\n"
+        )
+        settings = self._resolve()
+
+        self.assertEqual(settings.region, "ko_kr")
+        self.assertEqual(settings.max_issues, 3)
+        self.assertEqual(settings.engine, "fast")
+        self.assertTrue(settings.block_comments)
+
+    def test_precedence(self):
+        self._write_pyproject("[tool.todoon]\nmax-issues = 3\nengine = 'fast'\n")
+        os.environ["MAXIMUM_ISSUES_GENERATED"] = "5"
+
+        settings = self._resolve()
+        self.assertEqual(settings.max_issues, 5)
+        self.assertEqual(settings.engine, "fast")
+
+        settings = self._resolve({"max_issues": 7, "engine": None})
+        self.assertEqual(settings.max_issues, 7)
+        self.assertEqual(settings.engine, "fast")
+
+    def test_invalid_values_fall_back(self):
+        os.environ["REGION"] = "not a supported region"
+        os.environ["OS"] = "not a supported operating system"
+        os.environ["PERTINENT_LINE_LIMIT"] = "many"
+        os.environ["DEBUG"] = "True"
+
+        settings = self._resolve()
+
+        self.assertEqual(settings.region, "en_us")
+        self.assertEqual(settings.operating_system, "default")
+        self.assertEqual(settings.pertinent_line_limit, 8)
+        self.assertTrue(settings.is_debug)
+
+    def test_unreadable_pyproject_is_ignored(self):
+        self._write_pyproject("[tool.todoon\n")
+
+        self.assertEqual(self._resolve(), Settings())
+
+    def test_pyproject_that_can_not_be_opened_is_ignored(self):
+        os.mkdir(self.pyproject)
+
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            settings = Settings.resolve(pyproject_path=self.pyproject)
+            todo_or_not.utility.flush_output()
+
+        self.assertEqual(settings, Settings())
+        self.assertIn(
+            todo_or_not.localize.LOCALIZE["en_us"]["warning_pyproject_not_read"],
+            stderr.getvalue(),
+        )
+
+    def test_warnings_in_resolved_region(self):
+        self._write_pyproject('[tool.todoon]\nregion = "ko_kr"\nnot-a-setting = 1\n')
+
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            Settings.resolve(pyproject_path=self.pyproject)
+            todo_or_not.utility.flush_output()
+
+        self.assertIn(
+            todo_or_not.localize.LOCALIZE["ko_kr"]["warning_unknown_setting"],
+            stderr.getvalue(),
+        )
+
+    def test_frozen(self):
+        settings = self._resolve()
+
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            settings.region = "ko_kr"
+
+
+if __name__ == "__main__":
+    unittest.main()
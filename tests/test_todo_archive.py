@@ -0,0 +1,175 @@
+import io
+import os
+import tarfile
+import unittest
+import zipfile
+
+import todo_or_not.todo_check as td
+from todo_or_not.todo_archive import get_archive_format, read_archive_members
+from todo_or_not.todo_settings import Settings
+
+from temporary_directory import TemporaryDirectoryTestCase
+
+
+def _add_to_tar(archive, name, content):
+    info = tarfile.TarInfo(name)
+    info.size = len(content)
+    archive.addfile(info, io.BytesIO(content))
+
+
+def _set_zip_flag_bits(path, flag_bits):
+    # zipfile can not write encrypted members, so the flags of the local and central headers are set by hand
+    with open(path, "rb") as file:
+        data = bytearray(file.read())
+
+    data[6:8] = flag_bits.to_bytes(2, "little")
+    central = data.index(b"PK\x01\x02")
+    data[central + 8 : central + 10] = flag_bits.to_bytes(2, "little")
+
+    with open(path, "wb") as file:
+        file.write(data)
+
+
+def _corrupt_zip_member(path):
+    # Everything after the local header of the first member, i.e. its compressed stream
+    with open(path, "rb") as file:
+        data = bytearray(file.read())
+
+    start = (
+        30
+        + int.from_bytes(data[26:28], "little")
+        + int.from_bytes(data[28:30], "little")
+    )
+    data[start : start + 8] = b"\xff" * 8
+
+    with open(path, "wb") as file:
+        file.write(data)
+
+
+class TestArchives(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+
+        with open(".todo-ignore", "w") as file:  # todoon
+            file.write("# Nothing is ignored\n")
+
+        with zipfile.ZipFile("sdk.zip", "w") as archive:
+            archive.writestr("src/main.py", "# TODO in a zip\n")
+            archive.writestr("src/big.py", "# TODO too large\n" + "x = 1\n" * 1000)
+            archive.writestr("docs/", "")
+
+        with tarfile.open("vendor.tar.gz", "w:gz") as archive:
+            _add_to_tar(archive, "./pkg/lib.c", b"// FIXME in a tar\n")
+            _add_to_tar(archive, "./pkg/logo.png", b"\x89PNG\0\0\0")
+
+        with tarfile.open("vendor.tar.xz", "w:xz") as archive:
+            _add_to_tar(archive, "pkg/util.js", b"// TODO in an xz\n")
+
+        with open("broken.zip", "wb") as file:
+            file.write(b"not a zip")
+
+    def test_get_archive_format(self):
+        self.assertEqual(get_archive_format("a/sdk.zip"), "zip")
+        self.assertEqual(get_archive_format("vendor.tar.gz"), "tar")
+        self.assertEqual(get_archive_format("VENDOR.TXZ"), "tar")
+        self.assertIsNone(get_archive_format("main.gz"))
+
+    def test_read_archive_members(self):
+        self.assertEqual(
+            list(read_archive_members("sdk.zip", "zip", 100)),
+            [("src/main.py", b"# TODO in a zip\n"), ("src/big.py", None)],
+        )
+        self.assertEqual(
+            [name for name, _ in read_archive_members("vendor.tar.gz", "tar", 100)],
+            ["pkg/lib.c", "pkg/logo.png"],
+        )
+
+        # Once the archive has been read up to the limit, nothing else is
+        self.assertEqual(
+            list(read_archive_members("vendor.tar.gz", "tar", 100, max_size=20)),
+            [("pkg/lib.c", b"// FIXME in a tar\n"), ("pkg/logo.png", None)],
+        )
+
+    def test_find_hits_in_archive(self):
+        hits, archive_format = td.find_hits_in_archive(
+            os.path.join(self.directory, "vendor.tar.gz"), "# todoon", {}, Settings()
+        )
+
+        self.assertEqual(archive_format, "tar")
+        self.assertEqual(
+            [f"{hit.source_file}:{hit.source_line}" for hit in hits],
+            ["vendor.tar.gz!/pkg/lib.c:1"],
+        )
+
+        hits, archive_format = td.find_hits_in_archive(
+            "broken.zip", "# todoon", {}, Settings()
+        )
+        self.assertEqual(hits, [])
+        self.assertIsNone(archive_format)
+
+    def test_unreadable_members(self):
+        with zipfile.ZipFile("encrypted.zip", "w") as archive:
+            archive.writestr("secret.py", "# TODO encrypted\n")
+        _set_zip_flag_bits("encrypted.zip", 0x1)
+
+        with zipfile.ZipFile("corrupt.zip", "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("broken.py", "# TODO corrupt\n" * 100)
+            archive.writestr("fine.py", "# TODO still read\n")
+        _corrupt_zip_member("corrupt.zip")
+
+        # Members that can not be read are skipped, the rest of the archive is still read
+        self.assertEqual(
+            list(read_archive_members("encrypted.zip", "zip", 100)),
+            [("secret.py", None)],
+        )
+        self.assertEqual(
+            list(read_archive_members("corrupt.zip", "zip", 10000)),
+            [("broken.py", None), ("fine.py", b"# TODO still read\n")],
+        )
+
+        hits, archive_format = td.find_hits_in_archive(
+            "corrupt.zip", "# todoon", {}, Settings()
+        )
+        self.assertEqual(archive_format, "zip")
+        self.assertEqual(
+            [f"{hit.source_file}:{hit.source_line}" for hit in hits],
+            ["corrupt.zip!/fine.py:1"],
+        )
+
+    def test_broken_compressed_tar(self):
+        with tarfile.open("broken.tar.xz", "w:xz") as archive:
+            _add_to_tar(archive, "pkg/a.js", b"// TODO before the damage\n")
+            _add_to_tar(archive, "pkg/b.js", b"x = 1;\n" * 10000)
+
+        # Damaged past its header, so the archive opens and breaks while being read (lzma.LZMAError)
+        with open("broken.tar.xz", "rb") as file:
+            data = bytearray(file.read())
+        data[len(data) * 4 // 5 : len(data) * 4 // 5 + 16] = b"\x00" * 16
+
+        with open("broken.tar.xz", "wb") as file:
+            file.write(data)
+
+        hits, archive_format = td.find_hits_in_archive(
+            "broken.tar.xz", "# todoon", {}, Settings()
+        )
+        self.assertEqual(len(hits), 1)
+        self.assertIsNone(archive_format)
+
+    def test_todoon_archives(self):
+        td.todoon(git_files=False, silent=True, print_nothing=True)
+        self.assertEqual(os.environ["TODOON_TODOS_FOUND"], "0")
+
+        td.todoon(
+            git_files=False,
+            archives=True,
+            archive_member_limit=100,
+            silent=True,
+            print_nothing=True,
+        )
+        self.assertEqual(os.environ["TODOON_TODOS_FOUND"], "2")
+        self.assertEqual(os.environ["TODOON_FIXMES_FOUND"], "1")
+        self.assertEqual(os.environ["TODOON_ENCODING_ERRORS"], "1")
+
+
+if __name__ == "__main__":
+    unittest.main()
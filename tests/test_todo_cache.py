@@ -0,0 +1,323 @@
+import gzip
+import http.client
+import json
+import os
+import shutil
+import socketserver
+import subprocess
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.request
+
+import todo_or_not.todo_check as td
+import todo_or_not.todo_git as todo_git
+from todo_or_not.todo_cache import (
+    FileCacheBackend,
+    HttpCacheBackend,
+    ScanCache,
+    get_fingerprint,
+)
+from todo_or_not.todo_cache_server import CacheServer
+from todo_or_not.todo_settings import Settings
+
+from temporary_directory import TemporaryDirectoryTestCase
+
+
+def _write(path, contents):
+    with open(path, "w") as file:
+        file.write(contents)
+
+
+def _git(*args):
+    return subprocess.run(
+        ["git", "-c", "user.name=todoon", "-c", "user.email=todoon@example.com", *args],
+        capture_output=True,
+        check=True,
+    ).stdout
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is not installed")
+class TestScanCache(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+
+        _git("init", "-q")
+        _write(".todo-ignore", ".git/\nscan.cache\n")  # todoon
+        _write("a.py", "# TODO first\n")
+        _write("b.py", "x = 1\n# FIXME Titled | With a body and #labels\n")
+        _write("c.sql", "-- TODO in another language\n")
+        _git("add", "-A")
+        _git("commit", "-q", "-m", "first")
+
+        self.parsed = []
+        self.find_hits = td.find_hits
+
+        def _find_hits(filename, *args, **kwargs):
+            self.parsed.append(os.path.relpath(filename))
+            return self.find_hits(filename, *args, **kwargs)
+
+        td.find_hits = _find_hits
+
+    def tearDown(self):
+        td.find_hits = self.find_hits
+        super().tearDown()
+
+    def _todoon(self, **kwargs):
+        self.parsed = []
+        td.todoon(**{"cache": "scan.cache", **kwargs}, silent=True, print_nothing=True)
+
+        return (
+            os.environ["TODOON_FILES_SCANNED"],
+            os.environ["TODOON_TODOS_FOUND"],
+            os.environ["TODOON_FIXMES_FOUND"],
+        )
+
+    def test_list_index_blobs(self):
+        _write("a.py", "# TODO modified\n")
+        _write("untracked.py", "# TODO untracked\n")
+
+        self.assertEqual(
+            sorted(os.path.relpath(path) for path in todo_git.list_index_blobs()),
+            [".todo-ignore", "b.py", "c.sql"],  # todoon
+        )
+
+    def test_unchanged_files_are_not_scanned_again(self):
+        first = self._todoon()
+        self.assertEqual(sorted(self.parsed), ["a.py", "b.py", "c.sql"])
+
+        # A fresh clone has the same object IDs, so nothing is scanned
+        second = self._todoon()
+        self.assertEqual(self.parsed, [])
+        self.assertEqual(first, second)
+
+        # Modified and untracked files are always scanned
+        _write("a.py", "# TODO first\n# TODO another\n")
+        _write("d.py", "# TODO untracked\n")
+        self.assertEqual(self._todoon(untracked=True), ("4", "4", "1"))
+        self.assertEqual(sorted(self.parsed), ["a.py", "d.py"])
+
+    def test_cached_hits_are_identical(self):
+        settings = Settings.resolve()
+        fingerprint = get_fingerprint(settings, "# todoon")
+        oid = todo_git.list_index_blobs()[os.path.join(self.directory, "b.py")]
+        hits, encoding = self.find_hits("b.py", "# todoon", {}, settings=settings)
+
+        cache = ScanCache(fingerprint)
+        cache.put(oid, "b.py", hits, encoding)
+        cache.save("scan.cache")
+
+        cached_hits, cached_encoding = ScanCache.load("scan.cache", fingerprint).get(
+            oid, "b.py"
+        )
+        self.assertEqual(cached_encoding, encoding)
+        self.assertEqual(
+            [hit.to_dict() for hit in cached_hits], [hit.to_dict() for hit in hits]
+        )
+
+        # The same contents in a file of another language are parsed again
+        self.assertIsNone(ScanCache.load("scan.cache", fingerprint).get(oid, "b.md"))
+
+    def test_stale_or_broken_cache_is_not_used(self):
+        self._todoon()
+
+        other_engine = get_fingerprint(Settings.resolve({"engine": "fast"}), "# todoon")
+        self.assertEqual(ScanCache.load("scan.cache", other_engine).entries, {})
+
+        _write("scan.cache", "not a cache")
+        self._todoon()
+        self.assertEqual(sorted(self.parsed), ["a.py", "b.py", "c.sql"])
+
+        self.assertEqual(ScanCache.load("missing.cache", other_engine).entries, {})
+
+    def test_malformed_entry_is_scanned_again(self):
+        first = self._todoon()
+
+        with gzip.open("scan.cache", "rt", encoding="utf-8") as file:
+            data = json.load(file)
+
+        # An edited entry, missing a key of its hit
+        for key, entry in data["blobs"].items():
+            for hit in entry[1]:
+                del hit["source_line"]
+
+        with gzip.open("scan.cache", "wt", encoding="utf-8") as file:
+            json.dump(data, file)
+
+        self.assertEqual(self._todoon(), first)
+        self.assertEqual(sorted(self.parsed), ["a.py", "b.py", "c.sql"])
+
+        # The entries were replaced, so nothing is scanned again
+        self._todoon()
+        self.assertEqual(self.parsed, [])
+
+    def test_shared_backend(self):
+        backend = os.path.join(self.directory, "shared")
+        _write(".todo-ignore", ".git/\nscan.cache\nshared/\n")  # todoon
+
+        first = self._todoon(cache=None, cache_backend=backend)
+        self.assertEqual(sorted(self.parsed), ["a.py", "b.py", "c.sql"])
+
+        # Another runner without a local cache gets every hit from the shared one
+        self.assertEqual(self._todoon(cache=None, cache_backend=backend), first)
+        self.assertEqual(self.parsed, [])
+
+    def test_unreachable_backend(self):
+        # Nothing listens on port 9 of this machine, the run goes on without the shared cache
+        self._todoon(cache_backend="http://127.0.0.1:9")
+        self.assertEqual(sorted(self.parsed), ["a.py", "b.py", "c.sql"])
+
+    def test_backend_not_answering_with_http(self):
+        class _Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                headers = {}
+                for line in iter(self.rfile.readline, b"\r\n"):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.lower()] = value.strip()
+
+                self.rfile.read(int(headers.get("content-length", 0)))
+                self.wfile.write(b"garbage\r\n")
+
+        server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _Handler)
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+
+        try:
+            # http.client.BadStatusLine is not an OSError, the run still goes on without the shared cache
+            self._todoon(cache_backend=f"http://127.0.0.1:{server.server_address[1]}")
+            self.assertEqual(sorted(self.parsed), ["a.py", "b.py", "c.sql"])
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
+
+class TestCacheBackends(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.digest = "d" * 40
+        self.entries = {
+            f"{'a' * 40} python": [
+                "utf-8",
+                [
+                    {
+                        "found_keys": ["todo"],
+                        "source_line": 1,
+                        "pertinent_lines": ["# TODO first\n"],  # todoon
+                        "trigger_line_index": 0,
+                        "structured_title": None,
+                        "structured_body": None,
+                        "structured_labels": None,
+                    }
+                ],
+            ],
+            f"{'b' * 40} x_default": [None, []],
+            f"{'c' * 64} c++": ["utf-16", []],
+        }
+
+        self.server = CacheServer(("127.0.0.1", 0), FileCacheBackend(self.directory))
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        shutil.rmtree(self.directory)
+
+    def test_file_backend(self):
+        backend = FileCacheBackend(self.directory)
+        backend.put_many(self.digest, self.entries)
+
+        self.assertEqual(
+            backend.get_many(self.digest, [*self.entries.keys(), f"{'e' * 40} python"]),
+            self.entries,
+        )
+        self.assertEqual(backend.get_many("e" * 40, list(self.entries.keys())), {})
+
+        with self.assertRaises(ValueError):
+            backend.put_many(self.digest, {f"{'a' * 40} ../escape": [None, []]})
+
+    def test_http_backend(self):
+        backend = HttpCacheBackend(self.url, batch_size=2, concurrency=2)
+        backend.put_many(self.digest, self.entries)
+
+        self.assertEqual(
+            backend.get_many(self.digest, [*self.entries.keys(), f"{'e' * 40} python"]),
+            self.entries,
+        )
+
+        with urllib.request.urlopen(
+            f"{self.url}/{self.digest}/{'b' * 40}/x_default"
+        ) as response:
+            self.assertEqual(response.read(), b"[null, []]")
+
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            urllib.request.urlopen(
+                urllib.request.Request(
+                    f"{self.url}/{self.digest}/{'a' * 40}/python",
+                    data=b"{}",
+                    method="PUT",
+                )
+            )
+        self.assertEqual(context.exception.code, 400)
+
+        # Hits that could not be made back into a Hit are refused too
+        for hit in [
+            {"found_keys": ["todo"]},
+            {**self.entries[f"{'a' * 40} python"][1][0], "trigger_line_index": 1},
+            {**self.entries[f"{'a' * 40} python"][1][0], "source_line": "1"},
+        ]:
+            with self.assertRaises(urllib.error.HTTPError) as context:
+                urllib.request.urlopen(
+                    urllib.request.Request(
+                        f"{self.url}/{self.digest}/{'a' * 40}/python",
+                        data=json.dumps(["utf-8", [hit]]).encode("utf-8"),
+                        method="PUT",
+                    )
+                )
+            self.assertEqual(context.exception.code, 400)
+
+    def test_http_backend_bad_content_length(self):
+        # Neither waits on a body that never comes
+        for length in ["-1", str(64 * 1024 * 1024)]:
+            connection = http.client.HTTPConnection(
+                "127.0.0.1", self.server.server_address[1], timeout=5
+            )
+            connection.putrequest("PUT", f"/{self.digest}/{'a' * 40}/python")
+            connection.putheader("Content-Length", length)
+            connection.endheaders()
+
+            self.assertEqual(connection.getresponse().status, 400)
+            connection.close()
+
+    def test_http_backend_bad_answers(self):
+        backend = HttpCacheBackend(self.url)
+        keys = list(self.entries.keys())
+
+        # An answer that is JSON but not a batch of entries
+        for answer in [b"[]", b'"entries"', b'{"entries": []}']:
+            backend._request = lambda *args, _answer=answer: _answer
+
+            with self.assertRaises(ValueError):
+                backend.get_many(self.digest, keys)
+
+        # Entries that can not be used are left out, as are keys that were not asked for
+        backend._request = lambda *args: json.dumps(
+            {
+                "entries": {
+                    keys[0]: ["utf-8", [{"found_keys": ["todo"]}]],
+                    keys[1]: [None, []],
+                    f"{'e' * 40} python": [None, []],
+                }
+            }
+        ).encode("utf-8")
+
+        self.assertEqual(backend.get_many(self.digest, keys), {keys[1]: [None, []]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import random
+import unittest
+
+from todo_or_not.todo_context import LineIndex
+
+
+def _walk_pertinent_lines(lines, line_index, limit):
+    """The line-by-line walk that LineIndex replaced"""
+    line_number = line_index + 1
+    pertinent_lines = []
+
+    _i = line_number - 1
+    while abs(line_number - _i) <= limit and _i > 0:
+        _i -= 1
+        if len(lines[_i].strip()) > 0:
+            pertinent_lines.insert(0, lines[_i])
+        else:
+            break
+
+    pertinent_lines.append(lines[line_number - 1])
+    trigger_line = len(pertinent_lines) - 1
+
+    _i = line_number
+    while abs(_i - line_number) <= limit:
+        if _i < len(lines) and len(lines[_i].strip()) > 0:
+            pertinent_lines.append(lines[_i])
+        else:
+            break
+        _i += 1
+
+    return pertinent_lines, trigger_line
+
+
+class TestLineIndex(unittest.TestCase):
+    def setUp(self):
+        self.lines = [
+            "a\n",
+            "b\n",
+            "\n",
+            "c\n",
+            "d\n",
+            "e\n",
+            "f\n",
+            "  \t\n",
+            "g\n",
+        ]
+
+    def test_stops_at_blank_lines(self):
+        index = LineIndex(self.lines, 8)
+
+        self.assertEqual(index.get_pertinent_lines(0), (["a\n", "b\n"], 0))
+        self.assertEqual(
+            index.get_pertinent_lines(4), (["c\n", "d\n", "e\n", "f\n"], 1)
+        )
+        self.assertEqual(index.get_pertinent_lines(8), (["g\n"], 0))
+
+    def test_stops_at_limit(self):
+        index = LineIndex(self.lines, 1)
+
+        # One line before, two lines after
+        self.assertEqual(
+            index.get_pertinent_lines(4), (["c\n", "d\n", "e\n", "f\n"], 1)
+        )
+        self.assertEqual(index.get_pertinent_lines(5), (["d\n", "e\n", "f\n"], 1))
+
+        index = LineIndex(self.lines, 0)
+        self.assertEqual(index.get_pertinent_lines(4), (["d\n", "e\n"], 0))
+
+        index = LineIndex(self.lines, -3)
+        self.assertEqual(index.get_pertinent_lines(4), (["d\n"], 0))
+
+    def test_first_line_does_not_wrap_around(self):
+        lines = ["# TODO\n", "x = 1\n", "y = 2\n"]
+        index = LineIndex(lines, 8)
+
+        self.assertEqual(index.get_pertinent_lines(0), (lines, 0))
+
+    def test_matches_line_by_line_walk(self):
+        _random = random.Random(20240915)
+
+        for _ in range(200):
+            lines = [
+                _random.choice(["\n", " \n", "code\n", "# TODO\n"])
+                for _ in range(_random.randint(1, 40))
+            ]
+            limit = _random.randint(-2, 10)
+            index = LineIndex(lines, limit)
+
+            for line_index, line in enumerate(lines):
+                if len(line.strip()) == 0:
+                    continue
+
+                self.assertEqual(
+                    index.get_pertinent_lines(line_index),
+                    _walk_pertinent_lines(lines, line_index, limit),
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import os
+import random
+import unittest
+
+import todo_or_not.todo_check
+from todo_or_not.todo_grammar import (
+    FastTodoGrammar,
+    TodoGrammar,
+    comment_symbols,
+    file_extensions,
+)
+from todo_or_not.todo_settings import Settings
+
+
+def _hit_fields(hit):
+    """Everything that makes up a Hit, Hit.__eq__ is too forgiving when labels are present"""
+    if hit is None:
+        return None
+
+    return (
+        sorted(hit.found_keys),
+        hit.source_file,
+        hit.source_line,
+        hit.pertinent_lines,
+        hit.trigger_line_index,
+        hit.structured_title,
+        hit.structured_body,
+        sorted(hit.structured_labels) if hit.structured_labels is not None else None,
+    )
+
+
+class TestEnginesAgree(unittest.TestCase):
+    def setUp(self):
+        self.settings = Settings.resolve()
+
+        # One extension per language, plus one that falls through to x_default
+        self.extensions = {}
+        for extension, language in file_extensions.items():
+            self.extensions.setdefault(language, extension)
+        self.extensions["x_default"] = "invalid_file_extension"
+
+        self.grammars = {}
+        for language, extension in self.extensions.items():
+            ply_grammar = TodoGrammar(extension)
+            ply_grammar.build()
+            fast_grammar = FastTodoGrammar(extension)
+            fast_grammar.build()
+
+            self.grammars[language] = (ply_grammar, fast_grammar)
+
+    def test_every_language_is_covered(self):
+        self.assertEqual(set(self.grammars.keys()), set(comment_symbols.keys()))
+
+    def test_engines_agree_on_resources(self):
+        for dirpath, dirnames, filenames in os.walk(os.path.join("tests", "resources")):
+            for filename in filenames:
+                target = os.path.join(dirpath, filename)
+
+                ply_hits, ply_encoding = todo_or_not.todo_check.find_hits(
+                    target, "# todoon", {}, self.settings, engine="ply"
+                )
+                fast_hits, fast_encoding = todo_or_not.todo_check.find_hits(
+                    target, "# todoon", {}, self.settings, engine="fast"
+                )
+
+                self.assertEqual(ply_encoding, fast_encoding, target)
+                self.assertEqual(
+                    [_hit_fields(hit) for hit in ply_hits],
+                    [_hit_fields(hit) for hit in fast_hits],
+                    target,
+                )
+
+    def test_engines_agree_on_random_lines(self):
+        fragments = [
+            "#",
+            "//",
+            "/",
+            "--",
+            "-",
+            "|",
+            " ",
+            "\t",
+            "  ",
+            "todo",
+            "TODO",
+            "ToDo",
+            "fixme",
+            "FIXME",
+            "fIxMe",
+            "tod",
+            "fix",
+            "o",
+            "me",
+            "#bug",
+            "#todo",
+            "#fixme",
+            "a",
+            "123",
+            "x = 1;",
+            "'",
+            '"',
+            "{",
+            "}",
+            "/*",
+            "*/",
+            "=begin",
+            "é",
+            "İ",
+            "#]",
+            "[",
+        ]
+        _random = random.Random(20240915)
+
+        for _ in range(3000):
+            line = "".join(
+                _random.choice(fragments) for _ in range(_random.randint(0, 12))
+            )
+
+            for language, (ply_grammar, fast_grammar) in self.grammars.items():
+                self.assertEqual(
+                    _hit_fields(ply_grammar.safe_parse(line)),
+                    _hit_fields(fast_grammar.safe_parse(line)),
+                    f"{language}: {line!r}",
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
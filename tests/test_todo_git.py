@@ -0,0 +1,375 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import unittest
+
+import todo_or_not.todo_check as td
+import todo_or_not.todo_git as todo_git
+import todo_or_not.utility
+from todo_or_not.todo_settings import Settings
+
+from temporary_directory import TemporaryDirectoryTestCase
+
+
+def _write(path, contents):
+    with open(path, "w") as file:
+        file.write(contents)
+
+
+def _git(*args):
+    return subprocess.run(
+        ["git", "-c", "user.name=todoon", "-c", "user.email=todoon@example.com", *args],
+        capture_output=True,
+        check=True,
+    ).stdout
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is not installed")
+class TestStaged(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.debug_before = os.environ.get("DEBUG")
+        os.environ["DEBUG"] = "True"
+
+        _git("init", "-q")
+        _write(".todo-ignore", "ignored/\n")  # todoon
+        os.mkdir("ignored")
+
+        # Nothing staged yet, before the first commit
+        _write("committed.py", "# TODO already committed\n")
+        _git("add", "committed.py")
+        _git("commit", "-q", "-m", "first")
+
+        # The index and the working tree disagree about these
+        _write("staged.py", "x = 1\n\n# TODO staged\n")
+        _git("add", "staged.py")
+        _write(
+            "staged.py", "# FIXME only in the working tree\nx = 1\n\n# TODO staged\n"
+        )
+
+        _write(os.path.join("ignored", "hidden.py"), "# TODO hidden\n")
+        _git("add", os.path.join("ignored", "hidden.py"))
+
+        _write("unstaged.py", "# TODO not staged\n")
+
+    def tearDown(self):
+        super().tearDown()
+
+        if self.debug_before is None:
+            os.environ.pop("DEBUG", None)
+        else:
+            os.environ["DEBUG"] = self.debug_before
+
+    def test_list_staged_blobs(self):
+        staged = todo_git.list_staged_blobs()
+
+        self.assertEqual(
+            sorted(staged.keys()),
+            [
+                os.path.join(self.directory, "ignored", "hidden.py"),
+                os.path.join(self.directory, "staged.py"),
+            ],
+        )
+
+        with todo_git.CatFileBatch() as blobs:
+            self.assertEqual(
+                blobs.read(staged[os.path.join(self.directory, "staged.py")]),
+                b"x = 1\n\n# TODO staged\n",
+            )
+            self.assertIsNone(blobs.read("0" * 40))
+
+    def test_list_staged_blobs_before_first_commit(self):
+        shutil.rmtree(".git")
+        _git("init", "-q")
+        _git("add", "staged.py")
+
+        self.assertEqual(
+            list(todo_git.list_staged_blobs().keys()),
+            [os.path.join(self.directory, "staged.py")],
+        )
+
+    def test_find_hits_in_content_matches_find_hits(self):
+        contents = b"a = 1\r\n# TODO windows line endings\r\n\r\n# FIXME\r\n"
+        with open("endings.py", "wb") as file:
+            file.write(contents)
+
+        from_file, file_encoding = td.find_hits(
+            "endings.py", "# todoon", {}, Settings()
+        )
+        from_content, content_encoding = td.find_hits_in_content(
+            "endings.py", contents, "# todoon", {}, Settings()
+        )
+
+        self.assertEqual(file_encoding, content_encoding)
+        self.assertEqual(
+            [(hit.source_line, hit.pertinent_lines) for hit in from_file],
+            [(hit.source_line, hit.pertinent_lines) for hit in from_content],
+        )
+
+        _hits, encoding = td.find_hits_in_content(
+            "binary", b"\xff\xfe\xfd", "", {}, Settings()
+        )
+        self.assertIsNone(encoding)
+
+    def test_todoon_scans_the_index(self):
+        td.todoon(staged=True, silent=True, print_nothing=True)
+
+        # Only the staged version of staged.py, the working tree version has a FIXME too
+        self.assertEqual(os.environ["TODOON_FILES_SCANNED"], "1")
+        self.assertEqual(os.environ["TODOON_TODOS_FOUND"], "1")
+        self.assertEqual(os.environ["TODOON_FIXMES_FOUND"], "0")
+
+    def test_todoon_weighs_the_index(self):
+        td.todoon(
+            staged=True, status_file="status.json", silent=True, print_nothing=True
+        )
+
+        # Progress is weighed by the staged blob, not the longer file in the working tree
+        with open("status.json") as file:
+            status = json.load(file)
+
+        self.assertEqual(status["bytes_total"], len(b"x = 1\n\n# TODO staged\n"))
+        self.assertEqual(status["bytes_scanned"], status["bytes_total"])
+
+        staged = todo_git.list_staged_blobs()
+        self.assertEqual(
+            todo_git.get_blob_sizes(
+                [staged[os.path.join(self.directory, "staged.py")]]
+            ),
+            {staged[os.path.join(self.directory, "staged.py")]: 21},
+        )
+        self.assertEqual(todo_git.get_blob_sizes(["0" * 40]), {})
+
+    def test_todoon_scans_specified_staged_files(self):
+        td.todoon(
+            files=[os.path.join("ignored", "hidden.py"), "unstaged.py"],
+            staged=True,
+            silent=True,
+            print_nothing=True,
+        )
+
+        self.assertEqual(os.environ["TODOON_FILES_SCANNED"], "1")
+        self.assertEqual(os.environ["TODOON_TODOS_FOUND"], "1")
+
+    def test_todoon_outside_of_git(self):
+        shutil.rmtree(".git")
+        os.environ["GIT_CEILING_DIRECTORIES"] = os.path.dirname(self.directory)
+
+        try:
+            with self.assertRaises(SystemExit) as context:
+                td.todoon(staged=True, print_nothing=True)
+        finally:
+            del os.environ["GIT_CEILING_DIRECTORIES"]
+
+        self.assertEqual(context.exception.code, 1)
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is not installed")
+class TestTree(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+
+        _git("init", "-q")
+        os.mkdir("vendor")
+        os.mkdir("sub")
+        _write(".todo-ignore", "vendor/\n**/*.txt\n")  # todoon
+        _write("a.py", "# TODO shared\n")
+        _write(os.path.join("sub", "b.py"), "# TODO shared\n")
+        _write(os.path.join("vendor", "v.py"), "# TODO vendored\n")
+        _write(os.path.join("sub", "notes.txt"), "# TODO notes\n")
+        _git("add", "-A")
+        _git("commit", "-q", "-m", "first")
+        _git("tag", "v1")
+
+        # Only in the working tree and in later commits
+        _write(".todo-ignore", "\n")  # todoon
+        _write("a.py", "# TODO shared\n# FIXME later\n")
+        _git("commit", "-q", "-a", "-m", "second")
+
+    def test_list_tree_blobs(self):
+        blobs = todo_git.list_tree_blobs("v1")
+
+        self.assertEqual(
+            sorted(os.path.relpath(path) for path in blobs.keys()),
+            sorted(
+                [
+                    ".todo-ignore",  # todoon
+                    "a.py",
+                    os.path.join("sub", "b.py"),
+                    os.path.join("sub", "notes.txt"),
+                    os.path.join("vendor", "v.py"),
+                ]
+            ),
+        )
+        self.assertEqual(
+            blobs[os.path.join(self.directory, "a.py")],
+            blobs[os.path.join(self.directory, "sub", "b.py")],
+        )
+
+    def test_match_todo_ignore(self):
+        paths = ["a.py", "vendor/v.py", "vendored.py", "sub/notes.txt", "notes.txt"]
+
+        self.assertEqual(
+            td.match_todo_ignore(["# comment\n", "vendor/\n", "*.txt\n"], paths),
+            {"vendor/v.py", "notes.txt"},
+        )
+        self.assertEqual(
+            td.match_todo_ignore(["**/*.txt", "./a.py"], paths),
+            {"a.py", "sub/notes.txt", "notes.txt"},
+        )
+
+    def test_todoon_scans_the_tree(self):
+        parsed = []
+        find_hits_in_content = td.find_hits_in_content
+
+        def _find_hits_in_content(filename, *args, **kwargs):
+            parsed.append(os.path.relpath(filename))
+            return find_hits_in_content(filename, *args, **kwargs)
+
+        td.find_hits_in_content = _find_hits_in_content
+        try:
+            td.todoon(tree="v1", silent=True, print_nothing=True)
+        finally:
+            td.find_hits_in_content = find_hits_in_content
+
+        # The .todo-ignore of v1 applies, and the identical files are only parsed once
+        self.assertEqual(os.environ["TODOON_FILES_SCANNED"], "2")
+        self.assertEqual(os.environ["TODOON_TODOS_FOUND"], "2")
+        self.assertEqual(os.environ["TODOON_FIXMES_FOUND"], "0")
+        self.assertEqual(len(parsed), 1)
+
+    def test_todoon_tree_ignores_as_the_checkout(self):
+        _write(".todo-ignore", "*.py\nbuild*\n")  # todoon
+        _write(os.path.join("sub", ".todo-ignore"), "gen\n*.sh\n")  # todoon
+
+        for path in [
+            ".hidden.py",
+            "keep.sh",
+            os.path.join("build_out", "x.sh"),
+            os.path.join("sub", "keep.py"),
+            os.path.join("sub", "app.sh"),
+            os.path.join("sub", "gen", "g.py"),
+        ]:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            _write(path, "# TODO file\n")
+
+        _git("add", "-A")
+        _git("commit", "-q", "-m", "third")
+
+        def _scanned(**kwargs):
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                td.todoon(
+                    output_format="jsonl", silent=True, print_nothing=True, **kwargs
+                )
+                todo_or_not.utility.flush_output()
+
+            return sorted(
+                json.loads(line)["file"] for line in output.getvalue().splitlines()
+            )
+
+        # Files with a hit in them, notes.txt has no comments to find one in
+        checkout = _scanned(git_files=False)
+
+        self.assertEqual(
+            checkout,
+            sorted(
+                [
+                    ".hidden.py",
+                    os.path.join("build_out", "x.sh"),
+                    "keep.sh",
+                    os.path.join("sub", "b.py"),
+                    os.path.join("sub", "keep.py"),
+                    os.path.join("vendor", "v.py"),
+                ]
+            ),
+        )
+        self.assertEqual(_scanned(tree="HEAD"), checkout)
+
+    def test_todoon_with_unknown_tree(self):
+        with self.assertRaises(SystemExit) as context:
+            td.todoon(tree="no-such-tag", print_nothing=True)
+
+        self.assertEqual(context.exception.code, 1)
+
+    def test_todoon_with_incompatible_options(self):
+        with self.assertRaises(SystemExit) as context:
+            td.todoon(tree="v1", staged=True, print_nothing=True)
+
+        self.assertEqual(context.exception.code, 1)
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is not installed")
+class TestGitFiles(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+
+        _git("init", "-q")
+        os.mkdir("vendor")
+        os.mkdir("build")
+        _write(".todo-ignore", "vendor/\n")  # todoon
+        _write(".gitignore", "build/\n")
+        _write("a.py", "# TODO tracked\n")
+        _write("deleted.py", "# TODO deleted\n")
+        _write(os.path.join("vendor", "v.py"), "# TODO vendored\n")
+        _git("add", "-A")
+        _git("commit", "-q", "-m", "first")
+
+        os.remove("deleted.py")
+        _write(os.path.join("build", "out.py"), "# TODO generated\n")
+        _write("new.py", "# TODO untracked\n")
+
+    def test_list_files(self):
+        self.assertEqual(
+            [os.path.relpath(path) for path in todo_git.list_files()],
+            [
+                ".gitignore",
+                ".todo-ignore",  # todoon
+                "a.py",
+                os.path.join("vendor", "v.py"),
+            ],
+        )
+        self.assertIn(
+            os.path.join(self.directory, "new.py"),
+            todo_git.list_files(include_untracked=True),
+        )
+        self.assertNotIn(
+            os.path.join(self.directory, "build", "out.py"),
+            todo_git.list_files(include_untracked=True),
+        )
+
+    def test_todoon_lists_files_with_git(self):
+        # Used without being asked, because the current directory has a .git
+        td.todoon(silent=True, print_nothing=True)
+        self.assertEqual(os.environ["TODOON_FILES_SCANNED"], "2")
+        self.assertEqual(os.environ["TODOON_TODOS_FOUND"], "1")
+
+        td.todoon(untracked=True, silent=True, print_nothing=True)
+        self.assertEqual(os.environ["TODOON_TODOS_FOUND"], "2")
+
+        # Walking finds what git ignores too
+        td.todoon(git_files=False, silent=True, print_nothing=True)
+        self.assertEqual(os.environ["TODOON_TODOS_FOUND"], "3")
+
+    def test_todoon_git_files_outside_of_git(self):
+        shutil.rmtree(".git")
+        os.environ["GIT_CEILING_DIRECTORIES"] = os.path.dirname(self.directory)
+
+        try:
+            # Without a .git the directory is walked
+            td.todoon(silent=True, print_nothing=True)
+            self.assertEqual(os.environ["TODOON_TODOS_FOUND"], "3")
+
+            with self.assertRaises(SystemExit) as context:
+                td.todoon(git_files=True, print_nothing=True)
+        finally:
+            del os.environ["GIT_CEILING_DIRECTORIES"]
+
+        self.assertEqual(context.exception.code, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+import os
+import shutil
+import subprocess
+import unittest
+
+import todo_or_not.todo_check as td
+from todo_or_not.todo_gitignore import GitIgnore, parse_gitignore
+from todo_or_not.todo_watch import WatchedPaths
+
+from temporary_directory import TemporaryDirectoryTestCase
+
+
+def _write(path, contents=""):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    with open(path, "w") as file:
+        file.write(contents)
+
+
+def _matches(lines, path, is_dir=False):
+    # The last rule that matches decides, as in GitIgnore.match
+    for rule in reversed(parse_gitignore(lines)):
+        if rule.dir_only and not is_dir:
+            continue
+        if rule.regex.fullmatch(path):
+            return not rule.negated
+
+    return False
+
+
+class TestGitignoreSyntax(unittest.TestCase):
+    def test_unanchored(self):
+        self.assertTrue(_matches(["*.log"], "a.log"))
+        self.assertTrue(_matches(["*.log"], "deep/down/a.log"))
+        self.assertFalse(_matches(["*.log"], "a.log.txt"))
+        self.assertTrue(_matches(["build"], "src/build", is_dir=True))
+
+    def test_anchored(self):
+        self.assertTrue(_matches(["/build"], "build"))
+        self.assertFalse(_matches(["/build"], "src/build"))
+        self.assertTrue(_matches(["doc/*.txt"], "doc/a.txt"))
+        self.assertFalse(_matches(["doc/*.txt"], "doc/deeper/a.txt"))
+        self.assertFalse(_matches(["doc/*.txt"], "src/doc/a.txt"))
+
+    def test_double_asterisk(self):
+        self.assertTrue(_matches(["**/logs"], "logs", is_dir=True))
+        self.assertTrue(_matches(["**/logs"], "a/b/logs", is_dir=True))
+        self.assertTrue(_matches(["a/**/b"], "a/b"))
+        self.assertTrue(_matches(["a/**/b"], "a/x/y/b"))
+        self.assertTrue(_matches(["abc/**"], "abc/x/y"))
+        self.assertFalse(_matches(["abc/**"], "abc"))
+
+    def test_directories_only(self):
+        self.assertTrue(_matches(["out/"], "out", is_dir=True))
+        self.assertFalse(_matches(["out/"], "out"))
+
+    def test_negation_and_escapes(self):
+        self.assertFalse(_matches(["*.log", "!keep.log"], "keep.log"))
+        self.assertTrue(_matches(["!keep.log", "*.log"], "keep.log"))
+        self.assertTrue(_matches(["\\!important"], "!important"))
+        self.assertTrue(_matches(["\\#hash"], "#hash"))
+        self.assertFalse(_matches(["#hash"], "#hash"))
+        self.assertTrue(_matches(["trailing\\ "], "trailing "))
+        self.assertTrue(_matches(["trailing   "], "trailing"))
+
+    def test_classes(self):
+        self.assertTrue(_matches(["file[0-9].txt"], "file3.txt"))
+        self.assertFalse(_matches(["file[!0-9].txt"], "file3.txt"))
+        self.assertTrue(_matches(["file[!0-9].txt"], "filex.txt"))
+        self.assertTrue(_matches(["[]]"], "]"))
+        self.assertTrue(_matches(["a?c"], "abc"))
+        self.assertFalse(_matches(["a?c"], "a/c"))
+
+
+class TestGitIgnore(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+
+        os.mkdir(".git")
+        os.makedirs(os.path.join(".git", "info"))
+        _write(os.path.join(".git", "info", "exclude"), "excluded.py\n")
+        _write(".gitignore", "*.log\n/build/\nnode_modules/\n")
+        _write(os.path.join("src", ".gitignore"), "!keep.log\ngenerated/\n/local.py\n")
+
+        for path in [
+            "main.py",
+            "excluded.py",
+            "debug.log",
+            os.path.join("build", "out.py"),
+            os.path.join("src", "build", "kept.py"),
+            os.path.join("src", "keep.log"),
+            os.path.join("src", "other.log"),
+            os.path.join("src", "local.py"),
+            os.path.join("src", "deeper", "local.py"),
+            os.path.join("src", "generated", "gen.py"),
+            os.path.join("web", "node_modules", "dep", "index.js"),
+        ]:
+            _write(path, "# TODO\n")
+
+    def _walk(self, gitignore):
+        paths = WatchedPaths([self.directory], gitignore=gitignore)
+        return sorted(os.path.relpath(path) for path in paths.walk())
+
+    def test_hierarchy(self):
+        self.assertEqual(
+            self._walk(GitIgnore()),
+            sorted(
+                [
+                    ".gitignore",
+                    "main.py",
+                    os.path.join("src", ".gitignore"),
+                    os.path.join("src", "build", "kept.py"),
+                    os.path.join("src", "keep.log"),
+                    os.path.join("src", "deeper", "local.py"),
+                ]
+            ),
+        )
+
+    def test_ignored_directories_are_pruned(self):
+        gitignore = GitIgnore()
+        self._walk(gitignore)
+
+        # The .gitignore of a directory that is never walked is never read
+        self.assertIn(os.path.join(self.directory, "src"), gitignore._rules)
+        self.assertNotIn(os.path.join(self.directory, "build"), gitignore._rules)
+        self.assertTrue(gitignore.is_excluded(os.path.join("build", "out.py")))
+        self.assertTrue(
+            gitignore.is_excluded(
+                os.path.join("web", "node_modules", "dep", "index.js")
+            )
+        )
+
+    @unittest.skipIf(shutil.which("git") is None, "git is not installed")
+    def test_same_as_git(self):
+        shutil.rmtree(".git")
+        subprocess.run(["git", "init", "-q"], check=True)
+        _write(os.path.join(".git", "info", "exclude"), "excluded.py\n")
+
+        listed = subprocess.run(
+            ["git", "ls-files", "-z", "--others", "--exclude-standard"],
+            capture_output=True,
+            check=True,
+        ).stdout.decode("utf-8")
+
+        self.assertEqual(
+            self._walk(GitIgnore()),
+            sorted(path for path in listed.split("\0") if len(path) > 0),
+        )
+
+    def test_todoon_gitignore(self):
+        _write(".todo-ignore", "")  # todoon
+
+        td.todoon(git_files=False, silent=True, print_nothing=True)
+        self.assertEqual(os.environ["TODOON_FILES_SCANNED"], "14")
+
+        td.todoon(git_files=False, use_gitignore=True, silent=True, print_nothing=True)
+        self.assertEqual(os.environ["TODOON_FILES_SCANNED"], "6")
+
+
+if __name__ == "__main__":
+    unittest.main()
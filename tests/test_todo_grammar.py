@@ -1,5 +1,6 @@
 import unittest
-from todo_or_not.todo_grammar import TodoGrammar
+from todo_or_not.todo_grammar import TodoGrammar, BlockCommentTracker
+from todo_or_not.todo_grammar import parse_block_comment, resolve_language
 from todo_or_not.todo_check import Hit
 
 
@@ -548,3 +549,78 @@ class TestTodoGrammarUndefinedLanguage(unittest.TestCase):
         expected_hit.structured_labels = ["label"]
         result = self.grammar.safe_parse(code)
         assert expected_hit == result
+
+
+class TestBlockCommentTracker(unittest.TestCase):
+    def test_python_docstring(self):
+        tracker = BlockCommentTracker("py")
+
+        assert tracker.feed("def f():\n") is None
+        assert tracker.feed("    '''TODO first\n") == "TODO first"
+        assert tracker.feed("    second\n") == "second"
+        assert tracker.feed("    third'''  # TODO\n") == "third"
+        assert tracker.feed("    return 1\n") is None
+
+    def test_python_double_quoted_docstring(self):
+        tracker = BlockCommentTracker("py")
+
+        assert tracker.feed('    """TODO first\n') == "TODO first"
+        assert tracker.feed("    it's '''quoted'''\n") == "it's '''quoted'''"
+        assert tracker.feed('    """\n') == ""
+        assert tracker.feed("    return 1\n") is None
+
+    def test_no_block_comments_in_unknown_languages(self):
+        tracker = BlockCommentTracker("md")
+
+        assert tracker.feed("Use `src/*.py` for globs.\n") is None
+        assert tracker.feed("\n") is None
+        assert tracker.feed("The todo list app is great.\n") is None
+
+    def test_c_block_comments(self):
+        tracker = BlockCommentTracker("c")
+
+        assert tracker.feed("int a; /* one */ int b; /* two */\n") == "one two"
+        assert tracker.feed("int c; // /* not a block comment\n") is None
+        assert tracker.feed("/*\n") == ""
+        assert tracker.feed(" * TODO\n") == "* TODO"
+        assert tracker.feed(" */ int d;\n") == ""
+        assert tracker.feed("int e;\n") is None
+
+    def test_parse_block_comment(self):
+        assert parse_block_comment("nothing to see here", "c") is None
+
+        code = "* TODO Title | Body #label"
+        expected_hit = Hit("file", 1, ["todo"], ["TODO Title | Body #label"], 0)
+        expected_hit.structured_title = "TODO Title"
+        expected_hit.structured_body = "Body #label"
+        expected_hit.structured_labels = ["label"]
+        result = parse_block_comment(code, "c")
+        assert expected_hit == result
+        assert result.pertinent_lines == ["TODO Title | Body #label"]
+
+
+class TestResolveLanguage(unittest.TestCase):
+    def test_by_extension(self):
+        assert resolve_language("main.py") == "python"
+        assert resolve_language("src/main.cpp") == "c++"
+        assert resolve_language("notes.txt") == "x_default"
+
+    def test_by_well_known_filename(self):
+        assert resolve_language("Makefile") == "shell"
+        assert resolve_language("docker/Dockerfile") == "shell"
+        assert resolve_language("v1.2/Makefile") == "shell"
+        assert resolve_language("Gemfile") == "ruby"
+
+    def test_by_shebang(self):
+        assert resolve_language("bin/deploy", "#!/bin/bash\n") == "shell"
+        assert resolve_language("bin/run", "#!/usr/bin/env python3.11\n") == "python"
+        assert (
+            resolve_language("bin/run", "#!/usr/bin/env -S node --harmony\n")
+            == "javascript"
+        )
+        assert resolve_language("bin/run", "#!/usr/bin/env\n") == "x_default"
+        assert resolve_language("bin/run", "#!\n") == "x_default"
+        assert resolve_language("bin/run", "# not a shebang\n") == "x_default"
+
+    def test_extension_takes_precedence_over_shebang(self):
+        assert resolve_language("script.rb", "#!/bin/bash\n") == "ruby"
@@ -0,0 +1,123 @@
+import os
+import shutil
+import subprocess
+import unittest
+
+import todo_or_not.todo_check as td
+from todo_or_not.todo_history import TodoHistory
+from todo_or_not.todo_settings import Settings
+
+from temporary_directory import TemporaryDirectoryTestCase
+
+
+def _write(path, contents):
+    with open(path, "w") as file:
+        file.write(contents)
+
+
+def _git(*args):
+    return (
+        subprocess.run(
+            [
+                "git",
+                "-c",
+                "user.name=todoon",
+                "-c",
+                "user.email=todoon@example.com",
+                *args,
+            ],
+            capture_output=True,
+            check=True,
+        )
+        .stdout.decode("utf-8")
+        .strip()
+    )
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is not installed")
+class TestTodoHistory(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+
+        _git("init", "-q")
+        self.commits = []
+
+        def _commit(message):
+            _git("add", "-A")
+            _git("commit", "-q", "--allow-empty", "-m", message)
+            self.commits.append(_git("rev-parse", "HEAD"))
+
+        _write("a.py", "# TODO first\n")
+        _write("ignored.txt", "# TODO ignored\n")
+        _commit("one")
+
+        # A copy of a.py, the same blob
+        _write("b.py", "# TODO first\n")
+        _commit("two")
+
+        _write("a.py", "# TODO first\n# FIXME second\n")
+        _commit("three")
+
+        # Back to a blob that was already seen
+        _write("a.py", "# TODO first\n")
+        os.remove("b.py")
+        _commit("four")
+
+        self.scanned = []
+
+    def _history(self):
+        def _scan_content(path, contents):
+            self.scanned.append(os.path.relpath(path))
+            return td.find_hits_in_content(path, contents, "# todoon", {}, Settings())
+
+        def _selected(path):
+            return not path.endswith(".txt")
+
+        return TodoHistory(_scan_content, _selected)
+
+    def test_counts_and_first_seen(self):
+        history = self._history()
+        history.walk("HEAD")
+
+        self.assertEqual(
+            history.commits,
+            [
+                (self.commits[0], 1, 0),
+                (self.commits[1], 2, 0),
+                (self.commits[2], 2, 1),
+                (self.commits[3], 1, 0),
+            ],
+        )
+
+        first_seen = sorted(history.first_seen.values())
+        self.assertEqual(
+            [(commit, path, line) for commit, path, line, _title in first_seen],
+            sorted([(self.commits[0], "a.py", 1), (self.commits[2], "a.py", 2)]),
+        )
+
+        # Two distinct blobs, the copy and the revert cost nothing
+        self.assertEqual(self.scanned, ["a.py", "a.py"])
+
+    def test_range_credits_the_parent(self):
+        history = self._history()
+        history.walk(f"{self.commits[1]}..HEAD")
+
+        self.assertEqual(
+            history.commits, [(self.commits[2], 2, 1), (self.commits[3], 1, 0)]
+        )
+        self.assertIn(
+            (self.commits[1], "a.py", 1),
+            [
+                (commit, path, line)
+                for commit, path, line, _ in history.first_seen.values()
+            ],
+        )
+
+    def test_todoon_history(self):
+        _write(".todo-ignore", "*.txt\n")  # todoon
+
+        td.todoon_history("HEAD", output_json=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
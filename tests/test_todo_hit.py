@@ -1,6 +1,7 @@
 import unittest
 
 from todo_or_not.todo_hit import Hit
+from todo_or_not.todo_settings import Settings
 
 
 class TestTodoHit(unittest.TestCase):
@@ -12,7 +13,7 @@ class TestTodoHit(unittest.TestCase):
         assert 1 != self.hit_a
 
     def test_labels_with_issue_generation(self):
-        self.hit_a.generate_issue(True)
+        self.hit_a.generate_issue(Settings.resolve(), True)
 
 
 if __name__ == "__main__":
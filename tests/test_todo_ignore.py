@@ -0,0 +1,263 @@
+import os
+import unittest
+from unittest import mock
+
+import todo_or_not.todo_check as td
+from todo_or_not.todo_ignore import (
+    NestedTodoIgnore,
+    compact_todo_ignore,
+    ignores_alike,
+    match_todo_ignore,
+)
+from todo_or_not.todo_watch import WatchedPaths
+
+from temporary_directory import TemporaryDirectoryTestCase
+
+
+def _write(path, contents="# TODO\n"):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    with open(path, "w") as file:
+        file.write(contents)
+
+
+class TestNestedTodoIgnore(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+
+        _write(".todo-ignore", "top.py\n")  # todoon
+        _write(os.path.join("a", ".todo-ignore"), "gen/\n*.min.js\n")  # todoon
+
+        for path in [
+            "top.py",
+            "main.py",
+            os.path.join("a", "keep.py"),
+            os.path.join("a", "app.min.js"),
+            os.path.join("a", "gen", "generated.py"),
+            os.path.join("a", "sub", "lib.min.js"),
+            os.path.join("b", "app.min.js"),
+            os.path.join("b", "gen", "generated.py"),
+        ]:
+            _write(path)
+
+        self.expected = sorted(
+            [
+                "main.py",
+                os.path.join("a", "keep.py"),
+                os.path.join("a", "sub", "lib.min.js"),
+                os.path.join("b", "app.min.js"),
+                os.path.join("b", "gen", "generated.py"),
+            ]
+        )
+
+    def test_scope_is_the_subtree(self):
+        nested_ignore = NestedTodoIgnore(self.directory)
+        paths = WatchedPaths(
+            [self.directory],
+            ignored_files=[".todo-ignore", "top.py"],  # todoon
+            nested_ignore=nested_ignore,
+        )
+
+        self.assertEqual(
+            sorted(os.path.relpath(path) for path in paths.walk()), self.expected
+        )
+
+        # Paths that do not come from a walk are checked against every directory above them
+        self.assertFalse(
+            paths.should_scan(os.path.join(self.directory, "a", "gen", "new.py"))
+        )
+        self.assertTrue(
+            paths.should_scan(os.path.join(self.directory, "b", "gen", "new.py"))
+        )
+
+    def test_discarded_when_leaving(self):
+        nested_ignore = NestedTodoIgnore(self.directory)
+
+        nested_ignore.enter(os.path.join(self.directory, "a", "sub"))
+        self.assertEqual(
+            [dirpath for dirpath, matcher in nested_ignore._entered if matcher],
+            [os.path.join(self.directory, "a")],
+        )
+
+        nested_ignore.enter(os.path.join(self.directory, "b"))
+        self.assertEqual(
+            [dirpath for dirpath, _ in nested_ignore._entered],
+            [self.directory, os.path.join(self.directory, "b")],
+        )
+
+    def test_todoon(self):
+        td.todoon(git_files=False, silent=True, print_nothing=True)
+        self.assertEqual(os.environ["TODOON_FILES_SCANNED"], str(len(self.expected)))
+
+        # --force ignores them all
+        td.todoon(git_files=False, force=True, silent=True, print_nothing=True)
+        self.assertEqual(os.environ["TODOON_FILES_SCANNED"], "10")
+
+    def test_todoon_specified_directories(self):
+        td.todoon(files=["a"], git_files=False, silent=True, print_nothing=True)
+        self.assertEqual(os.environ["TODOON_FILES_SCANNED"], "2")
+
+        # Files named explicitly are scanned even if ignored
+        td.todoon(
+            files=["a", os.path.join("a", "app.min.js"), "top.py"],
+            git_files=False,
+            silent=True,
+            print_nothing=True,
+        )
+        self.assertEqual(os.environ["TODOON_FILES_SCANNED"], "4")
+
+        # An ignored directory named explicitly is still walked
+        td.todoon(
+            files=[os.path.join("a", "gen")],
+            git_files=False,
+            silent=True,
+            print_nothing=True,
+        )
+        self.assertEqual(os.environ["TODOON_FILES_SCANNED"], "1")
+
+        # The .todo-ignore files above a directory named explicitly still ignore what is under it # todoon
+        _write(os.path.join("c", ".todo-ignore"), "pkg/build\n")  # todoon
+        _write(os.path.join("c", "pkg", "a.py"))
+        _write(os.path.join("c", "pkg", "build", "b.py"))
+
+        td.todoon(
+            files=[os.path.join("c", "pkg")],
+            git_files=False,
+            silent=True,
+            print_nothing=True,
+        )
+        self.assertEqual(os.environ["TODOON_FILES_SCANNED"], "1")
+
+        # --no-ignore walks everything
+        td.todoon(
+            files=["a"],
+            no_ignore=True,
+            git_files=False,
+            silent=True,
+            print_nothing=True,
+        )
+        self.assertEqual(os.environ["TODOON_FILES_SCANNED"], "5")
+
+
+class TestTodoIgnoreSemantics(TemporaryDirectoryTestCase):
+    # Hidden names, character classes, ** and directories matched by a wildcard, "?" and "[" without a "*" are literal
+    lines = [
+        "*.py\n",
+        "docs/[ab].md\n",
+        "build*\n",
+        "**/*.log\n",
+        "file?.txt\n",
+        "src/[l]*.py\n",
+        "gen\n",
+    ]
+
+    tree = [
+        "main.py",
+        ".hidden.py",
+        "notes.txt",
+        "file1.txt",
+        "docs/a.md",
+        "docs/c.md",
+        "docs/[ab].md",
+        "build_out/x.js",
+        "src/deep/trace.log",
+        "src/.cache/trace.log",
+        "src/lib.py",
+        "gen/output.js",
+    ]
+
+    def _walk(self, root):
+        return sorted(
+            os.path.relpath(path, root).replace(os.sep, "/")
+            for path in td.walk_targets(
+                root, [], [], nested_ignore=NestedTodoIgnore(root, read_root=True)
+            )
+            if os.path.basename(path) != ".todo-ignore"  # todoon
+        )
+
+    def test_every_todo_ignore_matches_alike(self):  # todoon
+        for path in self.tree:
+            _write(os.path.join("top", path))
+            _write(os.path.join("nested", "sub", path))
+
+        # The top level .todo-ignore, resolved against the disk # todoon
+        os.chdir("top")
+        ignored_files, ignored_dirs, _ = td.resolve_todo_ignore(self.lines, os.getcwd())
+        top_level = sorted(
+            os.path.relpath(path).replace(os.sep, "/")
+            for path in td.walk_targets(os.getcwd(), ignored_files, ignored_dirs)
+        )
+        os.chdir(self.directory)
+
+        self.assertEqual(
+            top_level,
+            [
+                ".hidden.py",
+                "build_out/x.js",
+                "docs/a.md",
+                "docs/c.md",
+                "file1.txt",
+                "notes.txt",
+                "src/.cache/trace.log",
+            ],
+        )
+
+        # One below the top level # todoon
+        _write(os.path.join("nested", "sub", ".todo-ignore"), "".join(self.lines))
+        self.assertEqual(self._walk(os.path.join("nested", "sub")), top_level)
+
+        # The paths of a git tree, which are never on disk
+        ignored = match_todo_ignore(self.lines, self.tree)
+        self.assertEqual(sorted(set(self.tree) - ignored), top_level)
+
+
+class TestCompactTodoIgnore(TemporaryDirectoryTestCase):
+    def test_removed_adds_up_to_the_entries_removed(self):
+        for path in ["gen/a.min.js", "gen/b.min.js", "gen/c.min.js", "main.py"]:
+            _write(path)
+
+        lines = [
+            "gen/a.min.js",
+            "gen/b.min.js",
+            "gen/c.min.js",
+            "gen/c.min.js",
+            "main.py",
+        ]
+        compacted, removed = compact_todo_ignore(lines, self.directory)
+
+        self.assertEqual(compacted, ["gen/*.min.js", "main.py"])
+        self.assertEqual(removed, {"duplicates": 1, "subsumed": 0, "merged": 2})
+        self.assertEqual(sum(removed.values()), len(lines) - len(compacted))
+
+    def test_ignores_alike_skips_what_both_ignore(self):
+        for path in ["node_modules/pkg/index.js", "src/a.py", "src/b.py", "main.py"]:
+            _write(path)
+
+        walked = []
+        walk = os.walk
+
+        def _walk(top, *args, **kwargs):
+            for dirpath, dirnames, filenames in walk(top, *args, **kwargs):
+                walked.append(os.path.relpath(dirpath, self.directory))
+                yield dirpath, dirnames, filenames
+
+        with mock.patch.object(os, "walk", _walk):
+            self.assertTrue(
+                ignores_alike(
+                    ["node_modules", "src/a.py", "src/b.py"],
+                    ["node_modules", "src/*.py"],
+                    self.directory,
+                )
+            )
+
+        self.assertEqual(sorted(walked), [".", "src"])
+
+        # Only one of them ignores main.py, or what is under node_modules
+        self.assertFalse(ignores_alike(["*.py"], ["src/*.py"], self.directory))
+        self.assertFalse(
+            ignores_alike(["node_modules"], ["node_modules/*/*.js"], self.directory)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+import json
+import os
+import unittest
+from unittest import mock
+
+import todo_or_not.todo_check as td
+from todo_or_not.todo_app import TodoRun
+from todo_or_not.todo_metrics import (
+    Histogram,
+    format_prometheus,
+    get_metrics_format,
+)
+from todo_or_not.todo_settings import Settings
+
+from temporary_directory import TemporaryDirectoryTestCase
+
+RUN_OPTIONS = {
+    "fail_closed_duplicates": False,
+    "silent": True,
+    "print_mode": True,
+    "push_github_env_vars": False,
+}
+
+
+class TestMetrics(unittest.TestCase):
+    def test_histogram(self):
+        histogram = Histogram(buckets=(0.1, 1.0))
+
+        for value in [0.05, 0.1, 0.5, 3.0]:
+            histogram.observe(value)
+
+        self.assertEqual(
+            histogram.get_cumulative_counts(), [("0.1", 2), ("1.0", 3), ("+Inf", 4)]
+        )
+        self.assertEqual(histogram.count, 4)
+        self.assertAlmostEqual(histogram.sum, 3.65)
+
+    def test_get_metrics_format(self):
+        self.assertEqual(get_metrics_format("todoon.prom"), "prometheus")
+        self.assertEqual(get_metrics_format("metrics.JSON"), "json")
+        self.assertEqual(get_metrics_format("metrics.json", "prometheus"), "prometheus")
+
+        with self.assertRaises(ValueError):
+            get_metrics_format("todoon.prom", "xml")
+
+    def test_format_prometheus(self):
+        this_run = TodoRun(RUN_OPTIONS, Settings())
+        this_run.number_of_files_scanned = 3
+        this_run.number_of_todo = 2
+        this_run.file_scan_latency.observe(0.002)
+
+        lines = format_prometheus(this_run, {"repository": 'a/"b"'}).splitlines()
+
+        self.assertIn('todoon_files_scanned{repository="a/\\"b\\""} 3', lines)
+        self.assertIn('todoon_todos{repository="a/\\"b\\""} 2', lines)
+        self.assertIn(
+            'todoon_file_scan_duration_seconds_bucket{repository="a/\\"b\\"",le="0.0025"} 1',
+            lines,
+        )
+        self.assertIn(
+            'todoon_api_request_duration_seconds_count{repository="a/\\"b\\"",call="create_issue"} 0',
+            lines,
+        )
+
+        # Each run counts from zero, so its counts are not Prometheus counters
+        self.assertIn("# TYPE todoon_files_scanned gauge", lines)
+
+        # One HELP and TYPE for every series of a metric
+        self.assertEqual(
+            lines.count("# TYPE todoon_api_request_duration_seconds histogram"), 1
+        )
+
+
+class TestTodoonMetrics(TemporaryDirectoryTestCase):
+    resource = "todo_and_fixme"
+
+    def test_todoon_metrics_json(self):
+        td.todoon(
+            git_files=False, metrics_out="metrics.json", silent=True, print_nothing=True
+        )
+
+        with open("metrics.json") as file:
+            metrics = json.load(file)
+
+        self.assertEqual(metrics["gauges"]["todoon_files_scanned"], 1)
+        self.assertEqual(metrics["gauges"]["todoon_todos"], 1)
+        self.assertEqual(metrics["gauges"]["todoon_fixmes"], 1)
+
+        file_scans = metrics["histograms"]["todoon_file_scan_duration_seconds"][0]
+        self.assertEqual(file_scans["count"], 1)
+        self.assertEqual(file_scans["buckets"]["+Inf"], 1)
+
+    def test_todoon_metrics_prometheus(self):
+        with mock.patch.dict(os.environ):
+            os.environ.pop("GITHUB_REPOSITORY", None)
+
+            td.todoon(
+                git_files=False,
+                metrics_out="todoon.prom",
+                silent=True,
+                print_nothing=True,
+            )
+
+        with open("todoon.prom") as file:
+            lines = file.read().splitlines()
+
+        self.assertIn("todoon_hits 2", lines)
+        self.assertIn("todoon_file_scan_duration_seconds_count 1", lines)
+
+    def test_todoon_metrics_repository_label(self):
+        with mock.patch.dict(os.environ, {"GITHUB_REPOSITORY": "owner/repository"}):
+            td.todoon(
+                git_files=False,
+                metrics_out="todoon.prom",
+                silent=True,
+                print_nothing=True,
+            )
+
+        with open("todoon.prom") as file:
+            lines = file.read().splitlines()
+
+        self.assertIn('todoon_hits{repository="owner/repository"} 2', lines)
+        self.assertIn(
+            'todoon_file_scan_duration_seconds_count{repository="owner/repository"} 1',
+            lines,
+        )
+
+    def test_todoon_metrics_readable_by_others(self):
+        umask = os.umask(0o022)
+
+        try:
+            td.todoon(
+                git_files=False,
+                metrics_out="todoon.prom",
+                silent=True,
+                print_nothing=True,
+            )
+        finally:
+            os.umask(umask)
+
+        # A textfile collector often runs as another user
+        self.assertEqual(os.stat("todoon.prom").st_mode & 0o777, 0o644)
+
+    def test_todoon_unknown_metrics_format(self):
+        with self.assertRaises(SystemExit):
+            td.todoon(
+                git_files=False,
+                metrics_out="todoon.prom",
+                metrics_format="xml",
+                print_nothing=True,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
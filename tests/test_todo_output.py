@@ -0,0 +1,134 @@
+import contextlib
+import io
+import json
+import unittest
+
+import todo_or_not.todo_check as td
+import todo_or_not.utility
+from todo_or_not.todo_hit import Hit
+from todo_or_not.todo_output import JsonLinesWriter, create_writer
+
+from temporary_directory import TemporaryDirectoryTestCase
+
+
+def _hit(line=3, keys=None):
+    return Hit(
+        "src/a.py",
+        line,
+        keys or ["todo"],
+        ["x = 1\n", "# TODO thing\n", "y = 2\n"],
+        1,
+    )
+
+
+class TestOutputWriters(unittest.TestCase):
+    def test_jsonl(self):
+        stream = io.StringIO()
+        writer = create_writer("jsonl", stream, with_context=True)
+
+        writer.write(_hit())
+        writer.write(_hit(7, ["fixme"]))
+        writer.close()
+
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0]["file"], "src/a.py")
+        self.assertEqual(records[0]["line"], 3)
+        self.assertEqual(records[0]["keywords"], ["todo"])
+        self.assertEqual(records[0]["text"], "# TODO thing")
+        self.assertEqual(records[0]["context"]["start_line"], 2)
+        self.assertEqual(records[1]["keywords"], ["fixme"])
+
+    def test_batches(self):
+        stream = io.StringIO()
+        writer = JsonLinesWriter(stream, batch_size=2, flush_interval=60)
+
+        writer.write(_hit())
+        self.assertEqual(stream.getvalue(), "")
+
+        writer.write(_hit())
+        self.assertEqual(len(stream.getvalue().splitlines()), 2)
+
+        writer.write(_hit())
+        writer.close()
+        self.assertEqual(len(stream.getvalue().splitlines()), 3)
+
+    def test_sarif(self):
+        for number_of_hits in [0, 1, 3]:
+            stream = io.StringIO()
+            writer = create_writer("sarif", stream)
+
+            for i in range(number_of_hits):
+                writer.write(_hit(i + 1, ["fixme"] if i % 2 else ["todo"]))
+            writer.close()
+
+            log = json.loads(stream.getvalue())
+            results = log["runs"][0]["results"]
+
+            self.assertEqual(log["version"], "2.1.0")
+            self.assertEqual(len(results), number_of_hits)
+
+            if number_of_hits > 1:
+                self.assertEqual(results[1]["ruleId"], "fixme")
+                self.assertEqual(results[1]["level"], "warning")
+                self.assertEqual(
+                    results[1]["locations"][0]["physicalLocation"]["region"][
+                        "startLine"
+                    ],
+                    2,
+                )
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            create_writer("xml")
+
+
+class TestTodoonFormat(TemporaryDirectoryTestCase):
+    resource = "todo_and_fixme"
+
+    def test_todoon_jsonl(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            td.todoon(
+                git_files=False, output_format="jsonl", silent=True, print_nothing=True
+            )
+
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+
+        self.assertEqual(
+            [(record["file"], record["line"]) for record in records],
+            [("main.py", 1), ("main.py", 3)],
+        )
+
+    def test_todoon_diagnostics_not_in_output(self):
+        # Neither utf-8 nor utf-16, so a warning is printed when it is skipped
+        with open("binary", "wb") as file:
+            file.write(b"\xff\xfe\xfd")
+
+        for output_format in ["jsonl", "sarif"]:
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output), contextlib.redirect_stderr(
+                io.StringIO()
+            ):
+                td.todoon(
+                    git_files=False,
+                    output_format=output_format,
+                    verbose=True,
+                    silent=True,
+                )
+                todo_or_not.utility.flush_output()
+
+            if output_format == "jsonl":
+                records = [json.loads(line) for line in output.getvalue().splitlines()]
+                self.assertEqual(len(records), 2)
+            else:
+                self.assertEqual(len(json.loads(output.getvalue())["runs"]), 1)
+
+    def test_todoon_unknown_format(self):
+        with self.assertRaises(SystemExit):
+            td.todoon(git_files=False, output_format="xml", print_nothing=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import json
+import os
+import unittest
+
+import todo_or_not.todo_check as td
+import todo_or_not.utility as util
+from todo_or_not.todo_progress import ProgressReporter, get_weight
+
+from temporary_directory import TemporaryDirectoryTestCase
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestProgressReporter(TemporaryDirectoryTestCase):
+    def test_get_weight(self):
+        with open("a.py", "w") as file:
+            file.write("x = 1\n")
+        with open("empty.py", "w"):
+            pass
+
+        self.assertEqual(get_weight("a.py"), 6)
+        self.assertEqual(get_weight("empty.py"), 1)
+        self.assertEqual(get_weight("missing.py"), 1)
+
+    def test_throttled(self):
+        clock = FakeClock()
+        progress = ProgressReporter(total_bytes=1000, rate=2, clock=clock)
+
+        # Only the first of many files scanned at once is published
+        for _ in range(10):
+            progress.advance(1)
+        self.assertEqual(progress.number_published, 1)
+
+        clock.now = 0.4
+        progress.advance(1)
+        self.assertEqual(progress.number_published, 1)
+
+        clock.now = 0.6
+        progress.advance(1)
+        self.assertEqual(progress.number_published, 2)
+
+        progress.finish()
+        self.assertEqual(progress.number_published, 3)
+
+    def test_weighed_by_bytes(self):
+        clock = FakeClock()
+        progress = ProgressReporter(
+            total_bytes=1000, total_files=2, status_file="status.json", clock=clock
+        )
+
+        clock.now = 2.0
+        progress.advance(250)
+
+        self.assertEqual(os.environ["TODOON_PROGRESS"], "25.0")
+
+        with open("status.json") as file:
+            status = json.load(file)
+
+        self.assertEqual(status["status"], "scanning-files")
+        self.assertEqual(status["progress"], 25.0)
+        self.assertEqual(status["files_scanned"], 1)
+        self.assertEqual(status["bytes_per_second"], 125.0)
+        self.assertEqual(status["eta_seconds"], 6.0)
+
+        progress.advance(750)
+        progress.finish()
+
+        with open("status.json") as file:
+            status = json.load(file)
+
+        self.assertEqual(status["status"], "finished")
+        self.assertEqual(status["progress"], 100.0)
+        self.assertEqual(status["eta_seconds"], 0.0)
+
+    def test_written_with_the_mode_of_the_file(self):
+        umask = os.umask(0o022)
+
+        try:
+            util.write_atomically("status.json", b"{}")
+            self.assertEqual(os.stat("status.json").st_mode & 0o777, 0o644)
+
+            os.chmod("status.json", 0o640)
+            util.write_atomically("status.json", b"{}")
+            self.assertEqual(os.stat("status.json").st_mode & 0o777, 0o640)
+        finally:
+            os.umask(umask)
+
+    def test_unknown_total(self):
+        progress = ProgressReporter(status_file="status.json")
+        progress.advance(10)
+
+        self.assertIsNone(progress.get_progress())
+        self.assertIsNone(progress.get_eta())
+
+        progress.finish()
+        self.assertEqual(progress.get_progress(), 100.0)
+        self.assertEqual(progress.total_files, 1)
+
+    def test_status_file_not_written(self):
+        progress = ProgressReporter(
+            total_bytes=1, status_file=os.path.join("missing", "status.json")
+        )
+        progress.advance(1)
+
+        self.assertIsInstance(progress.status_file_error, OSError)
+        self.assertIsNone(progress.status_file)
+
+    def test_todoon_status_file(self):
+        with open(".todo-ignore", "w") as file:  # todoon
+            file.write("status.json\n")
+
+        with open("big.py", "w") as file:
+            file.write("# TODO large\n" + "x = 1\n" * 1000)
+        with open("small.py", "w") as file:
+            file.write("y = 2\n")
+
+        td.todoon(
+            git_files=False, status_file="status.json", silent=True, print_nothing=True
+        )
+
+        with open("status.json") as file:
+            status = json.load(file)
+
+        self.assertEqual(status["status"], "finished")
+        self.assertEqual(status["files_scanned"], status["files_total"])
+        self.assertEqual(status["bytes_scanned"], status["bytes_total"])
+        self.assertGreater(status["bytes_total"], 6000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,197 @@
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest import mock
+
+import todo_or_not.todo_check
+import todo_or_not.utility
+from todo_or_not.todo_client import request
+from todo_or_not.todo_gitignore import GitIgnore
+from todo_or_not.todo_ignore import NestedTodoIgnore
+from todo_or_not.todo_serve import TodoDaemon, serve
+from todo_or_not.todo_settings import Settings
+from todo_or_not.todo_watch import WatchedPaths
+
+from temporary_directory import TemporaryDirectoryTestCase
+
+
+def _write(path, contents):
+    with open(path, "w") as file:
+        file.write(contents)
+
+
+class TestTodoDaemon(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.todo_ignore_path = os.path.join(self.directory, ".todo-ignore")  # todoon
+        os.mkdir("ignored")
+        _write(self.todo_ignore_path, "ignored/\n")
+        _write("a.py", "# TODO first\n")
+        _write(os.path.join("ignored", "b.py"), "# TODO hidden\n")
+
+        self.scanned = []
+        self.daemon = TodoDaemon(
+            self._scan,
+            self._load_paths,
+            self.todo_ignore_path,
+            {
+                "silent": False,
+                "print_mode": True,
+                "fail_closed_duplicates": False,
+                "push_github_env_vars": False,
+            },
+            Settings(),
+        )
+
+    def _scan(self, path):
+        self.scanned.append(os.path.relpath(path, self.directory))
+        return todo_or_not.todo_check.find_hits(path, "# todoon", {}, Settings())
+
+    def _load_paths(self):
+        use_encoding = todo_or_not.todo_check.get_encoding(
+            self.todo_ignore_path, ["utf-8"]
+        )
+        ignored_files, ignored_dirs, ignored_patterns = (
+            todo_or_not.todo_check.read_todo_ignore(self.todo_ignore_path, use_encoding)
+        )
+        ignored_files.append(self.todo_ignore_path)
+
+        return WatchedPaths(
+            [self.directory],
+            ignored_files=ignored_files,
+            ignored_dirs=ignored_dirs,
+            ignored_patterns=ignored_patterns,
+            nested_ignore=NestedTodoIgnore(self.directory),
+            gitignore=GitIgnore(self.directory),
+        )
+
+    def test_only_changed_files_are_rescanned(self):
+        response = self.daemon.handle({"command": "scan"})
+        self.assertEqual(len(response["hits"]), 1)
+        self.assertEqual(response["exit_code"], 1)
+        self.assertEqual(self.scanned, ["a.py"])
+
+        response = self.daemon.handle({"command": "scan", "silent": True})
+        self.assertEqual(len(response["hits"]), 1)
+        self.assertEqual(response["exit_code"], 0)
+        self.assertEqual(self.scanned, ["a.py"])
+
+        _write("a.py", "# TODO first\n# FIXME second\n")
+        response = self.daemon.handle({"command": "scan", "files": ["a.py"]})
+        self.assertEqual(len(response["hits"]), 2)
+        self.assertEqual(self.scanned, ["a.py", "a.py"])
+
+    def test_deleted_files_are_forgotten(self):
+        self.daemon.handle({"command": "scan"})
+        os.remove("a.py")
+
+        response = self.daemon.handle({"command": "scan"})
+        self.assertEqual(response["hits"], [])
+        self.assertEqual(response["exit_code"], 0)
+
+    def test_todo_ignore_changes_invalidate_state(self):  # todoon
+        self.daemon.handle({"command": "scan"})
+
+        _write(self.todo_ignore_path, "# Nothing ignored\n")
+        response = self.daemon.handle({"command": "scan"})
+
+        self.assertEqual(len(response["hits"]), 2)
+        self.assertEqual(sorted(self.scanned), ["a.py", "a.py", "ignored/b.py"])
+
+    def test_nested_todo_ignore_changes_invalidate_state(self):  # todoon
+        os.mkdir("sub")
+        _write(os.path.join("sub", "c.py"), "# TODO nested\n")
+
+        response = self.daemon.handle({"command": "scan"})
+        self.assertEqual(len(response["hits"]), 2)
+
+        # Created after the walk first entered sub/
+        _write(os.path.join("sub", ".todo-ignore"), "c.py\n")  # todoon
+        response = self.daemon.handle({"command": "scan"})
+        self.assertEqual(len(response["hits"]), 1)
+
+        _write(os.path.join("sub", ".todo-ignore"), "# Nothing ignored\n")  # todoon
+        response = self.daemon.handle({"command": "scan"})
+        self.assertEqual(len(response["hits"]), 2)
+
+    def test_gitignore_changes_invalidate_state(self):
+        self.daemon.handle({"command": "scan"})
+
+        _write(".gitignore", "a.py\n")
+        response = self.daemon.handle({"command": "scan"})
+        self.assertEqual(response["hits"], [])
+
+        os.remove(".gitignore")
+        response = self.daemon.handle({"command": "scan"})
+        self.assertEqual(len(response["hits"]), 1)
+
+    def test_query_does_not_scan(self):
+        self.daemon.handle({"command": "scan"})
+        _write("a.py", "# Nothing to do\n")
+
+        response = self.daemon.handle({"command": "query"})
+        self.assertEqual(len(response["hits"]), 1)
+        self.assertEqual(self.scanned, ["a.py"])
+
+    def test_unknown_command(self):
+        self.assertIn("error", self.daemon.handle({"command": "dance"}))
+
+    def test_serve_over_socket(self):
+        socket_path = os.path.join(self.directory, "todoon.sock")
+
+        serving = threading.Thread(
+            target=serve,
+            args=(socket_path, self.daemon),
+            kwargs={"log_level": todo_or_not.utility.LOG_LEVEL_NONE},
+            daemon=True,
+        )
+        serving.start()
+
+        for _ in range(100):
+            if os.path.exists(socket_path):
+                break
+            time.sleep(0.05)
+
+        self.assertEqual(os.stat(socket_path).st_mode & 0o777, 0o600)
+
+        response = request(socket_path, {"command": "scan", "files": ["a.py"]})
+        self.assertEqual(len(response["hits"]), 1)
+
+        # Requests the daemon can not answer are answered with an error, the daemon keeps serving
+        self.assertIn("error", request(socket_path, ["scan"]))
+        self.assertIn("error", request(socket_path, {"command": "scan", "files": 1}))
+
+        response = request(socket_path, {"command": "query", "files": ["a.py"]})
+        self.assertEqual(len(response["hits"]), 1)
+
+        self.assertEqual(
+            request(socket_path, {"command": "shutdown"}), {"stopping": True}
+        )
+        serving.join(timeout=5)
+
+        self.assertFalse(serving.is_alive())
+        self.assertFalse(os.path.exists(socket_path))
+
+
+class TestTodoonCommands(TemporaryDirectoryTestCase):
+    def test_file_named_like_a_command(self):
+        _write("serve", "#!/bin/sh\n# TODO first\n")
+        serving = mock.Mock()
+
+        # After --, serve is a file to scan rather than the command
+        with mock.patch.object(sys, "argv", ["todoon", "--", "serve"]):
+            with mock.patch.dict(
+                todo_or_not.todo_check.todoon_subcommands, {"serve": serving}
+            ):
+                with self.assertRaises(SystemExit) as exited:
+                    todo_or_not.todo_check.typer_todoon()
+
+        serving.assert_not_called()
+        self.assertEqual(exited.exception.code, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
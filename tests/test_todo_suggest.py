@@ -0,0 +1,121 @@
+import contextlib
+import io
+import os
+import unittest
+
+import todo_or_not.todo_check as td
+from todo_or_not.todo_suggest import (
+    Suggestion,
+    classify_file,
+    format_suggestions,
+    suggest_todo_ignore,
+)
+from todo_or_not.utility import loc
+
+from temporary_directory import TemporaryDirectoryTestCase
+
+
+def _write(path, contents=b"# TODO\n"):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    with open(path, "wb") as file:
+        file.write(contents)
+
+
+class TestSuggest(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+
+        _write("main.py")
+        _write("logo.png", b"\x89PNG\r\n\x1a\n\0\0\0" * 1000)
+        _write("utf16.txt", "# TODO\n".encode("utf-16"))
+        _write("latin.txt", "café\n".encode("iso-8859-1"))
+        _write("data.json", b"[" + b"1, " * 1000 + b"1]\n")
+        _write("package-lock.json", b"{}\n")
+        _write(os.path.join("web", "app.min.js"), b"var a;\n")
+        _write(os.path.join("web", "index.js"), b"// TODO\n")
+        _write(os.path.join("gen", "a_pb2.py"), b"# TODO\n")
+        _write(os.path.join("gen", "b.py"), b"# @generated by a tool\n")
+        _write(os.path.join("node_modules", "dep", "index.js"), b"// TODO\n")
+
+    def test_classify_file(self):
+        self.assertIsNone(classify_file("main.py"))
+        self.assertIsNone(classify_file("utf16.txt"))
+        self.assertEqual(classify_file("logo.png"), "binary")
+        self.assertEqual(classify_file("latin.txt"), "encoding")
+        self.assertEqual(classify_file("data.json"), "long-lines")
+        self.assertEqual(classify_file("package-lock.json"), "generated")
+        self.assertEqual(classify_file(os.path.join("web", "app.min.js")), "minified")
+
+    def test_suggest_todo_ignore(self):
+        paths = []
+        for dirpath, dirnames, filenames in os.walk(self.directory):
+            paths.extend(os.path.join(dirpath, filename) for filename in filenames)
+
+        suggestions, total_size = suggest_todo_ignore(
+            paths, self.directory, failed_encodings={"utf16.txt"}
+        )
+
+        self.assertEqual(total_size, sum(os.path.getsize(path) for path in paths))
+        self.assertEqual(
+            {suggestion.entry: suggestion.reason for suggestion in suggestions},
+            {
+                "logo.png": "binary",
+                "data.json": "long-lines",
+                "latin.txt": "encoding",
+                "utf16.txt": "encoding",
+                "package-lock.json": "generated",
+                "web/app.min.js": "minified",
+                "gen/": "generated",
+                "node_modules/": "vendored",
+            },
+        )
+
+        # Most costly first
+        self.assertEqual(suggestions[0].entry, "logo.png")
+        self.assertEqual(
+            [suggestion.size for suggestion in suggestions],
+            sorted((suggestion.size for suggestion in suggestions), reverse=True),
+        )
+
+    def test_format_suggestions(self):
+        suggestions = [Suggestion("node_modules/", "vendored", 2048, 3)]
+
+        self.assertEqual(
+            format_suggestions(suggestions, 4096, "en_us", throughput=1024),
+            "# Would be scanned: 4.0 KiB, ignoring these would save the most\n"
+            "# vendored: 2.0 KiB (50.0%), ~2.00s, 3 file(s)\n"
+            "node_modules/",
+        )
+
+        # Every comment is written for the region
+        lines = format_suggestions(suggestions, 4096, "ko_kr").splitlines()
+        self.assertIn(loc("suggest_save_the_most", "ko_kr"), lines[0])
+        self.assertTrue(
+            lines[1].startswith(f"# {loc('suggest_reason_vendored', 'ko_kr')}:")
+        )
+        self.assertTrue(lines[1].endswith(f"3 {loc('suggest_files', 'ko_kr')}"))
+
+    def test_todo_ignore_util_suggest(self):
+        _write(".todo-ignore", b"logo.png\nnode_modules/\n")  # todoon
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            td.todo_ignore_util(suggest=True)
+
+        lines = output.getvalue().splitlines()
+        entries = [line for line in lines if not line.startswith("#")]
+
+        # What is already ignored is not suggested again
+        self.assertNotIn("logo.png", entries)
+        self.assertNotIn("node_modules/", entries)
+        self.assertIn("data.json", entries)
+        self.assertIn("gen/", entries)
+
+        # Nothing was written
+        with open(".todo-ignore", "rb") as file:  # todoon
+            self.assertEqual(file.read(), b"logo.png\nnode_modules/\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
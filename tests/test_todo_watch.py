@@ -0,0 +1,226 @@
+import os
+import threading
+import time
+import unittest
+
+import todo_or_not.todo_check
+import todo_or_not.utility
+from todo_or_not.todo_settings import Settings
+from todo_or_not.todo_watch import (
+    HitIndex,
+    InotifyWatcher,
+    PollingWatcher,
+    WatchedPaths,
+    watch,
+)
+
+from temporary_directory import TemporaryDirectoryTestCase
+
+
+def _scan(path):
+    return todo_or_not.todo_check.find_hits(path, "# todoon", {}, Settings())
+
+
+def _write(path, contents):
+    with open(path, "w") as file:
+        file.write(contents)
+
+
+class _ScriptedWatcher:
+    """Applies one change to the tree each time it is waited on, then reports the paths it touched"""
+
+    def __init__(self, changes):
+        self.changes = list(changes)
+        self.closed = False
+
+    def wait(self):
+        change = self.changes.pop(0)
+        return change()
+
+    def close(self):
+        self.closed = True
+
+
+class TestWatch(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+
+        os.mkdir("ignored")
+        _write("a.py", "# TODO first\n")
+        _write(os.path.join("ignored", "b.py"), "# TODO hidden\n")
+
+        self.paths = WatchedPaths(
+            [self.directory],
+            ignored_dirs=[os.path.join(self.directory, "ignored")],
+            ignored_patterns=[os.path.join(self.directory, "*.txt")],
+        )
+
+    def test_watched_paths(self):
+        self.assertTrue(self.paths.should_scan("a.py"))
+        self.assertTrue(self.paths.should_scan("not_created_yet.py"))
+        self.assertFalse(self.paths.should_scan(os.path.join("ignored", "b.py")))
+        self.assertFalse(self.paths.should_scan(os.path.join("..", "elsewhere.py")))
+        self.assertEqual(
+            list(self.paths.walk()), [os.path.join(self.directory, "a.py")]
+        )
+
+        # Wildcards are matched again as files appear
+        _write("notes.txt", "# TODO later\n")
+        self.assertTrue(self.paths.should_scan("notes.txt"))
+        self.paths.refresh()
+        self.assertFalse(self.paths.should_scan("notes.txt"))
+
+    def test_index_reports_only_changed_hits(self):
+        index = HitIndex(_scan)
+        path = os.path.join(self.directory, "a.py")
+
+        added, removed = index.update(path)
+        self.assertEqual(
+            [hit.get_triggering_line() for hit in added], ["# TODO first\n"]
+        )
+        self.assertEqual(removed, [])
+
+        # Moving a hit to another line is not a change
+        _write(path, "\n\n# TODO first\n# FIXME second\n")
+        added, removed = index.update(path)
+        self.assertEqual(
+            [hit.get_triggering_line() for hit in added], ["# FIXME second\n"]
+        )
+        self.assertEqual(removed, [])
+
+        os.remove(path)
+        added, removed = index.update(path)
+        self.assertEqual(added, [])
+        self.assertEqual(len(removed), 2)
+        self.assertNotIn(path, index.hits)
+
+    def test_watch_rescans_changed_files(self):
+        a = os.path.join(self.directory, "a.py")
+        c = os.path.join(self.directory, "c.py")
+        scanned = []
+
+        def _counting_scan(path):
+            scanned.append(path)
+            return _scan(path)
+
+        def _edit_a():
+            _write(a, "# TODO first\n# TODO second\n")
+            return {a}
+
+        def _create_c():
+            _write(c, "# FIXME third\n")
+            return {c}
+
+        def _delete_a():
+            os.remove(a)
+            return {a}
+
+        watcher = _ScriptedWatcher([_edit_a, _create_c, _delete_a])
+        index = watch(
+            [a],
+            self.paths,
+            _counting_scan,
+            {
+                "silent": True,
+                "print_mode": True,
+                "fail_closed_duplicates": False,
+                "push_github_env_vars": False,
+            },
+            Settings(),
+            log_level=todo_or_not.utility.LOG_LEVEL_NONE,
+            watcher=watcher,
+            max_batches=3,
+        )
+
+        self.assertEqual(scanned, [a, a, c])
+        self.assertEqual(list(index.hits.keys()), [c])
+        self.assertTrue(watcher.closed)
+
+    def _assert_watcher_sees_changes(self, watcher):
+        a = os.path.join(self.directory, "a.py")
+        result = {}
+
+        def _wait():
+            result["changed"] = watcher.wait()
+
+        try:
+            waiting = threading.Thread(target=_wait, daemon=True)
+            waiting.start()
+
+            time.sleep(0.2)
+            _write(os.path.join("ignored", "b.py"), "# TODO still hidden\n")
+            _write(a, "# TODO changed\n")
+
+            waiting.join(timeout=5)
+        finally:
+            watcher.close()
+
+        self.assertIn(a, result.get("changed", set()))
+        self.assertNotIn(
+            os.path.join(self.directory, "ignored", "b.py"), result["changed"]
+        )
+
+    def test_polling_watcher(self):
+        # Make sure the modification time moves even on coarse clocks
+        os.utime("a.py", ns=(0, 0))
+
+        self._assert_watcher_sees_changes(PollingWatcher(self.paths, interval=0.1))
+
+    def test_inotify_watcher(self):
+        try:
+            watcher = InotifyWatcher(self.paths)
+        except (OSError, AttributeError, TypeError):
+            self.skipTest("inotify is not available")
+
+        self._assert_watcher_sees_changes(watcher)
+
+    def test_inotify_watcher_moved_and_deleted_directories(self):
+        os.mkdir("moved")
+        os.mkdir("deleted")
+
+        try:
+            watcher = InotifyWatcher(self.paths)
+        except (OSError, AttributeError, TypeError):
+            self.skipTest("inotify is not available")
+
+        moved = os.path.join(self.directory, "moved")
+        deleted = os.path.join(self.directory, "deleted")
+
+        try:
+            # Moved into an ignored directory, so it is not watched again under its new path
+            os.rename("moved", os.path.join("ignored", "moved"))
+            os.rmdir("deleted")
+
+            changed = set()
+            while moved not in changed or deleted not in changed:
+                changed.update(watcher.wait())
+
+            self.assertNotIn(moved, watcher._watches.values())
+            self.assertNotIn(deleted, watcher._watches.values())
+
+            # Nothing is reported under the path it was moved away from
+            _write(os.path.join("ignored", "moved", "c.py"), "# TODO moved\n")
+            time.sleep(0.2)
+            self.assertEqual(watcher._read_events(), set())
+        finally:
+            watcher.close()
+
+    def test_inotify_watcher_closes_on_failure(self):
+        if not os.path.isdir("/proc/self/fd"):
+            self.skipTest("open descriptors can not be counted")
+
+        paths = WatchedPaths([os.path.join(self.directory, "missing", "a.py")])
+        open_descriptors = len(os.listdir("/proc/self/fd"))
+
+        try:
+            InotifyWatcher(paths)
+        except (AttributeError, TypeError):
+            self.skipTest("inotify is not available")
+        except OSError:
+            pass
+
+        self.assertEqual(len(os.listdir("/proc/self/fd")), open_descriptors)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+import os
+import unittest
+from unittest import mock
+
+import todo_or_not.todo_check as td
+from todo_or_not.todo_app import TodoRun
+from todo_or_not.todo_hit import Hit
+from todo_or_not.todo_settings import Settings
+from todo_or_not.utility import loc
+from todo_or_not.todo_workflow import (
+    append_to_workflow_file,
+    format_step_summary,
+    format_workflow_variables,
+)
+
+from temporary_directory import TemporaryDirectoryTestCase
+
+RUN_OPTIONS = {
+    "fail_closed_duplicates": False,
+    "silent": True,
+    "print_mode": True,
+    "push_github_env_vars": False,
+}
+
+
+def _hit(line):
+    return Hit("src/a|b.py", line, ["todo"], ["# TODO thing\n"], 0)
+
+
+class TestWorkflowFiles(TemporaryDirectoryTestCase):
+    def test_format_workflow_variables(self):
+        entries = format_workflow_variables({"A": "1", "B": "two\nlines"})
+
+        self.assertEqual(entries[0], "A=1\n")
+        self.assertRegex(
+            entries[1], r"^B<<(ghadelimiter_[0-9a-f-]+)\ntwo\nlines\n\1\n$"
+        )
+
+    def test_append_to_workflow_file(self):
+        with open("env", "w") as file:
+            file.write("EXISTING=1\n")
+
+        self.assertEqual(append_to_workflow_file("env", ["A=1\n", "B=2\n"]), 2)
+
+        # Only whole entries fit
+        self.assertEqual(
+            append_to_workflow_file("env", ["C=3\n", "D=4\n"], max_size=6), 1
+        )
+
+        with open("env") as file:
+            self.assertEqual(file.read(), "EXISTING=1\nA=1\nB=2\nC=3\n")
+
+    def test_format_step_summary(self):
+        this_run = TodoRun(RUN_OPTIONS, Settings())
+        this_run.number_of_hits = 5
+        this_run.number_of_todo = 5
+
+        summary = format_step_summary(this_run, [_hit(i + 1) for i in range(5)])
+
+        self.assertIn("| 5 | 0 | 0 | 0 | 0 |", summary)
+        self.assertIn("| `src/a\\|b.py` | 1 | todo | TODO - # TODO thing |", summary)
+        self.assertNotIn("more hits", summary)
+
+        summary = format_step_summary(
+            this_run, [_hit(i + 1) for i in range(5)], max_hits=2
+        )
+
+        self.assertIn("| `src/a\\|b.py` | 2 |", summary)
+        self.assertNotIn("| `src/a\\|b.py` | 3 |", summary)
+        self.assertIn("_3 more hits are not listed_", summary)
+
+        summary = format_step_summary(
+            this_run, [_hit(i + 1) for i in range(5)], max_size=1
+        )
+        self.assertIn("_5 more hits are not listed_", summary)
+
+    def test_format_step_summary_in_region(self):
+        this_run = TodoRun(RUN_OPTIONS, Settings(region="ko_kr"))
+        this_run.number_of_hits = 5
+
+        summary = format_step_summary(
+            this_run, [_hit(i + 1) for i in range(5)], max_hits=2
+        )
+
+        for key in [
+            "step_summary_files_scanned",
+            "step_summary_timing",
+            "step_summary_whole_run",
+            "step_summary_keywords",
+        ]:
+            self.assertIn(f"| {loc(key, 'ko_kr')} |", summary)
+
+        self.assertIn(f"_3 {loc('step_summary_hits_not_listed', 'ko_kr')}_", summary)
+        self.assertNotIn("Files scanned", summary)
+
+
+class TestTodoonWorkflow(TemporaryDirectoryTestCase):
+    resource = "todo_and_fixme"
+
+    def setUp(self):
+        super().setUp()
+
+        with open(".todo-ignore", "w") as file:  # todoon
+            file.write("github_*\n")
+
+    def test_todoon_workflow_files(self):
+        environment = {
+            "GITHUB_ENV": "github_env",
+            "GITHUB_OUTPUT": "github_output",
+            "GITHUB_STEP_SUMMARY": "github_summary",
+        }
+
+        with mock.patch.dict(os.environ, environment):
+            td.todoon(
+                git_files=False,
+                push_github_env_vars=True,
+                step_summary=True,
+                silent=True,
+                print_nothing=True,
+            )
+
+        for path in ["github_env", "github_output"]:
+            with open(path) as file:
+                lines = file.read().splitlines()
+
+            self.assertIn("TODOON_STATUS=finished", lines)
+            self.assertIn("TODOON_TODOS_FOUND=1", lines)
+            self.assertIn("TODOON_FIXMES_FOUND=1", lines)
+
+        with open("github_summary") as file:
+            summary = file.read()
+
+        self.assertIn(
+            "| `main.py` | 1 | todo | TODO - # TODO first |", summary  # todoon
+        )
+        self.assertIn(
+            "| `main.py` | 3 | fixme | FIXME - # FIXME second |", summary  # todoon
+        )
+
+    def test_todoon_github_env_unset(self):
+        with mock.patch.dict(os.environ):
+            for name in ["GITHUB_ENV", "GITHUB_OUTPUT", "GITHUB_STEP_SUMMARY"]:
+                os.environ.pop(name, None)
+
+            td.todoon(
+                git_files=False,
+                push_github_env_vars=True,
+                step_summary=True,
+                silent=True,
+                print_nothing=True,
+            )
+
+            self.assertEqual(os.environ["TODOON_STATUS"], "finished")
+
+        self.assertEqual(
+            sorted(os.listdir(self.directory)), [".todo-ignore", "main.py"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,8 @@
 import os
+import shutil
+import tempfile
 import unittest
+from unittest import mock
 
 import todo_or_not.todo_check as td
 
@@ -224,3 +227,102 @@ class TestTodoignoreUtil(unittest.TestCase):
             _new.write(old_todoignore)
 
         os.chdir(old_dir)
+
+    def test_todoignore_util_compacts(self):
+        # Set up
+        old_dir = os.getcwd()
+        safe_dir = os.path.realpath(tempfile.mkdtemp())
+        os.chdir(safe_dir)
+
+        for path in [
+            os.path.join("gen", "a.min.js"),
+            os.path.join("gen", "b.min.js"),
+            os.path.join("gen", "c.py"),
+            os.path.join("src", "x.py"),
+            os.path.join("src", "y.py"),
+            "main.py",
+        ]:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "w") as _file:
+                _file.write("# TODO\n")
+
+        with open(".todo-ignore", "w") as _new:
+            _new.write(
+                "# generated\n./gen/a.min.js\ngen/b.min.js\ngen//b.min.js\n\n"
+                "docs/\ndocs/readme.md\nsrc/*.py\nsrc/x.py\n"
+            )
+
+        td.todoon(git_files=False, silent=True, print_nothing=True)
+        scanned = os.environ["TODOON_FILES_SCANNED"]
+
+        # Run util
+        td.todo_ignore_util(compact=True)
+
+        # Check results
+        with open(".todo-ignore", "r") as _results:
+            results = [line.strip() for line in _results.readlines()]
+
+        self.assertEqual(
+            [line for line in results if len(line) > 0],
+            ["# generated", "gen/*.min.js", "docs", "src/*.py"],
+        )
+
+        # The same files are scanned
+        td.todoon(git_files=False, silent=True, print_nothing=True)
+        self.assertEqual(os.environ["TODOON_FILES_SCANNED"], scanned)
+
+        # Tear down
+        os.chdir(old_dir)
+        shutil.rmtree(safe_dir)
+
+    def test_todoignore_util_compacts_as_glob_matches(self):
+        # Set up
+        old_dir = os.getcwd()
+        safe_dir = os.path.realpath(tempfile.mkdtemp())
+        os.chdir(safe_dir)
+
+        for path in [
+            os.path.join("a", ".hidden.py"),
+            os.path.join("a", "b.py"),
+            os.path.join("b", ".c.py"),
+            os.path.join("b", "d.py"),
+            " main.py",
+            "main.py",
+        ]:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "w") as _file:
+                _file.write("# TODO\n")
+
+        # glob never matches hidden files with a wildcard, and only the line ending is stripped from an entry
+        todo_ignore = "a/.hidden.py\na/b.py\nb/*.py\nb/.c.py\n main.py\n"  # todoon
+        with open(".todo-ignore", "w") as _new:
+            _new.write(todo_ignore)
+
+        # Run util
+        td.todo_ignore_util(compact=True)
+
+        # Check results
+        with open(".todo-ignore", "r") as _results:
+            results = [line.rstrip("\n") for line in _results.readlines()]
+
+        self.assertEqual(
+            [line for line in results if len(line) > 0],
+            ["a/.hidden.py", "a/b.py", "b/*.py", "b/.c.py", " main.py"],
+        )
+
+        # A .todo-ignore is left as it is if compacting it would change what it ignores # todoon
+        with open(".todo-ignore", "w") as _new:
+            _new.write(todo_ignore)
+
+        with mock.patch.object(
+            td, "compact_todo_ignore", return_value=(["a/*.py"], {"merged": 2})
+        ):
+            with self.assertRaises(SystemExit):
+                td.todo_ignore_util(compact=True)
+
+        with open(".todo-ignore", "r") as _results:
+            self.assertEqual(_results.read(), todo_ignore)
+
+        # Tear down
+        os.chdir(old_dir)
+        shutil.rmtree(safe_dir)
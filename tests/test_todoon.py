@@ -1,5 +1,7 @@
 import os
+import tempfile
 import sys
+import typing
 import unittest
 
 import todo_or_not.todo_check as td
@@ -160,8 +162,32 @@ class TestTodoon(unittest.TestCase):
     def test_todoon_takes_individual_targets(self):
         td.todoon(verbose=True, silent=True, files=self.specific_files_list)
 
+        # The .todo-ignore inside of the directory is not scanned, like any other nested one # todoon
+        self.assertEqual(os.environ.get("TODOON_FILES_SCANNED"), "5")
+
+        td.todoon(
+            verbose=True, silent=True, files=self.specific_files_list, no_ignore=True
+        )
+
         self.assertEqual(os.environ.get("TODOON_FILES_SCANNED"), "6")
 
+    def test_todoon_takes_files_from(self):
+        with tempfile.TemporaryDirectory() as directory:
+            files_from = os.path.join(directory, "files")
+
+            with open(files_from, "wb") as file:
+                file.write("\0".join(self.specific_files_list[1:]).encode("utf-8"))
+
+            td.todoon(
+                self.specific_files_list[:1],
+                silent=True,
+                files_from=files_from,
+                null=True,
+                show_progress_bar=True,
+            )
+
+        self.assertEqual(os.environ.get("TODOON_FILES_SCANNED"), "5")
+
     def test_todoignore_uses_wildcards(self):
         # Set up
         self._environment_up("wildcard_test")
@@ -359,6 +385,54 @@ class TestTodoon(unittest.TestCase):
 
         self._environment_down()
 
+    def test_todoon_with_fast_engine(self):
+        self._environment_up("multilanguage")
+
+        with self.assertRaises(SystemExit) as _:
+            td.todoon(engine="fast")
+
+        assert os.environ["TODOON_TODOS_FOUND"] == "3"
+        assert os.environ["TODOON_FIXMES_FOUND"] == "1"
+
+        self._environment_down()
+
+    def test_todoon_with_block_comments(self):
+        self._environment_up("block_comments")
+
+        with self.assertRaises(SystemExit) as _:
+            td.todoon()
+
+        assert os.environ["TODOON_TODOS_FOUND"] == "1"
+        assert os.environ["TODOON_FIXMES_FOUND"] == "1"
+
+        with self.assertRaises(SystemExit) as _:
+            td.todoon(block_comments=True)
+
+        assert os.environ["TODOON_TODOS_FOUND"] == "3"
+        assert os.environ["TODOON_FIXMES_FOUND"] == "1"
+
+        self._environment_down()
+
+    def test_block_comments_help(self):
+        checked = []
+
+        # Both delimiters of each example are in the help of every command that takes --block-comments
+        for command in td.todoon_app.registered_commands:
+            hints = typing.get_type_hints(command.callback, include_extras=True)
+
+            if "block_comments" in hints:
+                option = hints["block_comments"].__metadata__[0]
+                self.assertIn("(e.g. /* */ or ''' ''')", option.help)
+                checked.append(command.callback.__name__)
+
+        self.assertIn("todoon", checked)
+
+    def test_todoon_with_unknown_engine(self):
+        with self.assertRaises(SystemExit) as context:
+            td.todoon(engine="unknown")
+
+        self.assertEqual(context.exception.code, 1)
+
 
 if __name__ == "__main__":
     unittest.main()
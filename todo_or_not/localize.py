@@ -22,6 +22,13 @@ LOCALIZE = {
         "summary_success": "SUCCESS: No new issues detected",
         "summary_fail_issues_no_silent": "FAIL: New issues detected",
         "info_duplicate_issue_avoided": "INFO: Duplicate issue avoided",
+        "info_watch_started": "INFO: Watching for changes, to stop use",
+        "info_daemon_started": "INFO: todoon is serving requests on",
+        "info_watch_polling": "INFO: inotify is not available, watching for changes by polling instead",
+        "info_cache_reused": "INFO: Files whose hits were reused from the cache",
+        "info_cache_server_started": "INFO: todoon is serving its cache on",
+        "info_todo_ignore_compacted": "INFO: Entries in the .todo-ignore before and after compacting",
+        "error_todo_ignore_not_compacted": "ERROR: Compacting the .todo-ignore would change what it ignores, it was left as it is",
         "error_cannot_specify_ni_xi": "ERROR: Cannot specify both --ni and --xi",
         "error_is_not_file": "ERROR: Specified path is not a file",
         "error_file_already_exists": "ERROR: Specified file already exists",
@@ -31,9 +38,21 @@ LOCALIZE = {
         "error_todo_ignore_not_found": "ERROR: .todo-ignore NOT FOUND! use -i to copy another .ignore OR --force to run without a .todo-ignore (NOT RECOMMENDED)",
         "error_todo_ignore_not_supported": f"ERROR: .todo-ignore uses unsupported encoding or doesn't exist! Supported encodings: {SUPPORTED_ENCODINGS_TODOIGNORE}",
         "error_exceeded_maximum_issues": "ERROR: Exceeded maximum number of issues for this run, exiting now",
+        "error_unknown_engine": "ERROR: Unknown parsing engine, expected one of",
+        "error_unknown_format": "ERROR: Unknown output format, expected one of",
+        "error_unknown_command": "ERROR: Unknown command",
+        "error_malformed_request": "ERROR: Request was not a JSON object",
+        "error_request_failed": "ERROR: Request could not be answered",
+        "error_daemon_already_running": "ERROR: A todoon daemon is already serving requests on",
+        "error_daemon_unreachable": "ERROR: Could not reach a todoon daemon, start one with `todoon serve --socket PATH`",
+        "error_incompatible_options": "ERROR: These options cannot be used together",
+        "error_git_failed": "ERROR: Could not read from git, is this a git repository?",
+        "error_files_from_failed": "ERROR: Could not read the list of files",
         "warning_force_overrides_ignore": "WARNING: --force will ignore the contents of the .todo-ignore generated when you specified (.todo-ignore will still be changed, just not used)",
         "warning_file_does_not_exist": "WARNING: File doesn't exist",
         "warning_is_a_directory": "WARNING: Expected a file, got a directory",
+        "warning_archive_not_supported": "WARNING: Could not read archive",
+        "warning_archive_member_skipped": "WARNING: File in archive is too large, encrypted or could not be read, skipping it",
         "warning_run_with_empty_todo_ignore": "WARNING: .todo-ignore was empty (if the file isn't empty, check its encoding), running anyway. To cancel use ",
         "warning_run_without_todo_ignore": "WARNING: Running without a .todo-ignore, to cancel use ",
         "warning_encoding_not_supported": f"WARNING: File uses unsupported encoding, we will skip it but consider adding to .todo-ignore (Supported encodings: {SUPPORTED_ENCODINGS_TODO_CHECK})",
@@ -41,6 +60,40 @@ LOCALIZE = {
         "warning_using_default_os": f"WARNING: Unsupported OS detected, using default tips. Detected OS:",
         "warning_duplicate_closed_issue": f"WARNING: Found an issue that has already been closed",
         "warning_nonissue_mode_closed_duplicate_used": "WARNING: Specified option '--closed-duplicates-fail/-c' will not have any effect when not in '--issue/-i' mode",
+        "warning_watch_print_mode_only": "WARNING: --watch only prints TODOs and FIXMEs, no GitHub issues will be generated",
+        "warning_unknown_setting": "WARNING: Ignoring unknown setting in [tool.todoon]",
+        "warning_pyproject_not_read": "WARNING: Could not read settings from pyproject.toml, using defaults",
+        "warning_cache_without_git": "WARNING: --cache needs git to identify unchanged files, scanning every file",
+        "warning_cache_not_written": "WARNING: Could not write the cache",
+        "warning_status_file_not_written": "WARNING: Could not write the status file",
+        "warning_metrics_not_written": "WARNING: Could not write the metrics",
+        "warning_workflow_file_not_written": "WARNING: Could not write to the workflow file",
+        "warning_cache_backend_failed": "WARNING: Could not reach the shared cache, continuing without it",
+        "suggest_would_be_scanned": "Would be scanned",
+        "suggest_save_the_most": "ignoring these would save the most",
+        "suggest_files": "file(s)",
+        "suggest_reason_vendored": "vendored",
+        "suggest_reason_generated": "generated",
+        "suggest_reason_minified": "minified",
+        "suggest_reason_binary": "binary",
+        "suggest_reason_encoding": "unsupported encoding",
+        "suggest_reason_long_lines": "long lines",
+        "step_summary_files_scanned": "Files scanned",
+        "step_summary_encoding_errors": "Encoding errors",
+        "step_summary_issues_created": "Issues created",
+        "step_summary_timing": "Timing",
+        "step_summary_count": "Count",
+        "step_summary_total_seconds": "Total (s)",
+        "step_summary_mean_milliseconds": "Mean (ms)",
+        "step_summary_scanning_files": "Scanning files",
+        "step_summary_listing_issues": "Listing issues",
+        "step_summary_creating_issues": "Creating issues",
+        "step_summary_whole_run": "Whole run",
+        "step_summary_file": "File",
+        "step_summary_line": "Line",
+        "step_summary_keywords": "Keywords",
+        "step_summary_title": "Title",
+        "step_summary_hits_not_listed": "more hits are not listed",
         "progress_bar_run_unit": "file",
         "progress_bar_run_desc": "scanning files",
     },
@@ -83,6 +136,59 @@ LOCALIZE = {
         "warning_using_default_os": f"경고: 지원되지 않는 운영체제가 감지되었습니다, 기본 단축키(Ctrl + C)를 사용합니다. 감지된 운영체제:",
         "warning_duplicate_closed_issue": f"경고: 이미 닫힌 깃허브 이슈를 찾았습니다",
         "warning_nonissue_mode_closed_duplicate_used": "경고: 설정한 옵션 '--closed-duplicates-fail/-c'은 '--issue/-i' 모드가 아니라면 아무런 영향을 끼치지 못합니다",
+        "error_unknown_engine": "오류: 알 수 없는 파싱 엔진입니다, 다음 중 하나여야 합니다",
+        "warning_unknown_setting": "경고: [tool.todoon]의 알 수 없는 설정을 무시합니다",
+        "warning_pyproject_not_read": "경고: pyproject.toml 에서 설정을 읽을 수 없어 기본값을 사용합니다",
+        "info_watch_started": "정보: 변경 사항을 감시하고 있습니다, 중지하려면 다음을 사용하세요 -",
+        "info_watch_polling": "정보: inotify 를 사용할 수 없어 대신 폴링으로 변경 사항을 감시합니다",
+        "warning_watch_print_mode_only": "경고: --watch 는 TODO와 FIXME를 출력만 하며, 깃허브 이슈는 생성되지 않습니다",
+        "info_daemon_started": "정보: todoon이 다음 경로에서 요청을 처리하고 있습니다",
+        "error_unknown_command": "오류: 알 수 없는 명령입니다",
+        "error_malformed_request": "오류: 요청이 JSON 객체가 아닙니다",
+        "error_request_failed": "오류: 요청에 응답할 수 없습니다",
+        "error_daemon_already_running": "오류: 이미 todoon 데몬이 다음 경로에서 요청을 처리하고 있습니다",
+        "error_daemon_unreachable": "오류: todoon 데몬에 연결할 수 없습니다, `todoon serve --socket PATH` 로 데몬을 시작하세요",
+        "error_incompatible_options": "오류: 다음 옵션들은 함께 사용할 수 없습니다",
+        "error_git_failed": "오류: git 에서 읽을 수 없습니다, git 저장소가 맞습니까?",
+        "info_cache_reused": "정보: 캐시에서 결과를 재사용한 파일",
+        "warning_cache_without_git": "경고: --cache 는 변경되지 않은 파일을 식별하기 위해 git 이 필요합니다, 모든 파일을 스캔합니다",
+        "warning_cache_not_written": "경고: 캐시를 쓸 수 없습니다",
+        "info_cache_server_started": "정보: todoon이 다음 주소에서 캐시를 제공하고 있습니다",
+        "warning_cache_backend_failed": "경고: 공유 캐시에 연결할 수 없어 캐시 없이 계속합니다",
+        "error_files_from_failed": "오류: 파일 목록을 읽을 수 없습니다",
+        "info_todo_ignore_compacted": "정보: 압축 전후 .todo-ignore 의 항목 수",
+        "error_todo_ignore_not_compacted": "오류: .todo-ignore 를 압축하면 무시되는 항목이 바뀌므로 그대로 두었습니다",
+        "warning_archive_not_supported": "경고: 압축 파일을 읽을 수 없습니다",
+        "warning_archive_member_skipped": "경고: 압축 파일 안의 파일이 너무 크거나, 암호화되었거나, 읽을 수 없어 건너뜁니다",
+        "error_unknown_format": "오류: 알 수 없는 출력 형식입니다, 다음 중 하나여야 합니다",
+        "warning_status_file_not_written": "경고: 상태 파일을 쓸 수 없습니다",
+        "warning_metrics_not_written": "경고: 메트릭을 쓸 수 없습니다",
+        "warning_workflow_file_not_written": "경고: 워크플로 파일에 쓸 수 없습니다",
+        "suggest_would_be_scanned": "스캔될 크기",
+        "suggest_save_the_most": "다음 항목을 무시하면 가장 많이 절약됩니다",
+        "suggest_files": "개 파일",
+        "suggest_reason_vendored": "외부 코드",
+        "suggest_reason_generated": "생성된 파일",
+        "suggest_reason_minified": "압축된 코드",
+        "suggest_reason_binary": "바이너리",
+        "suggest_reason_encoding": "지원되지 않는 인코딩",
+        "suggest_reason_long_lines": "긴 줄",
+        "step_summary_files_scanned": "스캔한 파일",
+        "step_summary_encoding_errors": "인코딩 오류",
+        "step_summary_issues_created": "생성된 이슈",
+        "step_summary_timing": "소요 시간",
+        "step_summary_count": "횟수",
+        "step_summary_total_seconds": "합계 (초)",
+        "step_summary_mean_milliseconds": "평균 (밀리초)",
+        "step_summary_scanning_files": "파일 스캔",
+        "step_summary_listing_issues": "이슈 목록 조회",
+        "step_summary_creating_issues": "이슈 생성",
+        "step_summary_whole_run": "전체 실행",
+        "step_summary_file": "파일",
+        "step_summary_line": "줄",
+        "step_summary_keywords": "키워드",
+        "step_summary_title": "제목",
+        "step_summary_hits_not_listed": "개의 결과는 나열되지 않았습니다",
         "progress_bar_run_unit": "파일",
         "progress_bar_run_desc": "파일들을 스캔하고 있음",
     },
@@ -125,6 +231,59 @@ LOCALIZE = {
         "warning_using_default_os": f"သတိပေးချက်- ပံ့ပိုးမထားသော OS ကို တွေ့ရှိခဲ့ပြီး မပုံသေဖြတ်လမ်းကို အသုံးပြုပါမည်။ တွေ့ရှိထားသော OS-",
         "warning_duplicate_closed_issue": f"သတိပေးချက်- ပိတ်ထားပြီးသော ပြဿနာတစ်ခု တွေ့ရှိပါသည်",
         "warning_nonissue_mode_closed_duplicate_used": "သတိပေးချက်- သတ်မှတ်ထားသော ရွေးချယ်မှု '--closed-duplicates-fail/-c' သည် '--issue/-i' မုဒ်တွင် မရှိ၍ အကျိုးသက်ရောက်မှုမှ မရှိပါ",
+        "error_unknown_engine": "အမှား- မသိသော ခွဲခြမ်းစိတ်ဖြာမှု engine ဖြစ်သည်၊ အောက်ပါတို့အနက် တစ်ခုဖြစ်ရမည်",
+        "warning_unknown_setting": "သတိပေးချက်- [tool.todoon] ရှိ မသိသော ဆက်တင်ကို လျစ်လျူရှုနေသည်",
+        "warning_pyproject_not_read": "သတိပေးချက်- pyproject.toml မှ ဆက်တင်များကို ဖတ်၍မရပါ၊ ပုံသေတန်ဖိုးများကို အသုံးပြုနေသည်",
+        "info_watch_started": "အချက်အလက်- ပြောင်းလဲမှုများကို စောင့်ကြည့်နေသည်၊ ရပ်တန့်ရန် -",
+        "info_watch_polling": "အချက်အလက်- inotify မရရှိနိုင်ပါ၊ polling ဖြင့် ပြောင်းလဲမှုများကို စောင့်ကြည့်နေသည်",
+        "warning_watch_print_mode_only": "သတိပေးချက်- --watch သည် TODO နှင့် FIXME များကိုသာ ပြသမည်ဖြစ်ပြီး GitHub ပြဿနာများ မထုတ်ပေးပါ",
+        "info_daemon_started": "အချက်အလက်- todoon သည် တောင်းဆိုမှုများကို ဤနေရာတွင် ဆောင်ရွက်ပေးနေသည်",
+        "error_unknown_command": "အမှား- မသိသော command",
+        "error_malformed_request": "အမှား- တောင်းဆိုမှုသည် JSON object မဟုတ်ပါ",
+        "error_request_failed": "အမှား- တောင်းဆိုမှုကို မဖြေဆိုနိုင်ပါ",
+        "error_daemon_already_running": "အမှား- todoon daemon တစ်ခုသည် ဤနေရာတွင် တောင်းဆိုမှုများကို ဆောင်ရွက်ပေးနေပြီးဖြစ်သည်",
+        "error_daemon_unreachable": "အမှား- todoon daemon ကို ဆက်သွယ်၍မရပါ၊ `todoon serve --socket PATH` ဖြင့် စတင်ပါ",
+        "error_incompatible_options": "အမှား- ဤရွေးချယ်မှုများကို အတူတကွ အသုံးပြု၍မရပါ",
+        "error_git_failed": "အမှား- git မှ ဖတ်၍မရပါ၊ ဤသည်မှာ git repository ဖြစ်ပါသလား?",
+        "info_cache_reused": "အချက်အလက်- cache မှ ရလဒ်များကို ပြန်လည်အသုံးပြုခဲ့သော ဖိုင်များ",
+        "warning_cache_without_git": "သတိပေးချက်- --cache သည် မပြောင်းလဲသော ဖိုင်များကို ခွဲခြားရန် git လိုအပ်သည်၊ ဖိုင်အားလုံးကို စကင်န်ဖတ်နေသည်",
+        "warning_cache_not_written": "သတိပေးချက်- cache ကို ရေး၍မရပါ",
+        "info_cache_server_started": "အချက်အလက်- todoon သည် ၎င်း၏ cache ကို ဤနေရာတွင် ဝန်ဆောင်မှုပေးနေသည်",
+        "warning_cache_backend_failed": "သတိပေးချက်- မျှဝေထားသော cache ကို ဆက်သွယ်၍မရပါ၊ ၎င်းမပါဘဲ ဆက်လက်လုပ်ဆောင်နေသည်",
+        "error_files_from_failed": "အမှား- ဖိုင်စာရင်းကို ဖတ်၍မရပါ",
+        "info_todo_ignore_compacted": "အချက်အလက်- ချုံ့မီနှင့် ချုံ့ပြီးနောက် .todo-ignore ရှိ ထည့်သွင်းချက်များ",
+        "error_todo_ignore_not_compacted": "အမှား- .todo-ignore ကို ချုံ့ပါက လျစ်လျူရှုထားသည့်အရာများ ပြောင်းလဲသွားမည်ဖြစ်၍ ယခင်အတိုင်း ထားခဲ့သည်",
+        "warning_archive_not_supported": "သတိပေးချက်- archive ကို ဖတ်၍မရပါ",
+        "warning_archive_member_skipped": "သတိပေးချက်- archive အတွင်းရှိ ဖိုင်သည် ကြီးလွန်းခြင်း၊ စာဝှက်ထားခြင်း သို့မဟုတ် ဖတ်၍မရခြင်းကြောင့် ကျော်သွားသည်",
+        "error_unknown_format": "အမှား- မသိသော output ပုံစံ၊ အောက်ပါတို့အနက် တစ်ခုဖြစ်ရမည်",
+        "warning_status_file_not_written": "သတိပေးချက်- status ဖိုင်ကို ရေး၍မရပါ",
+        "warning_metrics_not_written": "သတိပေးချက်- metrics ကို ရေး၍မရပါ",
+        "warning_workflow_file_not_written": "သတိပေးချက်- workflow ဖိုင်သို့ ရေး၍မရပါ",
+        "suggest_would_be_scanned": "စကင်န်ဖတ်မည့် အရွယ်အစား",
+        "suggest_save_the_most": "ဤအရာများကို လျစ်လျူရှုပါက အများဆုံး သက်သာမည်",
+        "suggest_files": "ဖိုင်",
+        "suggest_reason_vendored": "ပြင်ပ ကုဒ်",
+        "suggest_reason_generated": "ထုတ်လုပ်ထားသော ဖိုင်",
+        "suggest_reason_minified": "ချုံ့ထားသော ကုဒ်",
+        "suggest_reason_binary": "binary",
+        "suggest_reason_encoding": "ပံ့ပိုးမထားသော ကုဒ်နံပါတ်",
+        "suggest_reason_long_lines": "ရှည်လျားသော စာကြောင်းများ",
+        "step_summary_files_scanned": "စကင်န်ဖတ်ခဲ့သော ဖိုင်များ",
+        "step_summary_encoding_errors": "ကုဒ်နံပါတ် အမှားများ",
+        "step_summary_issues_created": "ဖန်တီးခဲ့သော ပြဿနာများ",
+        "step_summary_timing": "ကြာချိန်",
+        "step_summary_count": "အကြိမ်ရေ",
+        "step_summary_total_seconds": "စုစုပေါင်း (စက္ကန့်)",
+        "step_summary_mean_milliseconds": "ပျမ်းမျှ (မီလီစက္ကန့်)",
+        "step_summary_scanning_files": "ဖိုင်များကို စကင်န်ဖတ်ခြင်း",
+        "step_summary_listing_issues": "ပြဿနာများကို စာရင်းပြုစုခြင်း",
+        "step_summary_creating_issues": "ပြဿနာများကို ဖန်တီးခြင်း",
+        "step_summary_whole_run": "လုပ်ဆောင်မှု တစ်ခုလုံး",
+        "step_summary_file": "ဖိုင်",
+        "step_summary_line": "စာကြောင်း",
+        "step_summary_keywords": "သော့ချက်စာလုံးများ",
+        "step_summary_title": "ခေါင်းစဉ်",
+        "step_summary_hits_not_listed": "ခုကို စာရင်းတွင် မပြထားပါ",
         "progress_bar_run_unit": "ဖိုင်",
         "progress_bar_run_desc": "ဖိုင်များကိုစကင်န် ဖတ်နေပါသည်",
     },
@@ -1,10 +1,18 @@
 import os
+import sys
+import time
 
-from todo_or_not.utility import loc
+from todo_or_not.todo_metrics import Histogram
+from todo_or_not.todo_workflow import append_to_workflow_file, format_workflow_variables
+from todo_or_not.utility import loc, print_wrap, LOG_LEVEL_NORMAL
+from todo_or_not.todo_settings import Settings
 
 
 class TodoRun:
-    def __init__(self, settings: dict):
+    def __init__(self, settings: dict, resolved_settings: Settings):
+        # Settings resolved once for the whole run, e.g. the region to report in
+        self.resolved_settings = resolved_settings
+
         self.fail_closed_duplicates = settings["fail_closed_duplicates"]
         self.silent = settings["silent"]
         self.print_mode = settings["print_mode"]
@@ -30,6 +38,18 @@ class TodoRun:
         # Tracks the number of issues found that may already be "Closed" on GitHub
         self.number_of_closed_issues = 0
 
+        # Tracks how long each file took to scan and each call to the GitHub API took, in seconds
+        self.file_scan_latency = Histogram()
+        self.api_latency = {"list_issues": Histogram(), "create_issue": Histogram()}
+
+        self._start = time.monotonic()
+
+    def get_duration(self) -> float:
+        """
+        :return: Seconds since the run started
+        """
+        return time.monotonic() - self._start
+
     @staticmethod
     def initialize_environment_variables():
         os.environ["TODOON_STATUS"] = "starting"
@@ -41,46 +61,65 @@ class TodoRun:
         os.environ["TODOON_ISSUES_GENERATED"] = "0"
         os.environ["TODOON_DUPLICATE_ISSUES_AVOIDED"] = "0"
 
-    def report_environment_variables(self):
-        os.environ["TODOON_STATUS"] = "finished"
-        os.environ["TODOON_PROGRESS"] = "100.0"
-        os.environ["TODOON_FILES_SCANNED"] = str(self.number_of_files_scanned)
-        os.environ["TODOON_TODOS_FOUND"] = str(self.number_of_todo)
-        os.environ["TODOON_FIXMES_FOUND"] = str(self.number_of_fixme)
-        os.environ["TODOON_ENCODING_ERRORS"] = str(self.number_of_encoding_failures)
-        os.environ["TODOON_ISSUES_GENERATED"] = str(self.number_of_issues)
-        os.environ["TODOON_DUPLICATE_ISSUES_AVOIDED"] = str(
-            self.number_of_duplicate_issues_avoided
-        )
-        os.environ["TODOON_DUPLICATE_CLOSED_ISSUES"] = str(self.number_of_closed_issues)
-
-        if self.push_github_env_vars:
-            os.system(f'echo TODOON_STATUS={"finished"} >> $GITHUB_ENV')
-            os.system(f'echo TODOON_PROGRESS={"100.0"} >> $GITHUB_ENV')
-            os.system(
-                f"echo TODOON_FILES_SCANNED={str(self.number_of_files_scanned)} >> $GITHUB_ENV"
-            )
-            os.system(
-                f"echo TODOON_TODOS_FOUND={str(self.number_of_todo)} >> $GITHUB_ENV"
-            )
-            os.system(
-                f"echo TODOON_FIXMES_FOUND={str(self.number_of_fixme)} >> $GITHUB_ENV"
-            )
-            os.system(
-                f"echo TODOON_ENCODING_ERRORS={str(self.number_of_encoding_failures)} >> $GITHUB_ENV"
-            )
-            os.system(
-                f"echo TODOON_ISSUES_GENERATED={str(self.number_of_issues)} >> $GITHUB_ENV"
-            )
-            os.system(
-                f"echo TODOON_DUPLICATE_ISSUES_AVOIDED={str(self.number_of_duplicate_issues_avoided)} >> $GITHUB_ENV"
-            )
-            os.system(
-                f"echo TODOON_DUPLICATE_CLOSED_ISSUES={str(self.number_of_closed_issues)} >> $GITHUB_ENV"
-            )
+    def get_environment_variables(self) -> dict:
+        """
+        :return: The TODOON_* variables describing the finished run
+        """
+        return {
+            "TODOON_STATUS": "finished",
+            "TODOON_PROGRESS": "100.0",
+            "TODOON_FILES_SCANNED": str(self.number_of_files_scanned),
+            "TODOON_TODOS_FOUND": str(self.number_of_todo),
+            "TODOON_FIXMES_FOUND": str(self.number_of_fixme),
+            "TODOON_ENCODING_ERRORS": str(self.number_of_encoding_failures),
+            "TODOON_ISSUES_GENERATED": str(self.number_of_issues),
+            "TODOON_DUPLICATE_ISSUES_AVOIDED": str(
+                self.number_of_duplicate_issues_avoided
+            ),
+            "TODOON_DUPLICATE_CLOSED_ISSUES": str(self.number_of_closed_issues),
+        }
+
+    def report_environment_variables(self, log_level=LOG_LEVEL_NORMAL):
+        """
+        Sets the TODOON_* variables, and if pushing them to the workflow appends them to $GITHUB_ENV (for later
+        steps) and $GITHUB_OUTPUT (as outputs of this step)
+        :param log_level: The importance of any feedback prints (e.g. 0=NONE, 3=VERBOSE)
+        """
+        variables = self.get_environment_variables()
+        os.environ.update(variables)
+
+        if not self.push_github_env_vars:
+            return
+
+        region = self.resolved_settings.region
+        entries = format_workflow_variables(variables)
+
+        for file_variable, required in [("GITHUB_ENV", True), ("GITHUB_OUTPUT", False)]:
+            path = os.environ.get(file_variable)
+
+            # Only $GITHUB_ENV was ever asked for, older runners may not set $GITHUB_OUTPUT
+            if not path:
+                if required:
+                    print_wrap(
+                        log_level=log_level,
+                        msg=f"{loc('error_no_env', region)}: {file_variable}",
+                        file=sys.stderr,
+                    )
+                continue
+
+            try:
+                append_to_workflow_file(path, entries)
+            except OSError as e:
+                print_wrap(
+                    log_level=log_level,
+                    msg=f"{loc('warning_workflow_file_not_written', region)}: {file_variable}: {e}",
+                    file=sys.stderr,
+                )
 
     def generate_summary_message(self):
-        summary = f"\n##########################\n# {loc('summary_title')}\n"
+        region = self.resolved_settings.region
+
+        summary = f"\n##########################\n# {loc('summary_title', region)}\n"
         # Mode the tool was run in
         if self.print_mode:
             summary += "# (PRINT MODE)\n"
@@ -94,20 +133,20 @@ class TodoRun:
 
         # Number of encoding failures
         if self.number_of_encoding_failures > 1:
-            summary += f"# {self.number_of_encoding_failures} {loc('summary_encoding_unsupported_plural')}\n"
+            summary += f"# {self.number_of_encoding_failures} {loc('summary_encoding_unsupported_plural', region)}\n"
         elif self.number_of_encoding_failures == 1:
-            summary += f"# {self.number_of_encoding_failures} {loc('summary_encoding_unsupported_singular')}\n"
+            summary += f"# {self.number_of_encoding_failures} {loc('summary_encoding_unsupported_singular', region)}\n"
 
         # Total number of files scanned
         if self.number_of_files_scanned > 1:
             summary += (
                 f"# {self.number_of_files_scanned} "
-                f"{loc('summary_files_scanned_plural')}\n"
+                f"{loc('summary_files_scanned_plural', region)}\n"
             )
         elif self.number_of_files_scanned == 1:
             summary += (
                 f"# {self.number_of_files_scanned} "
-                f"{loc('summary_files_scanned_singular')}\n"
+                f"{loc('summary_files_scanned_singular', region)}\n"
             )
 
             # Number of issues (if any) that were generated
@@ -116,38 +155,38 @@ class TodoRun:
             if self.number_of_issues > 1:
                 summary += (
                     f"# {self.number_of_issues} "
-                    f"{loc('summary_issues_generated_plural')}\n"
+                    f"{loc('summary_issues_generated_plural', region)}\n"
                 )
             elif self.number_of_issues == 1:
                 summary += (
                     f"# {self.number_of_issues} "
-                    f"{loc('summary_issues_generated_singular')}\n"
+                    f"{loc('summary_issues_generated_singular', region)}\n"
                 )
             else:
-                summary += f"# " f"{loc('summary_issues_generated_none')}\n"
+                summary += f"# " f"{loc('summary_issues_generated_none', region)}\n"
 
             # Total number of duplicate issues avoided
             if self.number_of_duplicate_issues_avoided > 1:
                 summary += (
                     f"# {self.number_of_duplicate_issues_avoided} "
-                    f"{loc('summary_duplicate_issues_avoided_plural')}\n"
+                    f"{loc('summary_duplicate_issues_avoided_plural', region)}\n"
                 )
             elif self.number_of_duplicate_issues_avoided == 1:
                 summary += (
                     f"# {self.number_of_duplicate_issues_avoided} "
-                    f"{loc('summary_duplicate_issues_avoided_singular')}\n"
+                    f"{loc('summary_duplicate_issues_avoided_singular', region)}\n"
                 )
 
             # Total number of duplicate closed issues
             if self.number_of_closed_issues > 1:
                 summary += (
                     f"# {self.number_of_closed_issues} "
-                    f"{loc('summary_duplicate_closed_issues_plural')}\n"
+                    f"{loc('summary_duplicate_closed_issues_plural', region)}\n"
                 )
             elif self.number_of_closed_issues == 1:
                 summary += (
                     f"# {self.number_of_closed_issues} "
-                    f"{loc('summary_duplicate_closed_issues_singular')}\n"
+                    f"{loc('summary_duplicate_closed_issues_singular', region)}\n"
                 )
 
         summary += "##########################\n\n"
@@ -155,15 +194,15 @@ class TodoRun:
         # Overall results of the run
         if self.number_of_hits > 0:
             if self.silent:
-                summary += f"  * {loc('summary_found_issues_silent')}\n"
+                summary += f"  * {loc('summary_found_issues_silent', region)}\n"
             else:
-                summary += f"  * {loc('summary_fail_issues_no_silent')}\n"
+                summary += f"  * {loc('summary_fail_issues_no_silent', region)}\n"
 
         if self.number_of_closed_issues > 0 and self.fail_closed_duplicates:
-            summary += f"  * {loc('summary_fail_duplicate_closed_issues')}\n"
+            summary += f"  * {loc('summary_fail_duplicate_closed_issues', region)}\n"
 
         # Total success
         if self.number_of_hits == 0:
-            summary += f"  * {loc('summary_success')}\n"
+            summary += f"  * {loc('summary_success', region)}\n"
 
         return summary
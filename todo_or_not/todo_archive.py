@@ -0,0 +1,111 @@
+import os
+import tarfile
+import zipfile
+import zlib
+
+# Separates the path of an archive from the path of a member inside of it, e.g. "sdk.tar.gz!/src/main.c"
+MEMBER_SEPARATOR = "!/"
+
+# tarfile detects the compression itself
+ARCHIVE_SUFFIXES = {
+    ".zip": "zip",
+    ".tar": "tar",
+    ".tar.gz": "tar",
+    ".tgz": "tar",
+    ".tar.xz": "tar",
+    ".txz": "tar",
+}
+
+# However many members there are, no more than this is read from one archive
+MAX_ARCHIVE_SIZE = 64 * 1024 * 1024
+
+# Raised while reading one member of a zip archive that can not be read, the rest of the archive still can
+_ZIP_MEMBER_ERRORS = (
+    RuntimeError,
+    NotImplementedError,
+    EOFError,
+    zlib.error,
+    zipfile.BadZipFile,
+)
+
+
+def get_archive_format(path: str) -> str or None:
+    """
+    :param path: Path-like of a file
+    :return: "zip" or "tar" if its name is that of an archive that can be scanned, None otherwise
+    """
+    name = os.path.basename(path).lower()
+
+    for suffix, archive_format in ARCHIVE_SUFFIXES.items():
+        if name.endswith(suffix):
+            return archive_format
+
+    return None
+
+
+def _member_name(name: str) -> str:
+    # Names in tar archives may start with "./" or "/", both are relative to the archive
+    while name.startswith("./") or name.startswith("/"):
+        name = name[2:] if name.startswith("./") else name[1:]
+
+    return name
+
+
+def read_archive_members(
+    archive, archive_format: str, max_member_size: int, max_size: int = MAX_ARCHIVE_SIZE
+):
+    """
+    Reads the regular files of an archive one at a time into memory, nothing is extracted to disk
+    :param archive: Path-like of the archive, or a binary file object of its contents (e.g. a blob read from git)
+    :param archive_format: "zip" or "tar", see get_archive_format
+    :param max_member_size: Members larger than this many bytes are not read
+    :param max_size: Once this many bytes have been read, the remaining members are not read either
+    :return: A generator of the name of each member and its contents, None if it was too large, encrypted or could
+     not be read
+    :raises OSError, EOFError, RuntimeError, zlib.error, lzma.LZMAError, zipfile.BadZipFile, tarfile.TarError: If
+     the archive can not be read, e.g. a compressed tar archive whose stream is broken
+    """
+    remaining = max_size
+
+    if archive_format == "zip":
+        with zipfile.ZipFile(archive) as _zip:
+            for info in _zip.infolist():
+                if info.is_dir():
+                    continue
+
+                # The size in the header may be wrong, so no more than the limit is ever read. Encrypted members
+                # can not be read without a password
+                content = None
+                if info.file_size <= min(max_member_size, remaining) and not (
+                    info.flag_bits & 0x1
+                ):
+                    try:
+                        with _zip.open(info) as member:
+                            content = member.read(max_member_size + 1)
+                    except _ZIP_MEMBER_ERRORS:
+                        content = None
+
+                if content is not None and len(content) > max_member_size:
+                    content = None
+
+                remaining -= len(content) if content is not None else 0
+                yield _member_name(info.filename), content
+    else:
+        _open = (
+            tarfile.open(archive, mode="r:*")
+            if isinstance(archive, (str, os.PathLike))
+            else tarfile.open(fileobj=archive, mode="r:*")
+        )
+
+        # Members are read in the order they are stored, so a compressed archive is only decompressed once
+        with _open as _tar:
+            for info in _tar:
+                if not info.isfile():
+                    continue
+
+                content = None
+                if info.size <= min(max_member_size, remaining):
+                    content = _tar.extractfile(info).read()
+
+                remaining -= len(content) if content is not None else 0
+                yield _member_name(info.name), content
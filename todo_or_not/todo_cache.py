@@ -0,0 +1,429 @@
+import concurrent.futures
+import gzip
+import json
+import os
+import re
+import urllib.parse
+import urllib.request
+
+import todo_or_not
+import todo_or_not.utility as util
+from todo_or_not.todo_grammar import resolve_language
+from todo_or_not.todo_hit import Hit
+from todo_or_not.todo_settings import Settings
+
+# Bumped whenever the layout of the cache file changes
+FORMAT_VERSION = 1
+
+
+def get_fingerprint(settings: Settings, ignore_flag: str) -> str:
+    """
+    :param settings: Settings the hits are found with
+    :param ignore_flag: Lines containing this flag are not scanned
+    :return: Identifies everything other than the contents of a file that changes what is found in it, hits cached
+     under another fingerprint can not be reused
+    """
+    return json.dumps(
+        [
+            FORMAT_VERSION,
+            todo_or_not.__version__,
+            settings.engine,
+            settings.block_comments,
+            settings.pertinent_line_limit,
+            ignore_flag,
+        ]
+    )
+
+
+def _blob_key(oid: str, filename: str) -> str:
+    # The same contents are parsed differently in files of different languages
+    return f"{oid} {resolve_language(filename)}"
+
+
+_DIGEST_PATTERN = re.compile(r"[0-9a-f]{40}")
+_KEY_PATTERN = re.compile(
+    r"([0-9a-f]{40}|[0-9a-f]{64}) ([A-Za-z0-9_+#-][A-Za-z0-9_+#.-]*)"
+)
+
+
+def _is_list_of_strings(value) -> bool:
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+def _is_optional_string(value) -> bool:
+    return value is None or isinstance(value, str)
+
+
+def is_valid_hit(hit) -> bool:
+    """
+    :return: Whether something read from a cache looks like a hit without its file, see Hit.to_dict()
+    """
+    if not isinstance(hit, dict):
+        return False
+
+    pertinent_lines = hit.get("pertinent_lines")
+    trigger_line_index = hit.get("trigger_line_index")
+
+    return (
+        _is_list_of_strings(hit.get("found_keys"))
+        and isinstance(hit.get("source_line"), int)
+        and not isinstance(hit.get("source_line"), bool)
+        and _is_list_of_strings(pertinent_lines)
+        and isinstance(trigger_line_index, int)
+        and not isinstance(trigger_line_index, bool)
+        and 0 <= trigger_line_index < len(pertinent_lines)
+        and _is_optional_string(hit.get("source_file"))
+        and _is_optional_string(hit.get("structured_title"))
+        and _is_optional_string(hit.get("structured_body"))
+        and (
+            hit.get("structured_labels") is None
+            or _is_list_of_strings(hit.get("structured_labels"))
+        )
+    )
+
+
+def is_valid_entry(entry) -> bool:
+    """
+    :return: Whether something read from a cache or a backend is a cache entry, [encoding, [hit, ...]], that can be
+     made back into hits
+    """
+    return (
+        isinstance(entry, list)
+        and len(entry) == 2
+        and _is_optional_string(entry[0])
+        and isinstance(entry[1], list)
+        and all(is_valid_hit(hit) for hit in entry[1])
+    )
+
+
+class FileCacheBackend:
+    """
+    Cache entries shared through a directory, one small file per blob so any number of runners can read and write
+    it at once (e.g. on a shared volume)
+    """
+
+    def __init__(self, directory: str):
+        """
+        :param directory: Path-like of the directory, created when the first entry is written
+        """
+        self.directory = directory
+
+    def get_path(self, digest: str, key: str) -> str:
+        """
+        :param digest: sha1 of the fingerprint the entry was found with
+        :param key: "<oid> <language>"
+        :return: Path of the file the entry is kept in
+        :raises ValueError: If the digest or key could not have come from a ScanCache, e.g. "../" in them
+        """
+        match = _KEY_PATTERN.fullmatch(key)
+
+        if _DIGEST_PATTERN.fullmatch(digest) is None or match is None:
+            raise ValueError(f"Not a cache key: {digest}/{key}")
+
+        oid, language = match.groups()
+
+        return os.path.join(
+            self.directory, digest, oid[:2], f"{oid[2:]}.{language}.json"
+        )
+
+    def get_many(self, digest: str, keys: list[str]) -> dict:
+        """
+        :param digest: sha1 of the fingerprint the entries were found with
+        :param keys: "<oid> <language>" of each entry to look up
+        :return: The entries that were found, keyed by their key
+        """
+        entries = {}
+
+        for key in keys:
+            try:
+                with open(self.get_path(digest, key), "rb") as file:
+                    entry = json.loads(file.read())
+            except (OSError, ValueError):
+                continue
+
+            if is_valid_entry(entry):
+                entries[key] = entry
+
+        return entries
+
+    def put_many(self, digest: str, entries: dict):
+        """
+        :param digest: sha1 of the fingerprint the entries were found with
+        :param entries: The entries to share, keyed by "<oid> <language>"
+        """
+        for key, entry in entries.items():
+            path = self.get_path(digest, key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            util.write_atomically(
+                path, json.dumps(entry, separators=(",", ":")).encode("utf-8")
+            )
+
+
+class HttpCacheBackend:
+    """
+    Cache entries shared through an HTTP key/value store, see todo_cache_server for the protocol. Lookups are sent in
+    batches and both lookups and uploads run a few requests at a time
+    """
+
+    def __init__(
+        self,
+        url: str,
+        batch_size: int = 256,
+        concurrency: int = 8,
+        timeout: float = 10.0,
+    ):
+        """
+        :param url: Base URL of the store, e.g. "http://cache.internal:8765"
+        :param batch_size: Most keys looked up by a single request
+        :param concurrency: Most requests in flight at once
+        :param timeout: Seconds to wait on each request
+        """
+        self.url = url.rstrip("/")
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.timeout = timeout
+
+    def _request(self, method: str, path: str, body: bytes = None) -> bytes:
+        request = urllib.request.Request(
+            f"{self.url}/{path}",
+            data=body,
+            method=method,
+            headers={"Content-Type": "application/json"},
+        )
+
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return response.read()
+
+    def _get_batch(self, digest: str, keys: list[str]) -> dict:
+        response = json.loads(
+            self._request(
+                "POST", f"{digest}/batch", json.dumps({"keys": keys}).encode("utf-8")
+            )
+        )
+
+        entries = response.get("entries") if isinstance(response, dict) else None
+
+        if not isinstance(entries, dict):
+            raise ValueError("Not a batch of cache entries")
+
+        wanted = set(keys)
+
+        return {
+            key: entry
+            for key, entry in entries.items()
+            if key in wanted and is_valid_entry(entry)
+        }
+
+    def _put(self, digest: str, key: str, entry: list):
+        oid, language = key.split(" ", 1)
+
+        self._request(
+            "PUT",
+            f"{digest}/{oid}/{urllib.parse.quote(language, safe='')}",
+            json.dumps(entry, separators=(",", ":")).encode("utf-8"),
+        )
+
+    def get_many(self, digest: str, keys: list[str]) -> dict:
+        """
+        See FileCacheBackend.get_many
+        :raises OSError: If the store could not be reached (urllib.error.URLError)
+        :raises http.client.HTTPException: If the store did not answer with HTTP (e.g. BadStatusLine)
+        :raises ValueError: If the store did not answer with JSON
+        """
+        batches = [
+            keys[i : i + self.batch_size] for i in range(0, len(keys), self.batch_size)
+        ]
+        entries = {}
+
+        with concurrent.futures.ThreadPoolExecutor(self.concurrency) as executor:
+            for found in executor.map(
+                lambda batch: self._get_batch(digest, batch), batches
+            ):
+                entries.update(found)
+
+        return entries
+
+    def put_many(self, digest: str, entries: dict):
+        """
+        See FileCacheBackend.put_many
+        :raises OSError: If the store could not be reached (urllib.error.URLError)
+        :raises http.client.HTTPException: If the store did not answer with HTTP (e.g. BadStatusLine)
+        """
+        with concurrent.futures.ThreadPoolExecutor(self.concurrency) as executor:
+            # list() so the first failure is raised here
+            list(
+                executor.map(
+                    lambda item: self._put(digest, item[0], item[1]), entries.items()
+                )
+            )
+
+
+def create_backend(location: str):
+    """
+    :param location: An http(s):// URL or the path of a directory
+    :return: An HttpCacheBackend for URLs, otherwise a FileCacheBackend
+    """
+    if location.startswith(("http://", "https://")):
+        return HttpCacheBackend(location)
+
+    return FileCacheBackend(location)
+
+
+class ScanCache:
+    """
+    The hits found in each blob, keyed by the object ID git gives its contents, so a file that has not changed since
+    any earlier run (on any machine) does not have to be read again
+    """
+
+    def __init__(self, fingerprint: str):
+        """
+        :param fingerprint: See get_fingerprint
+        """
+        self.fingerprint = fingerprint
+
+        # "<oid> <language>" to the encoding the blob was read with and its hits, without their file
+        self.entries = {}
+
+        self.number_reused = 0
+        self._used = set()
+        self._added = set()
+
+    @property
+    def digest(self) -> str:
+        """
+        :return: sha1 of the fingerprint, names it in backends
+        """
+        return util.sha1_hash(self.fingerprint)
+
+    @classmethod
+    def load(cls, path: str, fingerprint: str):
+        """
+        :param path: Path-like pointing to a cache file written by save()
+        :param fingerprint: See get_fingerprint
+        :return: The cache, empty if the file does not exist, can not be read or was written with another fingerprint
+        """
+        cache = cls(fingerprint)
+
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, EOFError, ValueError):
+            return cache
+
+        if (
+            isinstance(data, dict)
+            and data.get("format") == FORMAT_VERSION
+            and data.get("fingerprint") == fingerprint
+            and isinstance(data.get("blobs"), dict)
+        ):
+            # An entry that was edited or damaged is a miss, its blob is scanned again
+            cache.entries = {
+                key: entry
+                for key, entry in data["blobs"].items()
+                if is_valid_entry(entry)
+            }
+
+        return cache
+
+    def get(self, oid: str, filename: str) -> tuple[list[Hit], str or None] or None:
+        """
+        :param oid: Object ID of the contents of the file
+        :param filename: The file, its hits are reported in it
+        :return: The hits and encoding found when the blob was last scanned, None if it never was
+        """
+        key = _blob_key(oid, filename)
+        entry = self.entries.get(key)
+
+        if entry is None:
+            return None
+
+        source_file = os.path.relpath(filename, os.getcwd())
+
+        try:
+            hits = [
+                Hit.from_dict({**hit, "source_file": source_file}) for hit in entry[1]
+            ]
+        except (KeyError, TypeError, ValueError):
+            # Treated as a miss, the entry is replaced once the blob is scanned again
+            del self.entries[key]
+            return None
+
+        self.number_reused += 1
+        self._used.add(key)
+
+        return hits, entry[0]
+
+    def put(self, oid: str, filename: str, hits: list[Hit], encoding: str or None):
+        """
+        :param oid: Object ID of the contents of the file
+        :param filename: The file the hits were found in
+        :param hits: The hits found in it
+        :param encoding: The encoding it was read with, None if it could not be read
+        """
+        key = _blob_key(oid, filename)
+
+        _hits = []
+        for hit in hits:
+            _hit = hit.to_dict()
+            del _hit["source_file"]
+            _hits.append(_hit)
+
+        self.entries[key] = [encoding, _hits]
+        self._used.add(key)
+        self._added.add(key)
+
+    def pull(self, backend, blob_ids: dict[str, str]):
+        """
+        Looks up the blobs missing from this cache in a backend, in one go before scanning
+        :param backend: A FileCacheBackend or HttpCacheBackend
+        :param blob_ids: Object IDs of the files about to be scanned, keyed by their path
+        """
+        keys = {_blob_key(oid, path) for path, oid in blob_ids.items()}
+        missing = sorted(keys - set(self.entries.keys()))
+
+        if len(missing) > 0:
+            # Whatever a backend answers with, only entries for the keys asked for that can be used are kept
+            wanted = set(missing)
+            self.entries.update(
+                {
+                    key: entry
+                    for key, entry in backend.get_many(self.digest, missing).items()
+                    if key in wanted and is_valid_entry(entry)
+                }
+            )
+
+    def push(self, backend):
+        """
+        Shares the blobs scanned since this cache was loaded with a backend
+        :param backend: A FileCacheBackend or HttpCacheBackend
+        """
+        if len(self._added) > 0:
+            backend.put_many(
+                self.digest, {key: self.entries[key] for key in sorted(self._added)}
+            )
+
+    def save(self, path: str, prune: bool = True):
+        """
+        Writes the cache to a temporary file next to the path, then moves it into place
+        :param path: Path-like to write the cache to
+        :param prune: Whether to leave out the blobs that were not used since the cache was loaded
+        """
+        blobs = (
+            {key: entry for key, entry in self.entries.items() if key in self._used}
+            if prune
+            else self.entries
+        )
+        data = {
+            "format": FORMAT_VERSION,
+            "fingerprint": self.fingerprint,
+            "blobs": blobs,
+        }
+
+        # No timestamp in the header, so the same hits always make the same file
+        util.write_atomically(
+            path,
+            gzip.compress(
+                json.dumps(data, separators=(",", ":")).encode("utf-8"), mtime=0
+            ),
+        )
@@ -0,0 +1,170 @@
+import json
+import os
+import sys
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import todo_or_not.utility as util
+from todo_or_not.todo_cache import FileCacheBackend, is_valid_entry
+from todo_or_not.todo_settings import Settings
+from todo_or_not.utility import loc
+
+# Requests larger than these are refused, a single file rarely has more than a few hundred hits
+MAX_ENTRY_SIZE = 4 * 1024 * 1024
+MAX_BATCH_SIZE = 4096
+
+
+class _CacheRequestHandler(BaseHTTPRequestHandler):
+    """
+    | GET /<digest>/<oid>/<language> answers with the entry, or 404
+    | PUT /<digest>/<oid>/<language> stores the entry sent as the body
+    | POST /<digest>/batch with {"keys": ["<oid> <language>", ...]} answers with {"entries": {key: entry}} for
+    | the keys that were found
+    """
+
+    server_version = "todoon-cache"
+
+    def _get_parts(self) -> list[str]:
+        return [
+            urllib.parse.unquote(part)
+            for part in urllib.parse.urlsplit(self.path).path.strip("/").split("/")
+        ]
+
+    def _reply(self, status: int, body=None):
+        contents = b"" if body is None else json.dumps(body).encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(contents)))
+        self.end_headers()
+        self.wfile.write(contents)
+
+    def _read_body(self, limit: int):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+
+            # A negative length would read until the client hangs up
+            if length < 0 or length > limit:
+                return None
+
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return None
+
+    def do_GET(self):
+        parts = self._get_parts()
+
+        if len(parts) != 3:
+            return self._reply(404)
+
+        digest, oid, language = parts
+        key = f"{oid} {language}"
+        entries = self.server.backend.get_many(digest, [key])
+
+        if key in entries:
+            self._reply(200, entries[key])
+        else:
+            self._reply(404)
+
+    def do_PUT(self):
+        parts = self._get_parts()
+
+        if len(parts) != 3:
+            return self._reply(404)
+
+        digest, oid, language = parts
+        entry = self._read_body(MAX_ENTRY_SIZE)
+
+        if not is_valid_entry(entry):
+            return self._reply(400)
+
+        try:
+            self.server.backend.put_many(digest, {f"{oid} {language}": entry})
+        except ValueError:
+            return self._reply(400)
+
+        self._reply(204)
+
+    def do_POST(self):
+        parts = self._get_parts()
+
+        if len(parts) != 2 or parts[1] != "batch":
+            return self._reply(404)
+
+        request = self._read_body(MAX_ENTRY_SIZE)
+        keys = request.get("keys") if isinstance(request, dict) else None
+
+        if (
+            not isinstance(keys, list)
+            or len(keys) > MAX_BATCH_SIZE
+            or not all(isinstance(key, str) for key in keys)
+        ):
+            return self._reply(400)
+
+        self._reply(200, {"entries": self.server.backend.get_many(parts[0], keys)})
+
+    def log_message(self, format, *args):
+        util.print_wrap(
+            log_level=self.server.log_level,
+            msg_level=util.LOG_LEVEL_VERBOSE,
+            msg=lambda: f"{self.address_string()} - {format % args}",
+            file=sys.stderr,
+        )
+        util.flush_output()
+
+
+class CacheServer(ThreadingHTTPServer):
+    """
+    A reference store for HttpCacheBackend, keeping its entries in a FileCacheBackend
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        backend: FileCacheBackend,
+        log_level=util.LOG_LEVEL_NORMAL,
+    ):
+        """
+        :param address: Host and port to listen on, port 0 picks any free port
+        :param backend: Where the entries are kept
+        :param log_level: The importance of any feedback prints (e.g. 0=NONE, 3=VERBOSE)
+        """
+        self.backend = backend
+        self.log_level = log_level
+
+        super().__init__(address, _CacheRequestHandler)
+
+
+def serve_cache(
+    directory: str,
+    settings: Settings,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    log_level=util.LOG_LEVEL_NORMAL,
+):
+    """
+    Answers cache requests until interrupted
+    :param directory: Path-like of the directory the entries are kept in
+    :param settings: Settings resolved for this server
+    :param host: Host to listen on, only this machine by default
+    :param port: Port to listen on
+    :param log_level: The importance of any feedback prints (e.g. 0=NONE, 3=VERBOSE)
+    """
+    server = CacheServer((host, port), FileCacheBackend(directory), log_level=log_level)
+
+    os.environ["TODOON_STATUS"] = "serving"
+    util.print_wrap(
+        log_level=log_level,
+        msg=f"{loc('info_cache_server_started', settings.region)}: http://{host}:{server.server_address[1]}",
+        file=sys.stderr,
+    )
+    util.flush_output()
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -1,119 +1,461 @@
-import glob
+import copy
+import http.client
+import io
+import itertools
 import json
+import lzma
 import os
 import subprocess
 import sys
-from typing import List, Optional, TextIO
+import tarfile
+import time
+import zipfile
+import zlib
+from typing import BinaryIO, List, Optional, TextIO
 
 import typer
 from tqdm import tqdm
 from typer import run
 from typing_extensions import Annotated
 
+import todo_or_not.todo_git as todo_git
 import todo_or_not.utility as util
 from todo_or_not.utility import loc
 from todo_or_not.todo_app import TodoRun
+from todo_or_not.todo_archive import (
+    MEMBER_SEPARATOR,
+    get_archive_format,
+    read_archive_members,
+)
+from todo_or_not.todo_cache import ScanCache, create_backend, get_fingerprint
+from todo_or_not.todo_cache_server import serve_cache
+from todo_or_not.todo_gitignore import GitIgnore
+from todo_or_not.todo_context import LineIndex
+from todo_or_not.todo_settings import Settings
 from todo_or_not.localize import LOCALIZE
 from todo_or_not.localize import SUPPORTED_ENCODINGS_TODOIGNORE
 from todo_or_not.localize import SUPPORTED_ENCODINGS_TODO_CHECK
-from todo_or_not.todo_grammar import find_language, TodoGrammar
+from todo_or_not.todo_grammar import resolve_language, engines
+from todo_or_not.todo_grammar import BlockCommentTracker, parse_block_comment
+from todo_or_not.todo_history import TodoHistory
+from todo_or_not.todo_output import OUTPUT_FORMATS, create_writer
+from todo_or_not.todo_progress import ProgressReporter, get_weight
+from todo_or_not.todo_metrics import (
+    METRICS_FORMATS,
+    Timer,
+    get_metrics_format,
+    write_metrics,
+)
+from todo_or_not.todo_ignore import (
+    NestedTodoIgnore,
+    TodoIgnoreMatcher,
+    compact_todo_ignore,
+    find_matches,
+    ignores_alike,
+    match_nested_todo_ignore,
+    match_todo_ignore,
+)
 from todo_or_not.todo_hit import Hit
+from todo_or_not.todo_serve import TodoDaemon, serve
+from todo_or_not.todo_suggest import (
+    format_suggestions,
+    measure_throughput,
+    suggest_todo_ignore,
+)
+from todo_or_not.todo_watch import WatchedPaths, watch
+from todo_or_not.todo_workflow import (
+    MAX_STEP_SUMMARY_HITS,
+    MAX_STEP_SUMMARY_SIZE,
+    append_to_workflow_file,
+    format_step_summary,
+)
 
 todoon_app = typer.Typer(name="todoon")
 
 
 def find_hits(
-    filename: str, ignore_flag: str, parsers: dict, log_level=util.LOG_LEVEL_NORMAL
+    filename: str,
+    ignore_flag: str,
+    parsers: dict,
+    settings: Settings,
+    log_level=util.LOG_LEVEL_NORMAL,
+    engine: str = "ply",
+    block_comments: bool = False,
 ) -> tuple[list[Hit], str or None]:
     """
     Finds and returns each line of a file that contains a key
     :param ignore_flag: The flag which, when detected on a triggering line, will ignore that line
     :param filename: File to open() read-only
     :param parsers: Parsers that have been built for discovered languages
+    :param settings: Settings resolved for this run
     :param log_level: The importance of any feedback prints (e.g. 0=NONE, 3=VERBOSE)
+    :param engine: Which parsing engine to build for newly discovered languages, "ply" or "fast"
+    :param block_comments: Whether to also look for keywords inside of block comments
     :return:
      | List of lines of text and their line number that contain at least one key and the keys each contains
      | The detected encoding of the file or none if not found
     """
     output = []
 
-    use_encoding = get_encoding(filename, SUPPORTED_ENCODINGS_TODO_CHECK)
+    use_encoding = get_encoding(
+        filename, SUPPORTED_ENCODINGS_TODO_CHECK, region=settings.region
+    )
 
     if use_encoding is not None:
         with open(filename, "r", encoding=use_encoding) as file:
-            # Get the extension of this file and parse its language, note that several extensions may be associated
-            # with a single language, so we must find the language common to those extensions.
-            file_extension = filename.rsplit(".", 1)[-1]
-            file_language = find_language(file_extension)
-
-            # If that language does not yet have a parser built, we must build one (note that calling the
-            # TodoGrammar constructor with the file_extension will functional identically between different  # todoon
-            # file extensions for the same language)
-            if file_language not in parsers.keys():
-                parsers[file_language] = TodoGrammar(file_extension)
-                parsers[file_language].build()
-
-            line_number = 0
             lines = file.readlines()
 
-            for _line in lines:
-                line_number += 1
-
-                # Ignore this line if the ignore flag is present
-                if ignore_flag in _line:
-                    continue
-
-                _use_parser = parsers[file_language]
-                _potential_hit = _use_parser.safe_parse(_line)
-
-                if _potential_hit:
-                    # Collect surrounding lines that may be pertinent
-                    _pertinent_lines = []
-
-                    # Look at lines before the pertinent line
-                    _i = line_number - 1
-                    while (
-                        abs(line_number - _i) <= util.get_pertinent_line_limit()
-                        and _i >= 0
-                    ):
-                        _i -= 1
-                        if len(lines[_i].strip()) > 0:
-                            _pertinent_lines.insert(0, lines[_i])
-                        else:
-                            # Stop when you reach a line break
-                            break
-
-                    # Push the triggering line to the pertinent lines and note its index
-                    _pertinent_lines.append(lines[line_number - 1])
-                    _trigger_line = len(_pertinent_lines) - 1
-
-                    # Look at lines after the pertinent line
-                    _i = line_number
-                    while abs(_i - line_number) <= util.get_pertinent_line_limit():
-                        if _i < len(lines) and len(lines[_i].strip()) > 0:
-                            _pertinent_lines.append(lines[_i])
-                        else:
-                            # Stop when you reach a line break
-                            break
-                        _i += 1
+        output = find_hits_in_lines(
+            filename, lines, ignore_flag, parsers, engine, block_comments, settings
+        )
+    else:
+        util.print_wrap(
+            log_level=log_level,
+            msg_level=util.LOG_LEVEL_VERBOSE,
+            msg=lambda: f"{loc('warning_encoding_not_supported', settings.region)} \n * {filename}",
+            file=sys.stderr,
+        )
+
+    return output, use_encoding
+
 
-                    _potential_hit.source_file = os.path.relpath(filename, os.getcwd())
-                    _potential_hit.source_line = line_number
-                    _potential_hit.pertinent_lines = _pertinent_lines
-                    _potential_hit.trigger_line_index = _trigger_line
+def find_hits_in_content(
+    filename: str,
+    content: bytes,
+    ignore_flag: str,
+    parsers: dict,
+    settings: Settings,
+    log_level=util.LOG_LEVEL_NORMAL,
+    engine: str = "ply",
+    block_comments: bool = False,
+) -> tuple[list[Hit], str or None]:
+    """
+    Finds and returns each line of some file contents that contains a key, e.g. a blob read from git
+    :param filename: Path of the file the contents belong to, used to find its language and to report hits
+    :param content: The raw contents of the file
+    :return: See find_hits
+    """
+    output = []
 
-                    output.append(_potential_hit)
+    use_encoding, lines = decode_content(content, SUPPORTED_ENCODINGS_TODO_CHECK)
 
+    if use_encoding is not None:
+        output = find_hits_in_lines(
+            filename, lines, ignore_flag, parsers, engine, block_comments, settings
+        )
     else:
         util.print_wrap(
             log_level=log_level,
             msg_level=util.LOG_LEVEL_VERBOSE,
-            msg=f"{loc('warning_encoding_not_supported')} \n * {filename}",
+            msg=lambda: f"{loc('warning_encoding_not_supported', settings.region)} \n * {filename}",
+            file=sys.stderr,
         )
 
     return output, use_encoding
 
 
+def find_hits_in_archive(
+    filename: str,
+    ignore_flag: str,
+    parsers: dict,
+    settings: Settings,
+    log_level=util.LOG_LEVEL_NORMAL,
+    engine: str = "ply",
+    block_comments: bool = False,
+    max_member_size: int = 1024 * 1024,
+    content: bytes = None,
+) -> tuple[list[Hit], str or None]:
+    """
+    Finds and returns each line of each file inside of a zip or tar archive that contains a key, hits are reported
+    in e.g. "sdk.tar.gz!/src/main.c"
+    :param filename: Path of the archive
+    :param max_member_size: Files in the archive larger than this many bytes are not scanned
+    :param content: The raw contents of the archive if already read, e.g. a blob read from git
+    :return: See find_hits, the "encoding" is the format of the archive, None if it could not be read
+    """
+    output = []
+
+    archive_format = get_archive_format(filename)
+
+    try:
+        for name, member_content in read_archive_members(
+            io.BytesIO(content) if content is not None else filename,
+            archive_format,
+            max_member_size,
+        ):
+            member = f"{filename}{MEMBER_SEPARATOR}{name}"
+
+            if member_content is None:
+                util.print_wrap(
+                    log_level=log_level,
+                    msg_level=util.LOG_LEVEL_VERBOSE,
+                    msg=lambda: f"{loc('warning_archive_member_skipped', settings.region)} \n * {member}",
+                    file=sys.stderr,
+                )
+                continue
+
+            hits, _enc = find_hits_in_content(
+                member,
+                member_content,
+                ignore_flag,
+                parsers,
+                log_level=log_level,
+                engine=engine,
+                block_comments=block_comments,
+                settings=settings,
+            )
+            output.extend(hits)
+    except (
+        OSError,
+        EOFError,
+        RuntimeError,
+        zlib.error,
+        lzma.LZMAError,
+        zipfile.BadZipFile,
+        tarfile.TarError,
+    ) as e:
+        util.print_wrap(
+            log_level=log_level,
+            msg_level=util.LOG_LEVEL_VERBOSE,
+            msg=lambda: f"{loc('warning_archive_not_supported', settings.region)}: {e} \n * {filename}",
+            file=sys.stderr,
+        )
+        return output, None
+
+    return output, archive_format
+
+
+def find_hits_in_lines(
+    filename: str,
+    lines: list[str],
+    ignore_flag: str,
+    parsers: dict,
+    engine: str,
+    block_comments: bool,
+    settings: Settings,
+) -> list[Hit]:
+    """
+    Finds and returns each of the lines of a file that contains a key
+    :param filename: Path of the file the lines belong to, used to find its language and to report hits
+    :param lines: The lines of the file, as returned by readlines()
+    :return: List of hits, see find_hits
+    """
+    output = []
+    line_number = 0
+
+    # Get the language of this file from its extension, its name or its shebang (note that several
+    # extensions may be associated with a single language, so we must find the language common to them)
+    file_extension = filename.rsplit(".", 1)[-1]
+    file_language = resolve_language(filename, lines[0] if len(lines) > 0 else "")
+
+    # If that language does not yet have a parser built, we must build one
+    if file_language not in parsers.keys():
+        parsers[file_language] = engines[engine](file_extension, language=file_language)
+        parsers[file_language].build()
+
+    # Block comments are followed in a single pass alongside the line comment parsing
+    _tracker = (
+        BlockCommentTracker(file_extension, language=file_language)
+        if block_comments
+        else None
+    )
+
+    # Shared by every hit in this file to find their pertinent lines
+    _line_index = LineIndex(lines, settings.pertinent_line_limit)
+
+    for _line in lines:
+        line_number += 1
+
+        # Every line must be fed to the tracker, even ignored ones, to keep its state
+        _block_comment = _tracker.feed(_line) if _tracker is not None else None
+
+        # Ignore this line if the ignore flag is present
+        if ignore_flag in _line:
+            continue
+
+        _use_parser = parsers[file_language]
+        _potential_hit = _use_parser.safe_parse(_line)
+
+        if _potential_hit is None and _block_comment is not None:
+            _potential_hit = parse_block_comment(_block_comment, file_language)
+
+        if _potential_hit:
+            # Collect surrounding lines that may be pertinent
+            _pertinent_lines, _trigger_line = _line_index.get_pertinent_lines(
+                line_number - 1
+            )
+
+            _potential_hit.source_file = os.path.relpath(filename, os.getcwd())
+            _potential_hit.source_line = line_number
+            _potential_hit.pertinent_lines = _pertinent_lines
+            _potential_hit.trigger_line_index = _trigger_line
+
+            output.append(_potential_hit)
+
+    return output
+
+
+def read_todo_ignore(
+    todo_ignore_path: str, use_encoding: str
+) -> tuple[list[str], list[str], list[str]]:
+    """
+    Reads the paths listed in a .todo-ignore, relative to the CWD # todoon
+    :param todo_ignore_path: Path-like pointing to the .todo-ignore # todoon
+    :param use_encoding: The encoding to read it with (see get_encoding)
+    :return:
+     | Paths of the ignored files, including those matched by wildcards
+     | Paths of the ignored directories
+     | The wildcard paths themselves
+    """
+    with open(todo_ignore_path, "r", encoding=use_encoding) as _ignore:
+        return resolve_todo_ignore(_ignore.readlines(), os.getcwd())
+
+
+def resolve_todo_ignore(
+    todo_ignore_lines: list[str], root: str
+) -> tuple[list[str], list[str], list[str]]:  # todoon
+    """
+    Resolves the lines of a .todo-ignore against the disk (see read_todo_ignore) # todoon
+    :param todo_ignore_lines: The lines of the .todo-ignore, with their line endings as readlines returns them # todoon
+    :param root: Path-like of the directory the paths are relative to
+    :return: The ignored files, directories and wildcard paths, as read_todo_ignore returns them # todoon
+    """
+    ignored_files = []
+    ignored_dirs = []
+    ignored_patterns = []
+
+    for line in todo_ignore_lines:
+        if not line.startswith("#") and len(line) > 1:
+            if line.endswith("\n"):
+                cur_name = line[:-1]
+            else:
+                cur_name = line
+
+            cur_path = os.path.join(root, cur_name)
+
+            # Resolve wildcards, as every other .todo-ignore is matched # todoon
+            if "*" in cur_path:
+                ignored_files.extend(find_matches(cur_path))
+                ignored_patterns.append(cur_path)
+
+            if os.path.isfile(cur_path):
+                ignored_files.append(cur_path)
+
+            if os.path.isdir(cur_path):
+                ignored_dirs.append(cur_path)
+
+    return ignored_files, ignored_dirs, ignored_patterns
+
+
+def walk_targets(
+    root: str,
+    ignored_files: list[str],
+    ignored_dirs: list[str],
+    gitignore: GitIgnore = None,
+    nested_ignore: NestedTodoIgnore = None,
+) -> list[str]:
+    """
+    Walks a directory, pruning ignored directories so nothing inside of them is ever listed. The directory itself
+    is always walked, even if it is ignored
+    :param root: Path-like of the directory
+    :param ignored_files: Path-likes of files to never scan (see read_todo_ignore)
+    :param ignored_dirs: Path-likes of directories to never descend into
+    :param gitignore: If given, what it ignores is not walked either
+    :param nested_ignore: If given, what the .todo-ignore files below the top level ignore is not walked either # todoon
+    :return: Paths of the files that were not ignored
+    """
+    targets = []
+
+    # Compared by their real paths, so each file costs a lookup rather than a stat per ignored path
+    _ignored_files = {os.path.realpath(path) for path in ignored_files}
+    _ignored_dirs = {os.path.realpath(path) for path in ignored_dirs}
+
+    for dirpath, dirnames, filenames in os.walk(root, topdown=True):
+        if nested_ignore is not None:
+            nested_ignore.enter(dirpath)
+
+        _kept = []
+
+        for dirname in dirnames:
+            _dirname = os.path.join(dirpath, dirname)
+
+            if os.path.realpath(_dirname) in _ignored_dirs:
+                continue
+            # Directories git ignores are pruned too
+            if gitignore is not None and gitignore.match(_dirname, is_dir=True):
+                continue
+            if nested_ignore is not None and nested_ignore.is_ignored(
+                _dirname, is_dir=True
+            ):
+                continue
+
+            _kept.append(dirname)
+
+        # Only the directories kept are descended into
+        dirnames[:] = _kept
+
+        for _file in filenames:
+            current = os.path.join(dirpath, _file)
+
+            if gitignore is not None and gitignore.match(current):
+                continue
+            if nested_ignore is not None and nested_ignore.is_ignored(current):
+                continue
+            if os.path.realpath(current) in _ignored_files:
+                continue
+
+            targets.append(current)
+
+    return targets
+
+
+def read_paths(stream: BinaryIO, null: bool = False, chunk_size: int = 65536):
+    """
+    Reads a list of paths as it arrives, e.g. from a pipe, rather than waiting for all of it
+    :param stream: Binary stream of paths, e.g. sys.stdin.buffer
+    :param null: Whether the paths are separated by NUL (e.g. `find -print0` or `git diff -z`) rather than newlines
+    :param chunk_size: The most bytes read at once
+    :return: A generator of the paths, empty entries are skipped
+    """
+    separator = b"\0" if null else b"\n"
+    # Whatever is available is returned, without blocking until chunk_size bytes have been written
+    _read = stream.read1 if hasattr(stream, "read1") else stream.read
+    pending = b""
+
+    while True:
+        chunk = _read(chunk_size)
+
+        if len(chunk) == 0:
+            break
+
+        *paths, pending = (pending + chunk).split(separator)
+
+        for path in paths:
+            path = path if null else path.rstrip(b"\r")
+            if len(path) > 0:
+                yield os.fsdecode(path)
+
+    pending = pending if null else pending.rstrip(b"\r")
+    if len(pending) > 0:
+        yield os.fsdecode(pending)
+
+
+def copy_hits(hits: list[Hit], filename: str) -> list[Hit]:
+    """
+    :param hits: Hits found in the contents of one file
+    :param filename: Another file with identical contents
+    :return: The same hits, reported in the other file
+    """
+    output = []
+
+    for hit in hits:
+        _hit = copy.copy(hit)
+        _hit.source_file = os.path.relpath(filename, os.getcwd())
+        output.append(_hit)
+
+    return output
+
+
 def paste_contents_into_file(other_file_names: list[str], target_file: TextIO):
     """
     Writes the contents of other files to the target file
@@ -134,22 +476,23 @@ def paste_contents_into_file(other_file_names: list[str], target_file: TextIO):
 
 
 def get_bot_submitted_issues(
-    _test: bool = False, log_level=util.LOG_LEVEL_NORMAL
+    settings: Settings, _test: bool = False, log_level=util.LOG_LEVEL_NORMAL
 ) -> list[dict] or bool:
     """
     Makes a gh cli request for all issues submitted by app/todo-or-not, parses them, and returns them as a # todoon
     list of dicts
+    :param settings: Settings resolved for this run
     :return: List of issues as dicts
     """
     owner, repo = "owner", "repository"
 
     try:
-        if not (util.get_is_debug() or _test):
+        if not (settings.is_debug or _test):
             owner, repo = os.environ.get("GITHUB_REPOSITORY").split("/")
     except AttributeError as _:
         util.print_wrap(
             log_level=log_level,
-            msg=f"{loc('error_no_env')}: GITHUB_REPOSITORY",
+            msg=f"{loc('error_no_env', settings.region)}: GITHUB_REPOSITORY",
             file=sys.stderr,
         )
 
@@ -163,7 +506,7 @@ def get_bot_submitted_issues(
         f"/repos/{owner}/{repo}/issues?creator=app%2Ftodo-or-not&state=all",
     ]
 
-    if not (util.get_is_debug() or _test):
+    if not (settings.is_debug or _test):
         try:
             response = subprocess.check_output(query)
         except subprocess.CalledProcessError as e:
@@ -180,12 +523,16 @@ def get_bot_submitted_issues(
 
 
 def get_encoding(
-    _target_path: str, _supported_encodings: list[str], log_level=util.LOG_LEVEL_NORMAL
+    _target_path: str,
+    _supported_encodings: list[str],
+    log_level=util.LOG_LEVEL_NORMAL,
+    region: str = "en_us",
 ) -> str or None:
     """
     :param _target_path: A path-like string pointing to the file for which we want to get a valid encoding
     :param _supported_encodings: A list of supported encodings e.g. `['utf-8', 'iso-8859-1', 'iso']`
     :param log_level: The importance of any feedback prints (e.g. 0=NONE, 3=VERBOSE)
+    :param region: The region any feedback is printed in (see Settings)
     :return: The encoding of the target file if found, None if no supported encoding could be found
     """
     try:
@@ -193,7 +540,7 @@ def get_encoding(
     except AssertionError:
         util.print_wrap(
             log_level=log_level,
-            msg=f"{loc('error_is_not_file')}: {_target_path}",
+            msg=f"{loc('error_is_not_file', region)}: {_target_path}",
             file=sys.stderr,
         )
         return None
@@ -218,6 +565,27 @@ def get_encoding(
     return _use_encoding
 
 
+def decode_content(
+    content: bytes, _supported_encodings: list[str]
+) -> tuple[str or None, list[str]]:
+    """
+    Decodes raw file contents into lines the same way reading the file in text mode would
+    :param content: The raw contents of a file
+    :param _supported_encodings: A list of supported encodings e.g. `['utf-8', 'iso-8859-1', 'iso']`
+    :return: The encoding used and the decoded lines, None and no lines if no supported encoding could be used
+    """
+    for encoding in _supported_encodings:
+        try:
+            text = content.decode(encoding)
+        except UnicodeError:
+            continue
+
+        # Universal newlines, as with open()
+        return encoding, io.StringIO(text, newline=None).readlines()
+
+    return None, []
+
+
 # fmt: off
 @todoon_app.command(
     help="Checks files for occurrences of TODO or FIXME and reports them for use with automation or "
@@ -228,7 +596,8 @@ def todoon(
             typer.Argument(
                 help="If specified, only these [FILES] will be scanned for TODOs and FIXMEs. "
                      "Otherwise, all files in the current working directory except for those "
-                     "specified in .todo-ignore will be scanned")] = None,
+                     "specified in .todo-ignore will be scanned. Files named like a command "
+                     "(e.g. serve) are scanned after --, e.g. todoon -- serve")] = None,
         print_mode: Annotated[
             bool,
             typer.Option("--print/--issue", "-p/-i",
@@ -249,6 +618,11 @@ def todoon(
             typer.Option("--github-env/",
                          help="If specified, todoon will push environment variables to the special $GITHUB_ENV "
                               "file. This allows the variables to persist across steps in a workflow.")] = False,
+        step_summary: Annotated[
+            bool,
+            typer.Option("--step-summary/",
+                         help="If specified, a Markdown summary of the run with a table of hits is appended to the "
+                              "special $GITHUB_STEP_SUMMARY file, shown on the page of the workflow run")] = False,
         force: Annotated[
             bool,
             typer.Option("--force/", "-f/",
@@ -266,34 +640,169 @@ def todoon(
             bool,
             typer.Option("--very-quiet/", "-Q/",
                          help="If specified, todoon will not print anything at all")] = False,
+        engine: Annotated[
+            Optional[str],
+            typer.Option("--engine",
+                         help="Which engine to parse lines with, 'ply' (LALR parser, default) or 'fast' "
+                              "(hand-written matcher with identical results)")] = None,
+        block_comments: Annotated[
+            bool,
+            typer.Option("--block-comments/",
+                         help="If specified, todoon will also find TODOs and FIXMEs inside of block comments "
+                              "(e.g. /* */ or ''' ''')")] = False,
+        staged: Annotated[
+            bool,
+            typer.Option("--staged/",
+                         help="If specified, todoon will scan the files staged to be committed as they are in the "
+                              "git index, rather than as they are in the working tree")] = False,
+        tree: Annotated[
+            Optional[str],
+            typer.Option("--tree",
+                         help="If specified, todoon will scan the files of this commit, branch or tag as they are "
+                              "in git without checking it out, using the .todo-ignore of that tree")] = None,
+        git_files: Annotated[
+            Optional[bool],
+            typer.Option("--git-files/--walk",
+                         help="Whether to list the files to scan with git rather than walking the directory, "
+                              "which skips .git/ and whatever git ignores. Used by default when the current "
+                              "directory has a .git")] = None,
+        untracked: Annotated[
+            bool,
+            typer.Option("--untracked/",
+                         help="If specified, files listed with git also include untracked files that git does "
+                              "not ignore")] = False,
+        use_gitignore: Annotated[
+            bool,
+            typer.Option("--gitignore/",
+                         help="If specified, files ignored by the .gitignore of any directory or by "
+                              ".git/info/exclude are not scanned, and ignored directories are not walked at all "
+                              "(files listed with --git-files are already what git does not ignore)")] = False,
+        no_ignore: Annotated[
+            bool,
+            typer.Option("--no-ignore/",
+                         help="If specified, directories given as [FILES] are walked without any ignore rules "
+                              "(.todo-ignore files or --gitignore), files given as [FILES] are always scanned")] = False,  # todoon
+        watch_mode: Annotated[
+            bool,
+            typer.Option("--watch/", "-w/",
+                         help="If specified, todoon will keep running after the first scan and rescan only the "
+                              "files that change, printing the TODOs and FIXMEs each change adds or removes")] = False,
+        cache: Annotated[
+            Optional[str],
+            typer.Option("--cache",
+                         help="If specified, the hits of each file are saved to this file keyed by their git object "
+                              "ID, files that have not changed since are not scanned again. The file can be saved "
+                              "and restored between CI jobs")] = None,
+        cache_backend: Annotated[
+            Optional[str],
+            typer.Option("--cache-backend",
+                         help="If specified, the hits of files missing from the cache are looked up in this shared "
+                              "directory or http(s):// cache server (see `todoon cache-server`), and the hits of "
+                              "files scanned are shared with it")] = None,
+        output_format: Annotated[
+            str,
+            typer.Option("--format",
+                         help="How hits are written as they are found, 'text' (to stderr, default), 'jsonl' (a "
+                              "JSON object per line) or 'sarif' (a SARIF log), both to stdout")] = "text",
+        with_context: Annotated[
+            bool,
+            typer.Option("--with-context/",
+                         help="[with --format jsonl or sarif] If specified, the lines around each hit are written "
+                              "with it")] = False,
+        archives: Annotated[
+            bool,
+            typer.Option("--archives/",
+                         help="If specified, the files inside of .zip, .tar, .tar.gz and .tar.xz archives are "
+                              "scanned without extracting them, and their hits are reported as "
+                              "ARCHIVE!/PATH:LINE")] = False,
+        archive_member_limit: Annotated[
+            int,
+            typer.Option("--archive-member-limit",
+                         help="[with --archives] Files inside of an archive larger than this many bytes are not "
+                              "scanned")] = 1024 * 1024,
+        files_from: Annotated[
+            Optional[str],
+            typer.Option("--files-from",
+                         help="If specified, the paths in this file (or stdin if \"-\") are scanned as if they were "
+                              "given as [FILES], one per line. They are scanned as they are read, so todoon can run "
+                              "alongside whatever writes them")] = None,
+        null: Annotated[
+            bool,
+            typer.Option("--null/", "-0/",
+                         help="If specified, the paths of --files-from are separated by NUL characters rather than "
+                              "newlines (e.g. from `find -print0`)")] = False,
         show_progress_bar: Annotated[
             bool,
             typer.Option("--progress-bar/", "-P/",
                          help="If specified, todoon will display a progress bar while scanning files. "
                               "NOTE: This adds a small amount of overhead (will take a little longer)")] = False,
+        progress_rate: Annotated[
+            float,
+            typer.Option("--progress-rate",
+                         help="The most times per second progress (TODOON_PROGRESS, the progress bar and "
+                              "--status-file) is updated while scanning")] = 4.0,
+        status_file: Annotated[
+            Optional[str],
+            typer.Option("--status-file",
+                         help="If specified, the progress, throughput and ETA of the scan are written here as JSON "
+                              "while scanning, replaced whole each time so it can be polled")] = None,
+        metrics_out: Annotated[
+            Optional[str],
+            typer.Option("--metrics-out",
+                         help="If specified, the counts of the run and histograms of how long each file and each "
+                              "call to the GitHub API took are written here when it finishes, e.g. a .prom file for "
+                              "the textfile collector of a Prometheus node exporter")] = None,
+        metrics_format: Annotated[
+            Optional[str],
+            typer.Option("--metrics-format",
+                         help="[with --metrics-out] 'prometheus' (the text exposition format) or 'json', by default "
+                              "'json' if the path ends in .json and 'prometheus' otherwise")] = None,
         version: Annotated[
             bool,
             typer.Option("--version/", "-v/",
                          help="Show the application version and exit.")] = False
 ):
     # fmt: on
-    this_run = TodoRun({
+    run_options = {
         "files": files,
         "print_mode": print_mode,
         "silent": silent,
         "fail_closed_duplicates": fail_closed_duplicates,
         "push_github_env_vars": push_github_env_vars,
+        "step_summary": step_summary,
         "force": force,
         "verbose": verbose,
         "print_summary_only": print_summary_only,
         "print_nothing": print_nothing,
         "show_progress_bar": show_progress_bar,
+        "progress_rate": progress_rate,
+        "status_file": status_file,
+        "engine": engine,
+        "block_comments": block_comments,
+        "staged": staged,
+        "tree": tree,
+        "git_files": git_files,
+        "untracked": untracked,
+        "use_gitignore": use_gitignore,
+        "no_ignore": no_ignore,
+        "watch_mode": watch_mode,
+        "cache": cache,
+        "cache_backend": cache_backend,
+        "output_format": output_format,
+        "with_context": with_context,
+        "archives": archives,
+        "archive_member_limit": archive_member_limit,
+        "files_from": files_from,
+        "null": null,
+        "metrics_out": metrics_out,
+        "metrics_format": metrics_format,
         "version": version
-    })
+    }
 
     targets = []
     ignored_files = []
     ignored_dirs = []
+    ignored_patterns = []
 
     log_level = util.LOG_LEVEL_NORMAL
     if verbose:
@@ -308,6 +817,9 @@ def todoon(
     if files is not None and len(files) > 0:
         use_specified_files = True
 
+    if files_from is not None:
+        use_specified_files = True
+
     if version:
         util.version_callback()
 
@@ -315,126 +827,315 @@ def todoon(
     # Handle settings
     #############################################
 
+    # Resolved once here, nothing below reads settings from the environment
+    settings = Settings.resolve({
+        "engine": engine,
+        "block_comments": block_comments if block_comments else None,
+    }, log_level=log_level)
+
+    if settings.engine not in engines:
+        util.print_wrap(log_level=log_level,
+                        msg=f"{loc('error_unknown_engine', settings.region)}: {settings.engine} "
+                            f"({', '.join(engines.keys())})",
+                        file=sys.stderr,
+                        )
+        sys.exit(1)
+
+    if output_format not in OUTPUT_FORMATS:
+        util.print_wrap(log_level=log_level,
+                        msg=f"{loc('error_unknown_format', settings.region)}: {output_format} "
+                            f"({', '.join(OUTPUT_FORMATS)})",
+                        file=sys.stderr,
+                        )
+        sys.exit(1)
+
+    _metrics_format = None
+    if metrics_out is not None:
+        try:
+            _metrics_format = get_metrics_format(metrics_out, metrics_format)
+        except ValueError:
+            util.print_wrap(log_level=log_level,
+                            msg=f"{loc('error_unknown_format', settings.region)}: {metrics_format} "
+                                f"({', '.join(METRICS_FORMATS)})",
+                            file=sys.stderr,
+                            )
+            sys.exit(1)
+
+    # Watching reads the working tree, and only one git source can be scanned at a time
+    _sources = [name for name, used in [("--watch", watch_mode), ("--staged", staged), ("--tree", tree is not None)]
+                if used]
+    if len(_sources) > 1:
+        util.print_wrap(log_level=log_level,
+                        msg=f"{loc('error_incompatible_options', settings.region)}: {', '.join(_sources)}",
+                        file=sys.stderr,
+                        )
+        sys.exit(1)
+
+    # Paths read from --files-from are only ever streamed into the scan, unless the whole list is needed up front
+    files_from_stream = None
+
+    if files_from is not None:
+        files = list(files) if files is not None else []
+
+        try:
+            files_from_stream = sys.stdin.buffer if files_from == "-" else open(files_from, "rb")
+        except OSError as e:
+            util.print_wrap(log_level=log_level,
+                            msg=f"{loc('error_files_from_failed', settings.region)}: {e}",
+                            file=sys.stderr,
+                            )
+            sys.exit(1)
+
+        # Files that are staged or in a tree are matched against the whole list, and watching needs it to start
+        if staged or tree is not None or watch_mode:
+            files.extend(read_paths(files_from_stream, null=null))
+
+            if files_from_stream is not sys.stdin.buffer:
+                files_from_stream.close()
+            files_from_stream = None
+
+    this_run = TodoRun(run_options, settings)
+
     this_run.initialize_environment_variables()
 
     #############################################
     # Parse .todo-ignore # todoon
     #############################################
 
-    # If using specific files, no todo-ignore parsing is necessary # todoon
-    if not use_specified_files:
+    # Directories given as FILES are walked like the default walk, with the same ignore rules. Whether any will be
+    # read from --files-from is not known until they are
+    walk_specified_dirs = use_specified_files and not no_ignore and (
+            files_from_stream is not None or any(os.path.isdir(file) for file in files))
+
+    # If using only specific files, no todo-ignore parsing is necessary, a tree is scanned with its own # todoon
+    if (not use_specified_files or walk_specified_dirs) and tree is None:
         os.environ["TODOON_STATUS"] = "parsing-todo-ignore"
-        # As long as we aren't foregoing the .todo-ignore... # todoon
-        if not force:
+        # As long as we aren't foregoing the .todo-ignore, directories can be passed to a hook in a project without # todoon
+        # one...
+        if not force and (not use_specified_files or os.path.isfile(util.get_todo_ignore_path())):
             # Unless --force is specified,
             # a .todo-ignore in a supported encoding must be located at the project's top level # todoon
             use_encoding = get_encoding(
-                util.get_todo_ignore_path(), SUPPORTED_ENCODINGS_TODOIGNORE
+                util.get_todo_ignore_path(), SUPPORTED_ENCODINGS_TODOIGNORE, region=settings.region
             )
 
             # If we weren't able to find a file in a supported encoding, program must exit
             if use_encoding is None:
                 util.print_wrap(log_level=log_level,
-                                msg=loc("error_todo_ignore_not_supported"),
+                                msg=loc("error_todo_ignore_not_supported", settings.region),
                                 file=sys.stderr
                                 )
                 sys.exit(1)
 
             # ... actually do the reading of the .todo-ignore # todoon
-            with open(
-                    util.get_todo_ignore_path(), "r", encoding=use_encoding
-            ) as _ignore:
-                for line in _ignore.readlines():
-                    if not line.startswith("#") and len(line) > 1:
-                        if line.endswith("\n"):
-                            cur_name = line[:-1]
-                        else:
-                            cur_name = line
+            ignored_files, ignored_dirs, ignored_patterns = read_todo_ignore(
+                util.get_todo_ignore_path(), use_encoding
+            )
 
-                        cur_path = os.path.join(os.getcwd(), cur_name)
+            if len(ignored_files) == 0 and len(ignored_dirs) == 0:
+                util.print_wrap(log_level=log_level,
+                                msg=loc("warning_run_with_empty_todo_ignore", settings.region),
+                                file=sys.stderr,
+                                )
 
-                        # Resolve wildcards
-                        if '*' in cur_path:
-                            ignored_files.extend(glob.glob(cur_path, recursive=True))
+            # Ignore the .todo-ignore itself # todoon
+            ignored_files.append(os.path.abspath(util.get_todo_ignore_path()))
+        elif force:
+            util.print_wrap(log_level=log_level,
+                            msg=f"{loc('error_todo_ignore_not_found', settings.region)}"
+                                f"[{LOCALIZE[settings.operating_system]['shell_sigint']}]",
+                            file=sys.stderr,
+                            )
 
-                        if os.path.isfile(cur_path):
-                            ignored_files.append(cur_path)
+    #############################################
+    # Collect files to scan
+    #############################################
 
-                        if os.path.isdir(cur_path):
-                            ignored_dirs.append(cur_path)
+    # When scanning what is staged or a tree, the contents of each target are read from git by object ID
+    blob_ids = None
 
-                if len(ignored_files) == 0 and len(ignored_dirs) == 0:
-                    util.print_wrap(log_level=log_level,
-                                    msg=loc("warning_run_with_empty_todo_ignore"),
-                                    file=sys.stderr,
-                                    )
+    # Every .gitignore is compiled the first time the walk reaches its directory
+    gitignore = GitIgnore() if use_gitignore and not (use_specified_files and no_ignore) else None
+
+    # The .todo-ignore files below the top level, only the ones above the directory being walked are kept # todoon
+    nested_ignore = (NestedTodoIgnore(os.getcwd())
+                     if not (force or (use_specified_files and not walk_specified_dirs)) else None)
+
+    # In a git checkout a single `git ls-files` lists what a walk would find, without .git/ or ignored build output
+    git_file_paths = None
+    use_git_files = git_files if git_files is not None else os.path.exists(os.path.join(os.getcwd(), ".git"))
+
+    if use_git_files and not (staged or tree is not None or use_specified_files):
+        try:
+            git_file_paths = todo_git.list_files(include_untracked=untracked)
+        except (OSError, subprocess.CalledProcessError) as e:
+            # Only an explicit --git-files has to succeed, otherwise the directory is walked instead
+            if git_files:
+                util.print_wrap(log_level=log_level,
+                                msg=f"{loc('error_git_failed', settings.region)}: {e}",
+                                file=sys.stderr,
+                                )
+                sys.exit(1)
+
+    if staged:
+        os.environ["TODOON_STATUS"] = "collecting-targets"
 
-                # Ignore the .todo-ignore itself # todoon
-                ignored_files.append(os.path.abspath(_ignore.name))
+        try:
+            blob_ids = todo_git.list_staged_blobs()
+        except (OSError, subprocess.CalledProcessError) as e:
+            util.print_wrap(log_level=log_level,
+                            msg=f"{loc('error_git_failed', settings.region)}: {e}",
+                            file=sys.stderr,
+                            )
+            sys.exit(1)
+
+        # Specified files narrow down what is staged, otherwise the .todo-ignore applies as it would to a walk
+        if use_specified_files:
+            _selected = WatchedPaths(files)
         else:
+            if settings.is_debug:
+                ignored_files.append(__file__)
+
+            _selected = WatchedPaths([os.getcwd()], ignored_files=ignored_files, ignored_dirs=ignored_dirs,
+                                     ignored_patterns=ignored_patterns, nested_ignore=nested_ignore)
+
+        targets = [path for path in blob_ids.keys() if _selected.should_scan(path)]
+
+    elif tree is not None:
+        os.environ["TODOON_STATUS"] = "collecting-targets"
+
+        try:
+            blob_ids = todo_git.list_tree_blobs(tree)
+        except (OSError, subprocess.CalledProcessError) as e:
             util.print_wrap(log_level=log_level,
-                            msg=f"{loc('error_todo_ignore_not_found')}"
-                                f"[{LOCALIZE[util.get_os()]['shell_sigint']}]",
+                            msg=f"{loc('error_git_failed', settings.region)}: {e}",
                             file=sys.stderr,
                             )
+            sys.exit(1)
 
-    #############################################
-    # Collect files to scan
-    #############################################
+        if use_specified_files:
+            _selected = WatchedPaths(files)
+            targets = [path for path in blob_ids.keys() if _selected.should_scan(path)]
+        elif force:
+            targets = list(blob_ids.keys())
+        else:
+            _relative_paths = {os.path.relpath(path).replace(os.sep, "/"): path for path in blob_ids.keys()}
 
-    # If using specific files, we will just parse them instead of walking
-    if not use_specified_files:
+            # The .todo-ignore files as they are in that tree, not as they are in the working tree # todoon
+            _todo_ignores = {}
+            with todo_git.CatFileBatch() as _blobs:
+                _todo_ignore = _blobs.read(f"{tree}:./.todo-ignore")  # todoon
+
+                use_encoding, _todo_ignores[""] = decode_content(
+                    _todo_ignore if _todo_ignore is not None else b"", SUPPORTED_ENCODINGS_TODOIGNORE
+                )
+
+                if _todo_ignore is None or use_encoding is None:
+                    util.print_wrap(log_level=log_level,
+                                    msg=loc("error_todo_ignore_not_supported", settings.region),
+                                    file=sys.stderr
+                                    )
+                    sys.exit(1)
+
+                # The ones below the top level apply within their directory, as they do to a walk # todoon
+                for relative_path, path in _relative_paths.items():
+                    if "/" in relative_path and relative_path.endswith("/.todo-ignore"):  # todoon
+                        _nested_encoding, _lines = decode_content(
+                            _blobs.read(blob_ids[path]) or b"", SUPPORTED_ENCODINGS_TODOIGNORE
+                        )
+
+                        if _nested_encoding is not None:
+                            _todo_ignores[relative_path.rsplit("/", 1)[0]] = _lines
+
+            _ignored = match_nested_todo_ignore(_todo_ignores, _relative_paths.keys())
+
+            targets = [path for relative_path, path in _relative_paths.items() if relative_path not in _ignored]
+
+    elif git_file_paths is not None:
         os.environ["TODOON_STATUS"] = "collecting-targets"
         # Ignore this script if in DEBUG
-        if util.get_is_debug():
+        if settings.is_debug:
             ignored_files.append(__file__)
 
-        _walk = os.walk(os.getcwd(), topdown=True)
+        _selected = WatchedPaths([os.getcwd()], ignored_files=ignored_files, ignored_dirs=ignored_dirs,
+                                 ignored_patterns=ignored_patterns, nested_ignore=nested_ignore)
 
-        for dirpath, dirnames, filenames in _walk:
-            _to_remove = []
+        targets = [path for path in git_file_paths if _selected.should_scan(path)]
 
-            # Find all ignored dirs from this step of the walk
-            for dirname in dirnames:
-                for _dir in ignored_dirs:
-                    _dirname = os.path.join(dirpath, dirname)
-                    if os.path.samefile(_dirname, _dir):
-                        # Found this directory in the ignored directories, mark for removal and move to the next
-                        _to_remove.append(dirname)
-                        break
+    # If using specific files, we will just parse them instead of walking
+    elif not use_specified_files:
+        os.environ["TODOON_STATUS"] = "collecting-targets"
+        # Ignore this script if in DEBUG
+        if settings.is_debug:
+            ignored_files.append(__file__)
 
-            # Remove those directories (can't do in place because indexing)
-            for remove in _to_remove:
-                dirnames.remove(remove)
+        targets = walk_targets(os.getcwd(), ignored_files, ignored_dirs, gitignore=gitignore,
+                               nested_ignore=nested_ignore)
+    else:
+        # Ignore this script if in DEBUG
+        if walk_specified_dirs and settings.is_debug:
+            ignored_files.append(__file__)
 
-            for _file in filenames:
-                current = os.path.join(dirpath, _file)
+        def _collect_specified_files(paths):
+            for file in paths:
+                current_path = os.path.join(os.getcwd(), file)
+
+                # If the specified path is a file, simply add it, even if it would be ignored
+                if os.path.isfile(current_path):
+                    yield current_path
+
+                # If the specified path is a directory, add its children as the default walk would, only the rules
+                # that ignore it or a directory above it do not apply to it
+                elif os.path.isdir(current_path) and walk_specified_dirs:
+                    _nested_ignore = None
+                    if nested_ignore is not None and os.path.commonpath([os.path.abspath(current_path), os.getcwd()]) == os.getcwd():
+                        # The .todo-ignore files between the top level and it still apply to what is under it # todoon
+                        _nested_ignore = NestedTodoIgnore(os.getcwd())
+                        _nested_ignore.exempt(current_path)
+                    elif nested_ignore is not None:
+                        _nested_ignore = NestedTodoIgnore(current_path, read_root=True)
+
+                    yield from walk_targets(current_path, ignored_files, ignored_dirs, gitignore=gitignore,
+                                            nested_ignore=_nested_ignore)
+
+                elif os.path.isdir(current_path):
+                    _walk = os.walk(current_path, topdown=True)
+
+                    for dirpath, dirnames, filenames in _walk:
+                        for _filename in filenames:
+                            yield os.path.join(dirpath, _filename)
+
+        # Collect specified files, those read from --files-from are scanned as they arrive
+        if files_from_stream is not None:
+            targets = _collect_specified_files(itertools.chain(files, read_paths(files_from_stream, null=null)))
+        else:
+            targets = list(_collect_specified_files(files))
 
-                for i in ignored_files:
-                    if os.path.samefile(i, current):
-                        current = None
-                        break
+    #############################################
+    # Watch for changes instead of scanning once
+    #############################################
 
-                if current is not None:
-                    targets.append(current)
-    else:
-        # Collect specified files
-        for file in files:
-            current_path = os.path.join(os.getcwd(), file)
+    if watch_mode:
+        if not print_mode:
+            util.print_wrap(log_level=log_level,
+                            msg=loc("warning_watch_print_mode_only", settings.region),
+                            file=sys.stderr
+                            )
 
-            # If the specified path is a file, simply add it
-            if os.path.isfile(current_path):
-                targets.append(current_path)
-                continue
+        parsers = {}
 
-            # If the specified path is a directory, add its children
-            elif os.path.isdir(current_path):
-                _walk = os.walk(current_path, topdown=True)
+        def _scan(target):
+            return find_hits(target, "# todoon", parsers, log_level=log_level, engine=settings.engine,
+                             block_comments=settings.block_comments, settings=settings)
 
-                for dirpath, dirnames, filenames in _walk:
-                    for _filename in filenames:
-                        filename = os.path.join(dirpath, _filename)
-                        targets.append(filename)
+        watched_paths = WatchedPaths(
+            files if use_specified_files else [os.getcwd()],
+            ignored_files=ignored_files, ignored_dirs=ignored_dirs, ignored_patterns=ignored_patterns,
+            gitignore=gitignore, nested_ignore=nested_ignore
+        )
+
+        watch(targets, watched_paths, _scan, run_options, settings, log_level=log_level)
+        return
 
     #############################################
     # Preventing duplicate issues
@@ -444,7 +1145,7 @@ def todoon(
     if print_mode:
         if fail_closed_duplicates:
             util.print_wrap(log_level=log_level,
-                            msg=f"{loc('warning_nonissue_mode_closed_duplicate_used')}",
+                            msg=f"{loc('warning_nonissue_mode_closed_duplicate_used', settings.region)}",
                             file=sys.stderr
                             )
 
@@ -457,14 +1158,15 @@ def todoon(
     if not print_mode:
 
         os.environ["TODOON_STATUS"] = "collecting-issues"
-        todoon_created_issues = get_bot_submitted_issues()
+        with Timer(this_run.api_latency["list_issues"]):
+            todoon_created_issues = get_bot_submitted_issues(settings=settings)
 
         if todoon_created_issues is not False:
             for issue in todoon_created_issues:
                 existing_issues_hashed[util.sha1_hash(issue["title"])] = issue["state"]
         else:
             util.print_wrap(log_level=log_level,
-                            msg=f"{loc('error_gh_issues_read_failed')}", file=sys.stderr
+                            msg=f"{loc('error_gh_issues_read_failed', settings.region)}", file=sys.stderr
                             )
 
     #############################################
@@ -472,30 +1174,146 @@ def todoon(
     #############################################
 
     # Tracks the files attempted to be read, regardless of errors
-    this_run.number_of_files_scanned = len(
-        targets
-    )
+    this_run.number_of_files_scanned = 0
+
+    # Targets streamed from --files-from are only counted once they have all been scanned
+    _number_of_targets = len(targets) if isinstance(targets, list) else None
 
     os.environ["TODOON_STATUS"] = "scanning-files"
     os.environ["TODOON_PROGRESS"] = "0.0"
     # For each target file discovered
-    _i = 0
     _target_iterator = targets
 
-    if show_progress_bar:
-        _target_iterator = tqdm(targets, unit=loc('progress_bar_run_unit'),
-                                desc=loc('progress_bar_run_desc'))
+    # One git process streams every blob, no temporary files and no process per file
+    blob_contents = todo_git.CatFileBatch() if blob_ids is not None else None
+
+    # Identical blobs are only parsed once, keyed by object ID and language
+    blob_hits = {}
+
+    # Hits of unchanged blobs from earlier runs, git already knows the object ID of each file it tracks
+    scan_cache = None
+    cache_ids = {}
+    backend = None
+
+    if cache is not None or cache_backend is not None:
+        _fingerprint = get_fingerprint(settings, "# todoon")
+        scan_cache = ScanCache.load(cache, _fingerprint) if cache is not None else ScanCache(_fingerprint)
+
+        if blob_ids is not None:
+            cache_ids = blob_ids
+        else:
+            try:
+                cache_ids = todo_git.list_index_blobs()
+            except (OSError, subprocess.CalledProcessError) as e:
+                util.print_wrap(log_level=log_level,
+                                msg=f"{loc('warning_cache_without_git', settings.region)}: {e}",
+                                file=sys.stderr,
+                                )
+
+    # A shared cache is looked up once for every blob missing from the local one, it can only make the run faster
+    def _pull(paths):
+        nonlocal backend
+
+        try:
+            scan_cache.pull(backend, {path: cache_ids[path] for path in paths if path in cache_ids})
+        except (OSError, ValueError, http.client.HTTPException) as e:
+            util.print_wrap(log_level=log_level,
+                            msg=f"{loc('warning_cache_backend_failed', settings.region)}: {e}",
+                            file=sys.stderr,
+                            )
+            backend = None
+
+    # Streamed targets are looked up a batch at a time as they arrive
+    def _pull_batches(paths):
+        while True:
+            batch = list(itertools.islice(paths, 1024))
+            if len(batch) == 0:
+                break
+
+            if backend is not None:
+                _pull(batch)
+
+            yield from batch
+
+    if cache_backend is not None:
+        backend = create_backend(cache_backend)
+
+        if _number_of_targets is not None:
+            _pull(targets)
+        else:
+            _target_iterator = _pull_batches(targets)
+
+    # What was printed while collecting targets and issues is written out before scanning starts
+    util.flush_output()
+
+    # Only the hits listed in the step summary are kept
+    summary_hits = []
+
+    # Each hit is written as it is found, in ISSUE mode only other tools are given them
+    hit_writer = (create_writer(output_format, with_context=with_context, log_level=log_level)
+                  if print_mode or output_format != "text" else None)
+
+    # Progress is weighed by bytes, the size of each target is only known up front if they are not streamed
+    target_weights = None
+    if _number_of_targets is not None and blob_ids is not None:
+        # What is scanned is the blob, which the file on disk may differ from or not exist for
+        _blob_sizes = todo_git.get_blob_sizes({blob_ids[target] for target in targets})
+        target_weights = {target: max(_blob_sizes.get(blob_ids[target], 1), 1) for target in targets}
+    elif _number_of_targets is not None:
+        target_weights = {target: get_weight(target) for target in targets}
+    _total_bytes = sum(target_weights.values()) if target_weights is not None else None
+
+    progress = ProgressReporter(
+        total_bytes=_total_bytes, total_files=_number_of_targets, rate=progress_rate, status_file=status_file,
+        bar=tqdm(total=_total_bytes, unit="B", unit_scale=True, unit_divisor=1024,
+                 desc=loc('progress_bar_run_desc', settings.region))
+        if show_progress_bar else None,
+        file_unit=loc('progress_bar_run_unit', settings.region),
+    )
+    progress.publish()
 
     for target in _target_iterator:
 
         # Update progress
-        _i += 1
-        os.environ["TODOON_PROGRESS"] = str(round(_i / (len(targets)), 1))
+        this_run.number_of_files_scanned += 1
+        progress.advance(target_weights[target] if target_weights is not None else get_weight(target))
 
+        _scan_start = time.perf_counter()
         parsers = {}
 
+        # Archives are only opened with --archives, their hits are never cached
+        _is_archive = archives and get_archive_format(target) is not None
+
+        _oid = cache_ids.get(target) if not _is_archive else None
+        _cached = scan_cache.get(_oid, target) if _oid is not None else None
+
         # Generate the hits for each target collected
-        hits, _enc = find_hits(target, "# todoon", parsers, log_level=log_level)
+        if _cached is not None:
+            hits, _enc = _cached
+        elif _is_archive:
+            hits, _enc = find_hits_in_archive(target, "# todoon", parsers, log_level=log_level, engine=settings.engine,
+                                              block_comments=settings.block_comments, settings=settings,
+                                              max_member_size=archive_member_limit,
+                                              content=blob_contents.read(blob_ids[target])
+                                              if blob_contents is not None else None)
+        elif blob_contents is not None:
+            _blob_key = (blob_ids[target], resolve_language(target))
+
+            if _blob_key in blob_hits:
+                hits, _enc = copy_hits(blob_hits[_blob_key][0], target), blob_hits[_blob_key][1]
+            else:
+                hits, _enc = find_hits_in_content(target, blob_contents.read(blob_ids[target]), "# todoon",
+                                                  parsers, log_level=log_level, engine=settings.engine,
+                                                  block_comments=settings.block_comments, settings=settings)
+                blob_hits[_blob_key] = (hits, _enc)
+        else:
+            hits, _enc = find_hits(target, "# todoon", parsers, log_level=log_level, engine=settings.engine,
+                                   block_comments=settings.block_comments, settings=settings)
+
+        if _oid is not None and _cached is None:
+            scan_cache.put(_oid, target, hits, _enc)
+
+        this_run.file_scan_latency.observe(time.perf_counter() - _scan_start)
 
         if _enc is None:
             this_run.number_of_encoding_failures += 1
@@ -519,55 +1337,133 @@ def todoon(
                     if _this_hit_hashed not in existing_issues_hashed:
 
                         # Limit the number of issues created in one run
-                        if this_run.number_of_issues < util.get_max_issues():
-                            output = hit.generate_issue()
+                        if this_run.number_of_issues < settings.max_issues:
+                            with Timer(this_run.api_latency["create_issue"]):
+                                output = hit.generate_issue(settings=settings)
 
                             if output is not False:
                                 this_run.number_of_issues += 1
                             else:
                                 util.print_wrap(log_level=log_level,
-                                                msg=f"{loc('error_gh_issues_create_failed')}",
+                                                msg=f"{loc('error_gh_issues_create_failed', settings.region)}",
                                                 file=sys.stderr
                                                 )
 
                         else:
                             util.print_wrap(log_level=log_level,
-                                            msg=loc("error_exceeded_maximum_issues"),
+                                            msg=loc("error_exceeded_maximum_issues", settings.region),
                                             file=sys.stderr,
                                             )
                             sys.exit(1)
                     # If this title exists AND is closed, potentially fail the check
                     elif existing_issues_hashed[_this_hit_hashed] == "closed":
                         util.print_wrap(log_level=log_level,
-                                        msg=f"{loc('warning_duplicate_closed_issue')}: {hit}",
+                                        msg=lambda: f"{loc('warning_duplicate_closed_issue', settings.region)}: {hit}",
                                         file=sys.stderr
                                         )
                         this_run.number_of_closed_issues += 1
                     # If this title already exists, notify but do not halt
                     else:
                         util.print_wrap(log_level=log_level,
-                                        msg=f"{loc('info_duplicate_issue_avoided')}: {hit}",
+                                        msg=lambda: f"{loc('info_duplicate_issue_avoided', settings.region)}: {hit}",
                                         file=sys.stderr,
                                         )
                         this_run.number_of_duplicate_issues_avoided += 1
 
                 #############################################
-                # If not in ISSUE mode, print hit to stderr
+                # Write the hit in the format requested
 
-                else:
-                    util.print_wrap(log_level=log_level,
-                                    msg=str(hit), file=sys.stderr)
+                if hit_writer is not None:
+                    hit_writer.write(hit)
+
+                if step_summary and len(summary_hits) < MAX_STEP_SUMMARY_HITS:
+                    summary_hits.append(hit)
+
+    progress.finish()
+
+    if progress.status_file_error is not None:
+        util.print_wrap(log_level=log_level,
+                        msg=f"{loc('warning_status_file_not_written', settings.region)}: {progress.status_file_error}",
+                        file=sys.stderr,
+                        )
+
+    if hit_writer is not None:
+        hit_writer.close()
+
+    if blob_contents is not None:
+        blob_contents.close()
+
+    if files_from_stream is not None and files_from_stream is not sys.stdin.buffer:
+        files_from_stream.close()
+
+    if scan_cache is not None:
+        util.print_wrap(log_level=log_level, msg_level=util.LOG_LEVEL_VERBOSE,
+                        msg=f"{loc('info_cache_reused', settings.region)}: {scan_cache.number_reused}/"
+                            f"{this_run.number_of_files_scanned}",
+                        file=sys.stderr,
+                        )
+
+        # Blobs of files that were not scanned this time are only kept when scanning specific files
+        try:
+            if cache is not None:
+                scan_cache.save(cache, prune=not use_specified_files)
+        except OSError as e:
+            util.print_wrap(log_level=log_level,
+                            msg=f"{loc('warning_cache_not_written', settings.region)}: {e}",
+                            file=sys.stderr,
+                            )
+
+        try:
+            if backend is not None:
+                scan_cache.push(backend)
+        except (OSError, ValueError, http.client.HTTPException) as e:
+            util.print_wrap(log_level=log_level,
+                            msg=f"{loc('warning_cache_backend_failed', settings.region)}: {e}",
+                            file=sys.stderr,
+                            )
 
     #############################################
     # Summarize the run of todo-check  # todoon
     #############################################
 
-    summary = this_run.generate_summary_message()
+    this_run.report_environment_variables(log_level=log_level)
+
+    if step_summary:
+        _step_summary_path = os.environ.get("GITHUB_STEP_SUMMARY")
 
-    this_run.report_environment_variables()
+        try:
+            if not _step_summary_path:
+                util.print_wrap(log_level=log_level,
+                                msg=f"{loc('error_no_env', settings.region)}: GITHUB_STEP_SUMMARY",
+                                file=sys.stderr,
+                                )
+            else:
+                # The summary is already capped, it is never left out
+                append_to_workflow_file(_step_summary_path, [format_step_summary(this_run, summary_hits)],
+                                        max_size=MAX_STEP_SUMMARY_SIZE)
+        except OSError as e:
+            util.print_wrap(log_level=log_level,
+                            msg=f"{loc('warning_workflow_file_not_written', settings.region)}: GITHUB_STEP_SUMMARY: "
+                                f"{e}",
+                            file=sys.stderr,
+                            )
+
+    if metrics_out is not None:
+        _repository = os.environ.get("GITHUB_REPOSITORY")
+
+        try:
+            write_metrics(metrics_out, this_run, _metrics_format,
+                          labels={"repository": _repository} if _repository else None)
+        except OSError as e:
+            util.print_wrap(log_level=log_level,
+                            msg=f"{loc('warning_metrics_not_written', settings.region)}: {e}",
+                            file=sys.stderr,
+                            )
 
+    # The summary is only generated if it will be printed
     util.print_wrap(log_level=log_level, msg_level=util.LOG_LEVEL_SUMMARY_ONLY,
-                    msg=summary, file=sys.stderr)
+                    msg=this_run.generate_summary_message, file=sys.stderr)
+    util.flush_output()
 
     # Fail if any hits were found and we are not in silent mode
     if this_run.number_of_hits > 0 and not silent:
@@ -578,6 +1474,116 @@ def todoon(
         sys.exit(1)
 
 
+def compact_todo_ignore_file(todo_ignore_path: str, settings: Settings):  # todoon
+    """
+    Rewrites a .todo-ignore in place with compact_todo_ignore, in the encoding it was written in # todoon
+    :param todo_ignore_path: Path-like pointing to the .todo-ignore # todoon
+    :param settings: Settings resolved for this run
+    """
+    use_encoding = get_encoding(todo_ignore_path, SUPPORTED_ENCODINGS_TODOIGNORE, region=settings.region)
+
+    if use_encoding is None:
+        print(loc("error_todo_ignore_not_supported", settings.region), todo_ignore_path, file=sys.stderr)
+        sys.exit(1)
+
+    with open(todo_ignore_path, "r", encoding=use_encoding) as _ignore:
+        lines = _ignore.read().splitlines()
+
+    root = os.path.dirname(os.path.abspath(todo_ignore_path))
+    compacted, removed = compact_todo_ignore(lines, root)
+
+    # Left as it is unless the same paths are ignored
+    if not ignores_alike(lines, compacted, root):
+        print(loc("error_todo_ignore_not_compacted", settings.region), todo_ignore_path, file=sys.stderr)
+        sys.exit(1)
+
+    # Grouped like todo_ignore_util writes them, with a blank line wherever the first character changes # todoon
+    contents = io.StringIO()
+    previous = None
+    for line in compacted:
+        if previous is not None and previous != line[0]:
+            contents.write("\n")
+        previous = line[0]
+
+        contents.write(f"{line}\n")
+
+    # The .todo-ignore is never left half written # todoon
+    util.write_atomically(todo_ignore_path, contents.getvalue().encode(use_encoding))
+
+    before = sum(1 for line in lines if len(line) > 0 and not line.startswith("#"))
+    after = sum(1 for line in compacted if not line.startswith("#"))
+    shrunk = round(100 * (before - after) / before) if before > 0 else 0
+
+    print(f"{loc('info_todo_ignore_compacted', settings.region)}: {before} -> {after} (-{shrunk}%, "
+          f"{', '.join(f'{number} {reason}' for reason, number in removed.items())})")
+
+
+def print_todo_ignore_suggestions(todo_ignore_path: str, settings: Settings, cache: str = None):  # todoon
+    """
+    Prints what would be cheapest to add to a .todo-ignore, from a dry walk of the files todoon would scan # todoon
+    :param todo_ignore_path: Path-like pointing to the .todo-ignore, which may not exist yet # todoon
+    :param settings: Settings resolved for this run
+    :param cache: Path-like pointing to a cache written by `todoon --cache`, if any
+    """
+    root = os.path.dirname(os.path.abspath(todo_ignore_path))
+
+    # Only what is not ignored already is suggested
+    ignored_files, ignored_dirs, ignored_patterns = [], [], []
+    use_encoding = get_encoding(todo_ignore_path, SUPPORTED_ENCODINGS_TODOIGNORE, log_level=util.LOG_LEVEL_NONE,
+                                region=settings.region)
+
+    if use_encoding is not None:
+        ignored_files, ignored_dirs, ignored_patterns = read_todo_ignore(todo_ignore_path, use_encoding)
+        ignored_files.append(os.path.abspath(todo_ignore_path))
+
+    nested_ignore = NestedTodoIgnore(root)
+
+    # The same files as todoon, listed by git in a git checkout
+    targets = None
+
+    if os.path.exists(os.path.join(root, ".git")):
+        try:
+            _selected = WatchedPaths([root], ignored_files=ignored_files, ignored_dirs=ignored_dirs,
+                                     ignored_patterns=ignored_patterns, nested_ignore=nested_ignore)
+            targets = [path for path in todo_git.list_files() if _selected.should_scan(path)]
+        except (OSError, subprocess.CalledProcessError):
+            targets = None
+
+    if targets is None:
+        targets = walk_targets(root, ignored_files, ignored_dirs, nested_ignore=NestedTodoIgnore(root))
+
+    # Files that could not be read the last time they were scanned are not read again
+    failed_encodings = set()
+
+    if cache is not None:
+        scan_cache = ScanCache.load(cache, get_fingerprint(settings, "# todoon"))
+
+        try:
+            blob_ids = todo_git.list_index_blobs()
+        except (OSError, subprocess.CalledProcessError):
+            blob_ids = {}
+
+        for path in targets:
+            _cached = scan_cache.get(blob_ids[path], path) if path in blob_ids else None
+
+            if _cached is not None and _cached[1] is None:
+                failed_encodings.add(path)
+
+    suggestions, total_size = suggest_todo_ignore(targets, root, failed_encodings)
+
+    # Times are estimated from how long the files that are not suggested take to scan
+    _suggested = TodoIgnoreMatcher([suggestion.entry for suggestion in suggestions])
+    parsers = {}
+
+    throughput = measure_throughput(
+        [path for path in targets if not _suggested.matches(os.path.relpath(path, root).replace(os.sep, "/"))],
+        lambda path: find_hits(path, "# todoon", parsers, log_level=util.LOG_LEVEL_NONE, engine=settings.engine,
+                               block_comments=settings.block_comments, settings=settings)
+    )
+
+    print(format_suggestions(suggestions, total_size, settings.region, throughput))
+
+
 # fmt: off
 @todoon_app.command(help="Small utility for generating a .todo-ignore file")
 def todo_ignore_util(
@@ -592,12 +1598,41 @@ def todo_ignore_util(
             typer.Option("--create/--update", "-c/-u",
                          help="Whether to create a new .todo-ignore file or update an existing one")] = True,
         source_is_text: Annotated[bool, typer.Option("--source-text/--source-paths", "-t/-p",
-                                                     help="Whether to treat SOURCES as text or as file paths.")] = True
+                                                     help="Whether to treat SOURCES as text or as file paths.")] = True,
+        compact: Annotated[
+            bool,
+            typer.Option("--compact/",
+                         help="If specified, the .todo-ignore is rewritten with duplicates and entries already "
+                              "covered by a directory or wildcard removed, and files that are all of those with "
+                              "an extension in their directory merged into one wildcard")] = False,
+        suggest: Annotated[
+            bool,
+            typer.Option("--suggest/",
+                         help="If specified, nothing is written. Instead, the files todoon would scan are walked "
+                              "without scanning them, and what would be cheapest to ignore (binary, generated, "
+                              "minified and vendored files, very long lines and unsupported encodings) is printed "
+                              "in .todo-ignore syntax, most costly first")] = False,
+        cache: Annotated[
+            Optional[str],
+            typer.Option("--cache",
+                         help="[with --suggest] A cache written by `todoon --cache`, files whose encoding was not "
+                              "supported when it was written are suggested without reading them")] = None
 ):
     # fmt: on
+    settings = Settings.resolve()
     todoignore_path = os.path.join(os.getcwd(), ".todo-ignore")
     output = []
 
+    if suggest:
+        print_todo_ignore_suggestions(todoignore_path, settings, cache)
+        return
+
+    # Compacting on its own only rewrites the existing file
+    if compact and (sources is None or len(sources) == 0):
+        compact_todo_ignore_file(todoignore_path, settings)
+        print(loc("general_done", settings.region))
+        return
+
     if create_mode:
         access_mode = "x"
     else:
@@ -621,9 +1656,9 @@ def todo_ignore_util(
                             if len(line) > 0:
                                 output.append(line)
                 except FileNotFoundError:
-                    print(loc("warning_file_does_not_exist"), _path, file=sys.stderr)
+                    print(loc("warning_file_does_not_exist", settings.region), _path, file=sys.stderr)
                 except IsADirectoryError:
-                    print(loc("warning_is_a_directory"), _path, file=sys.stderr)
+                    print(loc("warning_is_a_directory", settings.region), _path, file=sys.stderr)
 
     try:
         with open(todoignore_path, access_mode) as target:
@@ -636,15 +1671,250 @@ def todo_ignore_util(
                 target.write(f"{line}\n")
     except FileExistsError:
         print(
-            loc("error_file_already_exists"), todoignore_path, file=sys.stderr
+            loc("error_file_already_exists", settings.region), todoignore_path, file=sys.stderr
         )
         sys.exit(1)
 
-    print(loc("general_done"))
+    if compact:
+        compact_todo_ignore_file(todoignore_path, settings)
+
+    print(loc("general_done", settings.region))
+
+
+# fmt: off
+@todoon_app.command(help="Runs todoon as a daemon that keeps its state between scans and answers requests from "
+                         "todoon-client over a Unix socket")
+def todoon_serve(
+        socket_path: Annotated[
+            str,
+            typer.Option("--socket",
+                         help="Path of the Unix socket to listen on")],
+        silent: Annotated[
+            bool,
+            typer.Option("--silent/", "-s/",
+                         help="(No fail) If specified, clients will not exit with an error code even "
+                              "when TODOs and/or FIXMEs are detected")] = False,
+        force: Annotated[
+            bool,
+            typer.Option("--force/", "-f/",
+                         help="(NOT RECOMMENDED) If specified, no .todo-ignore file will be used")] = False,
+        verbose: Annotated[
+            bool,
+            typer.Option("--verbose/", "-V/",
+                         help="If specified, todoon will not to print lengthy or numerous messages "
+                              "(like each encoding failure)")] = False,
+        engine: Annotated[
+            Optional[str],
+            typer.Option("--engine",
+                         help="Which engine to parse lines with, 'ply' (LALR parser, default) or 'fast' "
+                              "(hand-written matcher with identical results)")] = None,
+        block_comments: Annotated[
+            bool,
+            typer.Option("--block-comments/",
+                         help="If specified, todoon will also find TODOs and FIXMEs inside of block comments "
+                              "(e.g. /* */ or ''' ''')")] = False,
+        use_gitignore: Annotated[
+            bool,
+            typer.Option("--gitignore/",
+                         help="If specified, files ignored by the .gitignore of any directory or by "
+                              ".git/info/exclude are not scanned, and ignored directories are not walked at all")] = False,
+):
+    # fmt: on
+    log_level = util.LOG_LEVEL_VERBOSE if verbose else util.LOG_LEVEL_NORMAL
+
+    settings = Settings.resolve({
+        "engine": engine,
+        "block_comments": block_comments if block_comments else None,
+    }, log_level=log_level)
+
+    if settings.engine not in engines:
+        util.print_wrap(log_level=log_level,
+                        msg=f"{loc('error_unknown_engine', settings.region)}: {settings.engine} "
+                            f"({', '.join(engines.keys())})",
+                        file=sys.stderr,
+                        )
+        sys.exit(1)
+
+    todo_ignore_path = util.get_todo_ignore_path()  # todoon
+
+    if not force and get_encoding(todo_ignore_path, SUPPORTED_ENCODINGS_TODOIGNORE, region=settings.region) is None:
+        util.print_wrap(log_level=log_level,
+                        msg=loc("error_todo_ignore_not_supported", settings.region),
+                        file=sys.stderr
+                        )
+        sys.exit(1)
+
+    # Grammars are built once and kept for the life of the daemon
+    parsers = {}
+
+    def _scan(target):
+        return find_hits(target, "# todoon", parsers, log_level=log_level, engine=settings.engine,
+                         block_comments=settings.block_comments, settings=settings)
+
+    def _load_paths():
+        ignored_files, ignored_dirs, ignored_patterns = [], [], []
+
+        if not force:
+            use_encoding = get_encoding(todo_ignore_path, SUPPORTED_ENCODINGS_TODOIGNORE,
+                                        log_level=util.LOG_LEVEL_NONE, region=settings.region)
+
+            # The .todo-ignore may have been removed since the daemon started # todoon
+            if use_encoding is not None:
+                ignored_files, ignored_dirs, ignored_patterns = read_todo_ignore(todo_ignore_path, use_encoding)
+
+            ignored_files.append(todo_ignore_path)
+
+        if settings.is_debug:
+            ignored_files.append(__file__)
+
+        return WatchedPaths([os.getcwd()], ignored_files=ignored_files, ignored_dirs=ignored_dirs,
+                            ignored_patterns=ignored_patterns,
+                            nested_ignore=NestedTodoIgnore(os.getcwd()) if not force else None,
+                            gitignore=GitIgnore() if use_gitignore else None)
+
+    run_options = {
+        "print_mode": True,
+        "silent": silent,
+        "fail_closed_duplicates": False,
+        "push_github_env_vars": False,
+    }
+
+    daemon = TodoDaemon(_scan, _load_paths, todo_ignore_path, run_options, settings)
+    serve(socket_path, daemon, log_level=log_level)
+
+
+# fmt: off
+@todoon_app.command(help="Counts the TODOs and FIXMEs at each commit of a range and finds the commit each one was "
+                         "first seen in, reading each distinct file version only once")
+def todoon_history(
+        revision_range: Annotated[
+            str,
+            typer.Argument(
+                help="Commits to walk along first parents, e.g. v1.0.0..main, or HEAD for all of history")],
+        output_json: Annotated[
+            bool,
+            typer.Option("--json/",
+                         help="If specified, todoon will print the history as JSON")] = False,
+        force: Annotated[
+            bool,
+            typer.Option("--force/", "-f/",
+                         help="(NOT RECOMMENDED) If specified, no .todo-ignore file will be used")] = False,
+        engine: Annotated[
+            Optional[str],
+            typer.Option("--engine",
+                         help="Which engine to parse lines with, 'ply' (LALR parser, default) or 'fast' "
+                              "(hand-written matcher with identical results)")] = None,
+        block_comments: Annotated[
+            bool,
+            typer.Option("--block-comments/",
+                         help="If specified, todoon will also find TODOs and FIXMEs inside of block comments "
+                              "(e.g. /* */ or ''' ''')")] = False,
+):
+    # fmt: on
+    log_level = util.LOG_LEVEL_NORMAL
+
+    settings = Settings.resolve({
+        "engine": engine,
+        "block_comments": block_comments if block_comments else None,
+    }, log_level=log_level)
+
+    if settings.engine not in engines:
+        util.print_wrap(log_level=log_level,
+                        msg=f"{loc('error_unknown_engine', settings.region)}: {settings.engine} "
+                            f"({', '.join(engines.keys())})",
+                        file=sys.stderr,
+                        )
+        sys.exit(1)
+
+    # The current .todo-ignore applies to every commit, matched against the paths of each tree # todoon
+    todo_ignore_lines = []
+
+    if not force:
+        use_encoding = get_encoding(util.get_todo_ignore_path(), SUPPORTED_ENCODINGS_TODOIGNORE,
+                                    region=settings.region)
+
+        if use_encoding is None:
+            util.print_wrap(log_level=log_level,
+                            msg=loc("error_todo_ignore_not_supported", settings.region),
+                            file=sys.stderr
+                            )
+            sys.exit(1)
+
+        with open(util.get_todo_ignore_path(), "r", encoding=use_encoding) as _ignore:  # todoon
+            todo_ignore_lines = _ignore.readlines()
+
+    def _selected(path):
+        relative_path = os.path.relpath(path).replace(os.sep, "/")
+
+        # Like a walk of the CWD, files outside of it are not scanned
+        if relative_path.startswith("../"):
+            return False
+
+        return len(match_todo_ignore(todo_ignore_lines, [relative_path])) == 0
+
+    parsers = {}
+
+    def _scan_content(path, contents):
+        return find_hits_in_content(path, contents, "# todoon", parsers, log_level=log_level, engine=settings.engine,
+                                    block_comments=settings.block_comments, settings=settings)
+
+    history = TodoHistory(_scan_content, _selected)
+
+    try:
+        history.walk(revision_range)
+    except (OSError, subprocess.CalledProcessError) as e:
+        util.print_wrap(log_level=log_level,
+                        msg=f"{loc('error_git_failed', settings.region)}: {e}",
+                        file=sys.stderr,
+                        )
+        sys.exit(1)
+
+    if output_json:
+        print(json.dumps(history.to_dict(), indent=2))
+    else:
+        print(history, end="")
+
+
+# fmt: off
+@todoon_app.command(help="Serves a cache that todoon runs on other machines can share with --cache-backend URL")
+def todoon_cache_server(
+        directory: Annotated[
+            str,
+            typer.Option("--directory",
+                         help="Directory the cached hits are kept in")] = ".todoon-cache",
+        host: Annotated[
+            str,
+            typer.Option("--host",
+                         help="Host to listen on, only this machine by default")] = "127.0.0.1",
+        port: Annotated[
+            int,
+            typer.Option("--port",
+                         help="Port to listen on")] = 8765,
+        verbose: Annotated[
+            bool,
+            typer.Option("--verbose/", "-V/",
+                         help="If specified, every request is printed")] = False,
+):
+    # fmt: on
+    log_level = util.LOG_LEVEL_VERBOSE if verbose else util.LOG_LEVEL_NORMAL
+
+    serve_cache(directory, Settings.resolve(log_level=log_level), host, port, log_level=log_level)
+
+
+# Commands run as `todoon <command> ...`, anything else is a regular run. A file named like a command is scanned
+# after `--`, e.g. `todoon -- serve`, as the command is only ever the first argument
+todoon_subcommands = {
+    "serve": todoon_serve,
+    "history": todoon_history,
+    "cache-server": todoon_cache_server,
+}
 
 
 def typer_todoon():
-    run(todoon)
+    if len(sys.argv) > 1 and sys.argv[1] in todoon_subcommands:
+        run(todoon_subcommands[sys.argv.pop(1)])
+    else:
+        run(todoon)
 
 
 def typer_todo_ignore_util():
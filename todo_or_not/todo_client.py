@@ -0,0 +1,86 @@
+import argparse
+import json
+import os
+import socket
+import sys
+
+from todo_or_not.todo_settings import Settings
+from todo_or_not.utility import LOG_LEVEL_NONE, loc
+
+# Kept free of typer and the grammars so that starting the client costs as little as possible
+
+
+def request(socket_path: str, payload: dict, timeout: float = 60.0) -> dict:
+    """
+    Sends a single request to a daemon started with `todoon serve`
+    :param socket_path: Path-like of the daemon's socket
+    :param payload: The request (see TodoDaemon.handle)
+    :param timeout: Seconds to wait for an answer
+    :return: The daemon's answer
+    :raises OSError: If the daemon could not be reached
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        client.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+
+        with client.makefile("rb") as response:
+            return json.loads(response.readline())
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="todoon-client",
+        description="Asks a daemon started with `todoon serve` to scan files for TODOs and FIXMEs",
+    )
+    parser.add_argument("files", nargs="*", help="Only scan these files")
+    parser.add_argument("--socket", required=True, help="Path of the daemon's socket")
+    parser.add_argument(
+        "--silent", "-s", action="store_true", help="Do not fail when TODOs are found"
+    )
+    parser.add_argument(
+        "--query",
+        action="store_true",
+        help="Answer from the last scan instead of checking for changes",
+    )
+    parser.add_argument("--shutdown", action="store_true", help="Stop the daemon")
+    args = parser.parse_args(argv)
+
+    if args.shutdown:
+        payload = {"command": "shutdown"}
+    else:
+        payload = {
+            "command": "query" if args.query else "scan",
+            "files": [os.path.abspath(file) for file in args.files],
+            "silent": args.silent,
+        }
+
+    try:
+        response = request(args.socket, payload)
+    except (OSError, ValueError) as e:
+        region = Settings.resolve(log_level=LOG_LEVEL_NONE).region
+        print(
+            f"{loc('error_daemon_unreachable', region)}: {args.socket} ({e})",
+            file=sys.stderr,
+        )
+        return 2
+
+    if "error" in response:
+        print(response["error"], file=sys.stderr)
+        return 2
+
+    for hit in response.get("hits", []):
+        print(hit, file=sys.stderr)
+
+    if "summary" in response:
+        print(response["summary"], file=sys.stderr)
+
+    return response.get("exit_code", 0)
+
+
+def run_client():
+    sys.exit(main())
+
+
+if __name__ == "__main__":
+    run_client()
@@ -0,0 +1,56 @@
+import itertools
+
+
+class LineIndex:
+    """
+    Index of the blank lines of a file, used to find the lines pertinent to any hit in constant time. The index
+    is only built once a file has its first hit, and is shared by every hit in that file.
+    """
+
+    def __init__(self, lines: list[str], pertinent_line_limit: int):
+        self.lines = lines
+
+        # Up to this many lines are collected before a triggering line, and one more after it
+        self.lines_before = max(pertinent_line_limit, 0)
+        self.lines_after = max(pertinent_line_limit + 1, 0)
+
+        self._blank_lines = None
+        self._blank_lines_before = None
+
+    def _build(self):
+        # Each pass runs in C, lines from readlines() are never empty so isspace() finds every blank line
+        _is_blank = list(map(str.isspace, self.lines))
+        self._blank_lines = list(itertools.compress(range(len(self.lines)), _is_blank))
+        self._blank_lines_before = list(itertools.accumulate(_is_blank, initial=0))
+
+    def get_pertinent_bounds(self, line_index: int) -> tuple[int, int]:
+        """
+        :param line_index: Index (0-based) of the triggering line, which must not be blank
+        :return: Start (inclusive) and end (exclusive) indices of the lines pertinent to the triggering line,
+         stopping at the nearest blank lines or the pertinent line limit
+        """
+        if self._blank_lines is None:
+            self._build()
+
+        # The blank lines that bound the paragraph of the triggering line
+        _paragraph = self._blank_lines_before[line_index]
+        paragraph_start = self._blank_lines[_paragraph - 1] + 1 if _paragraph > 0 else 0
+        paragraph_end = (
+            self._blank_lines[_paragraph]
+            if _paragraph < len(self._blank_lines)
+            else len(self.lines)
+        )
+
+        start = max(line_index - self.lines_before, paragraph_start)
+        end = min(line_index + 1 + self.lines_after, paragraph_end)
+
+        return start, end
+
+    def get_pertinent_lines(self, line_index: int) -> tuple[list[str], int]:
+        """
+        :param line_index: Index (0-based) of the triggering line, which must not be blank
+        :return: The lines pertinent to the triggering line, and the index of the triggering line among them
+        """
+        start, end = self.get_pertinent_bounds(line_index)
+
+        return self.lines[start:end], line_index - start
@@ -0,0 +1,292 @@
+import os
+import subprocess
+
+# Only regular files are scanned, never symlinks (120000) or submodules (160000)
+REGULAR_FILE_MODES = ("100644", "100755")
+
+
+def run_git(args: list[str], _input: bytes = None) -> bytes:
+    """
+    :param args: Arguments to git, e.g. ["rev-parse", "HEAD"]
+    :param _input: Bytes to write to git's stdin
+    :return: What git wrote to stdout
+    :raises subprocess.CalledProcessError: If git exits with an error
+    :raises OSError: If git could not be run at all
+    """
+    return subprocess.run(
+        ["git", *args], input=_input, capture_output=True, check=True
+    ).stdout
+
+
+def get_toplevel() -> str:
+    """
+    :return: Absolute path of the top level of the working tree the CWD is in
+    """
+    return os.fsdecode(run_git(["rev-parse", "--show-toplevel"]).rstrip(b"\n"))
+
+
+def _is_null_oid(oid: str) -> bool:
+    return oid.strip("0") == ""
+
+
+def list_staged_blobs() -> dict[str, str]:
+    """
+    Lists the files whose contents are staged to be committed, as they are in the index
+    :return: Object IDs of the staged blobs, keyed by the absolute path of their file
+    """
+    toplevel = get_toplevel()
+
+    # diff-index needs something to compare against, before the first commit that is the empty tree
+    try:
+        base = run_git(["rev-parse", "--verify", "--quiet", "HEAD"]).strip()
+    except subprocess.CalledProcessError:
+        base = run_git(["hash-object", "-t", "tree", "--stdin"], _input=b"").strip()
+
+    output = run_git(
+        [
+            "diff-index",
+            "--cached",
+            "-z",
+            "--no-renames",
+            "--diff-filter=d",
+            os.fsdecode(base),
+        ]
+    )
+
+    # Each entry is ":<old mode> <new mode> <old oid> <new oid> <status>" then the path, all NUL terminated
+    fields = output.split(b"\0")
+    staged = {}
+
+    for i in range(0, len(fields) - 1, 2):
+        _old_mode, new_mode, _old_oid, new_oid, _status = (
+            os.fsdecode(fields[i]).lstrip(":").split(" ")
+        )
+
+        # Unmerged and intent-to-add entries have no blob in the index yet
+        if new_mode not in REGULAR_FILE_MODES or _is_null_oid(new_oid):
+            continue
+
+        path = os.path.join(toplevel, os.fsdecode(fields[i + 1]))
+        staged[os.path.normpath(path)] = new_oid
+
+    return staged
+
+
+def list_files(include_untracked: bool = False) -> list[str]:
+    """
+    Lists the files git knows of under the CWD in one call, rather than walking the working tree
+    :param include_untracked: Whether to also list untracked files, unless git ignores them (.gitignore,
+     .git/info/exclude or core.excludesFile)
+    :return: Absolute paths of the files, as long as they exist in the working tree
+    """
+    args = ["ls-files", "-z", "--cached"]
+    if include_untracked:
+        args += ["--others", "--exclude-standard"]
+
+    root = os.getcwd()
+
+    # Conflicted files are listed once per stage, so duplicates are dropped while keeping git's order
+    paths = {}
+    for path in run_git(args).split(b"\0"):
+        if len(path) > 0:
+            paths[os.path.normpath(os.path.join(root, os.fsdecode(path)))] = None
+
+    # Files deleted from the working tree are still in the index, and submodules are directories
+    return [path for path in paths.keys() if os.path.isfile(path)]
+
+
+def list_index_blobs() -> dict[str, str]:
+    """
+    Lists the tracked files under the CWD whose working tree contents are still those recorded in the index, git
+    already knows their object IDs so nothing has to be read or hashed to find them
+    :return: Object IDs of the blobs, keyed by the absolute path of their file
+    """
+    root = os.getcwd()
+
+    # Each entry is "<mode> <oid> <stage>\t<path>", NUL terminated, with paths relative to the CWD
+    output = run_git(["ls-files", "--stage", "-z"])
+    modified = set(run_git(["ls-files", "--modified", "-z"]).split(b"\0"))
+
+    blobs = {}
+
+    for entry in output.split(b"\0"):
+        if len(entry) == 0:
+            continue
+
+        info, path = entry.split(b"\t", 1)
+        mode, oid, stage = os.fsdecode(info).split(" ")
+
+        # Conflicted files have several stages, and the index says nothing about modified files
+        if mode not in REGULAR_FILE_MODES or stage != "0" or path in modified:
+            continue
+
+        blobs[os.path.normpath(os.path.join(root, os.fsdecode(path)))] = oid
+
+    return blobs
+
+
+def list_tree_blobs(commit_ish: str, full_tree: bool = False) -> dict[str, str]:
+    """
+    Lists the files of a commit's tree, without checking it out
+    :param commit_ish: A commit, branch, tag or tree, e.g. "v1.0.0" or "HEAD~3"
+    :param full_tree: Whether to list the whole tree rather than only what is under the CWD
+    :return: Object IDs of the blobs, keyed by the absolute path their file would have if checked out
+    """
+    if full_tree:
+        output = run_git(["ls-tree", "-r", "-z", "--full-tree", commit_ish, "--"])
+        root = get_toplevel()
+    else:
+        output = run_git(["ls-tree", "-r", "-z", commit_ish, "--"])
+        root = os.getcwd()
+
+    # Each entry is "<mode> <type> <oid>\t<path>", NUL terminated, with paths relative to the root
+    blobs = {}
+
+    for entry in output.split(b"\0"):
+        if len(entry) == 0:
+            continue
+
+        info, path = entry.split(b"\t", 1)
+        mode, _type, oid = os.fsdecode(info).split(" ")
+
+        if mode not in REGULAR_FILE_MODES:
+            continue
+
+        blobs[os.path.normpath(os.path.join(root, os.fsdecode(path)))] = oid
+
+    return blobs
+
+
+def get_first_parent(commit_ish: str) -> str or None:
+    """
+    :return: The first parent of a commit, None if it is a root commit
+    """
+    try:
+        return os.fsdecode(
+            run_git(["rev-parse", "--verify", "--quiet", f"{commit_ish}^"]).strip()
+        )
+    except subprocess.CalledProcessError:
+        return None
+
+
+def list_first_parent_changes(revision_range: str):
+    """
+    Walks a range of commits from oldest to newest along first parents, e.g. the history of a branch
+    :param revision_range: Commits to walk, e.g. "v1.0.0..main", or "HEAD" for all of history
+    :return: For each commit, its ID and the object IDs of the files it changed, keyed by their absolute path
+     (None if the file was deleted, or is no longer a regular file)
+    """
+    toplevel = get_toplevel()
+
+    # -m with --first-parent shows merges as their change to the first parent
+    output = run_git(
+        [
+            "log",
+            "--first-parent",
+            "-m",
+            "--reverse",
+            "--no-renames",
+            "--no-abbrev",
+            "--raw",
+            "-z",
+            "--format=commit %H",
+            revision_range,
+            "--",
+        ]
+    )
+
+    commit = None
+    changes = {}
+    fields = iter(output.split(b"\0"))
+
+    for field in fields:
+        field = field.lstrip(b"\n")
+
+        if field.startswith(b"commit "):
+            if commit is not None:
+                yield commit, changes
+
+            commit = os.fsdecode(field[len(b"commit ") :])
+            changes = {}
+        elif field.startswith(b":"):
+            # ":<old mode> <new mode> <old oid> <new oid> <status>", followed by the path
+            _old_mode, new_mode, _old_oid, new_oid, _status = (
+                os.fsdecode(field).lstrip(":").split(" ")
+            )
+            path = os.path.normpath(os.path.join(toplevel, os.fsdecode(next(fields))))
+
+            if new_mode in REGULAR_FILE_MODES and not _is_null_oid(new_oid):
+                changes[path] = new_oid
+            else:
+                changes[path] = None
+
+    if commit is not None:
+        yield commit, changes
+
+
+def get_blob_sizes(oids) -> dict[str, int]:
+    """
+    :param oids: Object IDs of blobs, e.g. the values of list_staged_blobs
+    :return: The size in bytes of each blob, keyed by its object ID, without those that do not exist
+    """
+    oids = list(oids)
+    if len(oids) == 0:
+        return {}
+
+    # One `git cat-file --batch-check` for all of them, each line is "<oid> <type> <size>" or "<oid> missing"
+    output = run_git(
+        ["cat-file", "--batch-check"],
+        _input="".join(f"{oid}\n" for oid in oids).encode("utf-8"),
+    )
+    sizes = {}
+
+    for line in output.decode("utf-8").splitlines():
+        fields = line.split(" ")
+
+        if len(fields) == 3:
+            sizes[fields[0]] = int(fields[2])
+
+    return sizes
+
+
+class CatFileBatch:
+    """
+    A single long-running `git cat-file --batch`, reading any number of objects without a process per object
+    """
+
+    def __init__(self):
+        self._process = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+    def read(self, oid: str) -> bytes or None:
+        """
+        :param oid: Object ID (or any name cat-file understands, e.g. HEAD:README.md)
+        :return: The contents of the object, None if there is no such object
+        """
+        self._process.stdin.write(oid.encode("utf-8") + b"\n")
+        self._process.stdin.flush()
+
+        # "<oid> <type> <size>" then the contents and a newline, or "<name> missing"
+        header = self._process.stdout.readline()
+        if header.endswith(b" missing\n") or len(header) == 0:
+            return None
+
+        size = int(header.split(b" ")[2])
+        contents = self._process.stdout.read(size)
+        self._process.stdout.read(1)
+
+        return contents
+
+    def close(self):
+        self._process.stdin.close()
+        self._process.stdout.close()
+        self._process.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
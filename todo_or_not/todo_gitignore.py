@@ -0,0 +1,259 @@
+import os
+import re
+
+
+class _Rule:
+    """A single pattern of an ignore file, matched against paths relative to the directory of that file"""
+
+    __slots__ = ("base", "regex", "negated", "dir_only")
+
+    def __init__(self, base: str, regex, negated: bool, dir_only: bool):
+        self.base = base
+        self.regex = regex
+        self.negated = negated
+        self.dir_only = dir_only
+
+
+def _translate(pattern: str) -> str:
+    """
+    :param pattern: A gitignore pattern without its "!", leading "/" or trailing "/"
+    :return: A regex matching the paths (relative, "/" separated) the pattern matches
+    """
+    output = ""
+    i, n = 0, len(pattern)
+
+    while i < n:
+        c = pattern[i]
+
+        if c == "*" and pattern.startswith("**", i):
+            whole_segment = i == 0 or pattern[i - 1] == "/"
+
+            if whole_segment and i + 2 == n:
+                # "foo/**" matches everything inside of foo
+                output += ".*"
+                i += 2
+                continue
+            elif whole_segment and pattern[i + 2] == "/":
+                # "**/" matches zero or more directories
+                output += "(?:.*/)?"
+                i += 3
+                continue
+
+            # Anywhere else "**" is no different from "*"
+            output += "[^/]*"
+            i += 2
+            continue
+        elif c == "*":
+            output += "[^/]*"
+        elif c == "?":
+            output += "[^/]"
+        elif c == "[":
+            # A "]" right after the "[" (or its "!") is part of the class
+            j = i + 1
+            if j < n and pattern[j] in "!^":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+
+            end = pattern.find("]", j)
+
+            if end == -1:
+                output += re.escape(c)
+            else:
+                contents = pattern[i + 1 : end]
+                negated = contents[0] in "!^"
+                if negated:
+                    contents = contents[1:]
+
+                contents = "".join(
+                    "\\" + _c if _c in "\\[]^" else _c for _c in contents
+                )
+                output += ("[^" if negated else "[") + contents + "]"
+                i = end
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            output += re.escape(pattern[i])
+        else:
+            output += re.escape(c)
+
+        i += 1
+
+    return output
+
+
+def parse_gitignore(lines: list[str], base: str = "") -> list[_Rule]:
+    """
+    :param lines: The lines of an ignore file, in gitignore syntax
+    :param base: Directory of the ignore file, relative to the root and "/" separated ("" for the root)
+    :return: The rules of the file, in order
+    """
+    rules = []
+
+    for line in lines:
+        line = line.rstrip("\r\n")
+
+        # Trailing spaces are ignored unless escaped
+        stripped = line.rstrip(" ")
+        if stripped.endswith("\\") and len(stripped) < len(line):
+            stripped += " "
+        line = stripped
+
+        if len(line) == 0 or line.startswith("#"):
+            continue
+
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+
+        if len(line) == 0:
+            continue
+
+        # A slash anywhere but the end anchors the pattern to the directory of its file
+        anchored = "/" in line
+        line = line.lstrip("/")
+
+        regex = _translate(line)
+        if not anchored:
+            regex = "(?:.*/)?" + regex
+
+        rules.append(_Rule(base, re.compile(regex, re.DOTALL), negated, dir_only))
+
+    return rules
+
+
+def find_git_root(path: str) -> str or None:
+    """
+    :param path: Path-like of a directory
+    :return: The closest directory at or above it that has a .git, None if there is none
+    """
+    path = os.path.abspath(path)
+
+    while True:
+        if os.path.exists(os.path.join(path, ".git")):
+            return path
+
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+class GitIgnore:
+    """
+    The .gitignore of every directory of a working tree along with .git/info/exclude, each compiled the first time
+    something in its directory is matched
+    """
+
+    def __init__(self, root: str = None, filename: str = ".gitignore"):
+        """
+        :param root: Path-like of the top of the working tree, the closest directory with a .git above the CWD (or
+         the CWD itself) if not given
+        :param filename: Name of the ignore file read in each directory
+        """
+        if root is None:
+            root = find_git_root(os.getcwd()) or os.getcwd()
+
+        self.root = os.path.abspath(root)
+        self.filename = filename
+
+        # Every ignore file read so far, whether or not it existed
+        self.read_paths = set()
+
+        # The rules that apply to the contents of each directory, its parents' first
+        self._rules = {
+            self.root: self._read(
+                os.path.join(self.root, ".git", "info", "exclude"), ""
+            )
+            + self._read(os.path.join(self.root, filename), "")
+        }
+
+        self._excluded_dirs = {}
+
+    def _read(self, path: str, base: str) -> list[_Rule]:
+        self.read_paths.add(path)
+
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as file:
+                return parse_gitignore(file.readlines(), base)
+        except OSError:
+            return []
+
+    def _relative(self, path: str) -> str or None:
+        relative_path = os.path.relpath(os.path.abspath(path), self.root)
+
+        if relative_path in (os.curdir, os.pardir) or relative_path.startswith(
+            os.pardir + os.sep
+        ):
+            return None
+
+        return relative_path.replace(os.sep, "/")
+
+    def _get_rules(self, dirpath: str) -> list[_Rule]:
+        if dirpath not in self._rules:
+            parent_rules = self._get_rules(os.path.dirname(dirpath))
+            base = self._relative(dirpath)
+
+            self._rules[dirpath] = parent_rules + self._read(
+                os.path.join(dirpath, self.filename), base
+            )
+
+        return self._rules[dirpath]
+
+    def match(self, path: str, is_dir: bool = False) -> bool:
+        """
+        Matches a path against the rules of its directory, without checking whether any of its parents are ignored,
+        as when walking down from the root and pruning ignored directories along the way
+        :param path: Path-like of a file or directory
+        :param is_dir: Whether the path is a directory, some rules only match directories
+        :return: Whether the path is ignored
+        """
+        path = os.path.abspath(path)
+        relative_path = self._relative(path)
+
+        if relative_path is None:
+            return False
+
+        # git never looks inside of its own directory
+        if os.path.basename(path) == ".git":
+            return True
+
+        # Later rules and rules of deeper directories take precedence
+        for rule in reversed(self._get_rules(os.path.dirname(path))):
+            if rule.dir_only and not is_dir:
+                continue
+
+            _path = relative_path
+            if rule.base:
+                _path = relative_path[len(rule.base) + 1 :]
+
+            if rule.regex.fullmatch(_path):
+                return not rule.negated
+
+        return False
+
+    def is_excluded(self, path: str, is_dir: bool = False) -> bool:
+        """
+        :param path: Path-like of a file or directory, which may not exist
+        :param is_dir: Whether the path is a directory
+        :return: Whether the path or any directory above it (up to the root) is ignored
+        """
+        path = os.path.abspath(path)
+        parent = os.path.dirname(path)
+
+        if self._relative(parent) is not None and self._is_excluded_dir(parent):
+            return True
+
+        return self.match(path, is_dir)
+
+    def _is_excluded_dir(self, dirpath: str) -> bool:
+        if dirpath not in self._excluded_dirs:
+            parent = os.path.dirname(dirpath)
+
+            self._excluded_dirs[dirpath] = (
+                self._relative(parent) is not None and self._is_excluded_dir(parent)
+            ) or self.match(dirpath, is_dir=True)
+
+        return self._excluded_dirs[dirpath]
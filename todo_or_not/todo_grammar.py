@@ -1,4 +1,7 @@
+import functools
+import os
 import re
+import string
 import sys
 
 import ply.lex as lex
@@ -6,10 +9,16 @@ import ply.yacc as yacc
 
 from todo_or_not.todo_hit import Hit
 
-C_LIKE = {"line_comment": "//", "block_comment": {"start": r"/\*", "end": r"\*/"}}
+C_LIKE = {"line_comment": "//", "block_comment": [{"start": "/*", "end": "*/"}]}
 
 comment_symbols = {
-    "python": {"line_comment": "#", "block_comment": {"start": "'''", "end": "'''"}},
+    "python": {
+        "line_comment": "#",
+        "block_comment": [
+            {"start": '"""', "end": '"""'},
+            {"start": "'''", "end": "'''"},
+        ],
+    },
     "java": C_LIKE,
     "javascript": C_LIKE,
     "c": C_LIKE,
@@ -17,8 +26,8 @@ comment_symbols = {
     "php": C_LIKE,
     "swift": C_LIKE,
     "ruby": {
-        "line_comment": "[#]",
-        "block_comment": {"start": "=begin", "end": "=end"},
+        "line_comment": "#",
+        "block_comment": [{"start": "=begin", "end": "=end"}],
     },
     "go": C_LIKE,
     "rust": C_LIKE,
@@ -26,10 +35,12 @@ comment_symbols = {
     "csharp": C_LIKE,
     "typescript": C_LIKE,
     "scala": C_LIKE,
-    "shell": {"line_comment": "[#]", "block_comment": {"start": ": '", "end": "'"}},
-    "pascal": {"line_comment": "//", "block_comment": {"start": "{", "end": "}"}},
-    "sql": {"line_comment": "--", "block_comment": {"start": "/*", "end": "*/"}},
-    "x_default": C_LIKE,
+    "shell": {"line_comment": "#", "block_comment": [{"start": ": '", "end": "'"}]},
+    "pascal": {"line_comment": "//", "block_comment": [{"start": "{", "end": "}"}]},
+    "sql": {"line_comment": "--", "block_comment": [{"start": "/*", "end": "*/"}]},
+    # Files of no known language are often prose (e.g. README.md) where a glob such as src/*.py would open a block
+    # comment that never closes, so they have none
+    "x_default": {"line_comment": "//", "block_comment": []},
 }
 
 file_extensions = {
@@ -60,6 +71,41 @@ file_extensions = {
 }
 
 
+# Files that are commonly named without a (meaningful) extension
+well_known_filenames = {
+    "Makefile": "shell",
+    "makefile": "shell",
+    "GNUmakefile": "shell",
+    "CMakeLists.txt": "shell",
+    "Dockerfile": "shell",
+    "Containerfile": "shell",
+    ".bashrc": "shell",
+    ".bash_profile": "shell",
+    ".profile": "shell",
+    ".zshrc": "shell",
+    "Rakefile": "ruby",
+    "Gemfile": "ruby",
+    "Vagrantfile": "ruby",
+    "Podfile": "ruby",
+    "SConstruct": "python",
+    "SConscript": "python",
+}
+
+# Interpreters named by a shebang, version suffixes (e.g. python3.11) are dropped before lookup
+shebang_interpreters = {
+    "sh": "shell",
+    "bash": "shell",
+    "zsh": "shell",
+    "ksh": "shell",
+    "dash": "shell",
+    "python": "python",
+    "ruby": "ruby",
+    "node": "javascript",
+    "nodejs": "javascript",
+    "php": "php",
+}
+
+
 def find_language(file_extension: str):
     try:
         return file_extensions[file_extension]
@@ -67,9 +113,119 @@ def find_language(file_extension: str):
         return "x_default"
 
 
+@functools.lru_cache(maxsize=1024)
+def _find_language_by_name(basename: str) -> str or None:
+    _split = basename.rsplit(".", 1)
+    if len(_split) > 1 and _split[1] in file_extensions:
+        return file_extensions[_split[1]]
+
+    return well_known_filenames.get(basename)
+
+
+@functools.lru_cache(maxsize=256)
+def _find_language_by_shebang(first_line: str) -> str or None:
+    _words = first_line[2:].split()
+
+    if len(_words) == 0:
+        return None
+
+    # e.g. "#!/usr/bin/env -S python3 -u" names its interpreter after env and its options
+    interpreter = os.path.basename(_words[0])
+    if interpreter == "env":
+        _words = [word for word in _words[1:] if not word.startswith("-")]
+        if len(_words) == 0:
+            return None
+        interpreter = os.path.basename(_words[0])
+
+    return shebang_interpreters.get(interpreter.rstrip("0123456789."))
+
+
+def resolve_language(filename: str, first_line: str = "") -> str:
+    """
+    Finds the language of a file by its extension, then by well-known filenames, then by its shebang
+    :param filename: Path-like string of the file
+    :param first_line: The first line of the file, which has already been read
+    :return: The language of the file, "x_default" if it could not be determined
+    """
+    language = _find_language_by_name(os.path.basename(filename))
+
+    if language is None and first_line.startswith("#!"):
+        language = _find_language_by_shebang(first_line)
+
+    return language if language is not None else "x_default"
+
+
+def parse_comment_body(
+    comment_up_to_key: str, rest_of_comment: str or None, language: str
+) -> dict:
+    """
+    Splits the comment portion of a triggering line into its keywords, structured title/body and labels
+    :param comment_up_to_key: The comment from its opening symbol up to and including the last keyword
+    :param rest_of_comment: Whatever follows the last keyword (leading whitespace removed), None if nothing
+    :param language: The language the comment was written in (e.g. "python")
+    :return: Dict containing the keywords, reconstructed body, labels, structured title and structured body
+    """
+    keywords = re.findall(r"(todo|fixme)", comment_up_to_key.lower())
+    body = (
+        f"{comment_up_to_key} {rest_of_comment}"
+        if rest_of_comment is not None
+        else comment_up_to_key
+    )
+
+    _structured = body.split("|", 1)
+
+    structured_title, structured_body = None, None
+    if len(_structured) > 1:
+        structured_title, structured_body = _structured
+        structured_title = structured_title.strip(
+            comment_symbols[language]["line_comment"]
+        ).strip()
+        structured_body = structured_body.strip()
+
+    _body = body if structured_title is None else structured_body
+    labels = re.findall(
+        r"(?<=#)(?![tT][oO][dD][oO]|[fF][iI][xX][mM][eE]\b)[^\s]+", _body
+    )
+    if len(labels) == 0:
+        unique_labels = None
+    else:
+        unique_labels = list(set(labels))
+
+    unique_keywords = list(set(keywords))
+
+    return {
+        "keywords": unique_keywords,
+        "body": body,
+        "labels": unique_labels,
+        "structured_title": structured_title,
+        "structured_body": structured_body,
+    }
+
+
+def build_hit(pre_todo_comment: str, comment_body: dict) -> Hit:
+    """
+    :param pre_todo_comment: Any code that came before the comment on the triggering line
+    :param comment_body: The output of parse_comment_body() for the comment on the triggering line
+    :return: A Hit with placeholder location, to be filled in by the caller
+    """
+    reconstructed_line = f"{pre_todo_comment}{comment_body['body']}"
+    hit = Hit("file", 1, comment_body["keywords"], [reconstructed_line], 0)
+
+    if comment_body["labels"] is not None:
+        hit.structured_labels = comment_body["labels"]
+    if comment_body["structured_title"] is not None:
+        hit.structured_title = comment_body["structured_title"]
+    if comment_body["structured_body"] is not None:
+        hit.structured_body = comment_body["structured_body"]
+
+    return hit
+
+
 class TodoGrammar:
-    def __init__(self, file_extension: str):
-        self.language = find_language(file_extension)
+    def __init__(self, file_extension: str, language: str = None):
+        self.language = (
+            language if language is not None else find_language(file_extension)
+        )
 
         # List of token names. This is always required
         self.tokens = ("CODE_BEFORE_COMMENT", "COMMENT_UP_TO_KEY", "REST_OF_COMMENT")
@@ -97,15 +253,7 @@ class TodoGrammar:
 
     def p_todo_line_with_code(self, p):
         """todo_line : pre_todo_comment todo_line_comment_body"""
-        reconstructed_line = f"{p[1]}{p[2]['body']}"
-        p[0] = Hit("file", 1, p[2]["keywords"], [reconstructed_line], 0)
-
-        if p[2]["labels"] is not None:
-            p[0].structured_labels = p[2]["labels"]
-        if p[2]["structured_title"] is not None:
-            p[0].structured_title = p[2]["structured_title"]
-        if p[2]["structured_body"] is not None:
-            p[0].structured_body = p[2]["structured_body"]
+        p[0] = build_hit(p[1], p[2])
 
     def p_pre_todo_comment(self, p):
         """pre_todo_comment : CODE_BEFORE_COMMENT"""
@@ -119,37 +267,7 @@ class TodoGrammar:
         """todo_line_comment_body   : COMMENT_UP_TO_KEY REST_OF_COMMENT
         | COMMENT_UP_TO_KEY"""
 
-        keywords = re.findall(r"(todo|fixme)", p[1].lower())
-        body = f"{p[1]} {p[2]}" if len(p) > 2 else p[1]
-
-        _structured = body.split("|", 1)
-
-        structured_title, structured_body = None, None
-        if len(_structured) > 1:
-            structured_title, structured_body = _structured
-            structured_title = structured_title.strip(
-                comment_symbols[self.language]["line_comment"]
-            ).strip()
-            structured_body = structured_body.strip()
-
-        _body = body if structured_title is None else structured_body
-        labels = re.findall(
-            r"(?<=#)(?![tT][oO][dD][oO]|[fF][iI][xX][mM][eE]\b)[^\s]+", _body
-        )
-        if len(labels) == 0:
-            unique_labels = None
-        else:
-            unique_labels = list(set(labels))
-
-        unique_keywords = list(set(keywords))
-
-        p[0] = {
-            "keywords": unique_keywords,
-            "body": body,
-            "labels": unique_labels,
-            "structured_title": structured_title,
-            "structured_body": structured_body,
-        }
+        p[0] = parse_comment_body(p[1], p[2] if len(p) > 2 else None, self.language)
 
     # Error rule for syntax errors
     def p_error(self, p):
@@ -165,7 +283,160 @@ class TodoGrammar:
     def safe_parse(self, _input: str):
         try:
             _input = _input.strip()
-            tmp = self.parser.parse(_input)
+            tmp = self.parser.parse(_input, lexer=self.lexer)
             return tmp
         except SyntaxError:
             return None
+
+
+# Maps A-Z to a-z without touching anything else, str.lower() may change the length of non-ASCII text
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def find_last_keyword_end(text: str, start: int = 0) -> int:
+    """
+    :param text: Text to search for keywords (case-insensitive)
+    :param start: Index from which a keyword may begin
+    :return: Index just past the last keyword that begins at or after start, -1 if there is none
+    """
+    _lowered = text.translate(_ASCII_LOWER)
+    key_index = max(_lowered.rfind("todo", start), _lowered.rfind("fixme", start))
+    if key_index < 0:
+        return -1
+
+    return key_index + (4 if _lowered.startswith("todo", key_index) else 5)
+
+
+class FastTodoGrammar:
+    """
+    Hand-written equivalent of TodoGrammar which splits a line with precompiled patterns and plain string
+    searches instead of an LALR parse. Every line is scanned a constant number of times, so the cost is linear
+    in its length. Accepts one line at a time, as read by readlines().
+    """
+
+    def __init__(self, file_extension: str, language: str = None):
+        self.language = (
+            language if language is not None else find_language(file_extension)
+        )
+        self.comment_start = None
+
+    def build(self, **kwargs):
+        # The line comment symbol is used as a character class by TodoGrammar, so any one of its characters
+        # opens a comment
+        self.comment_start = re.compile(
+            f'[{re.escape(comment_symbols[self.language]["line_comment"])}]'
+        )
+
+    def safe_parse(self, _input: str):
+        _input = _input.strip()
+
+        comment = self.comment_start.search(_input)
+        if comment is None:
+            return None
+        comment_index = comment.start()
+
+        # The comment runs up to the end of the LAST keyword found after the comment symbol
+        key_end = find_last_keyword_end(_input, comment_index + 1)
+        if key_end < 0:
+            return None
+
+        rest_of_comment = _input[key_end:].lstrip(" \t")
+
+        return build_hit(
+            _input[:comment_index],
+            parse_comment_body(
+                _input[comment_index:key_end],
+                rest_of_comment if len(rest_of_comment) > 0 else None,
+                self.language,
+            ),
+        )
+
+
+engines = {"ply": TodoGrammar, "fast": FastTodoGrammar}
+
+
+class BlockCommentTracker:
+    """
+    Follows a file's block comments as its lines are fed in order, so each line is only ever looked at once.
+    A block comment marker that comes after a line comment symbol is ignored.
+    """
+
+    def __init__(self, file_extension: str, language: str = None):
+        self.language = (
+            language if language is not None else find_language(file_extension)
+        )
+        self.line_comment = comment_symbols[self.language]["line_comment"]
+        self.markers = comment_symbols[self.language]["block_comment"]
+
+        # The end marker of the block comment the last line ended inside of, None if it ended outside of one
+        self.end = None
+
+    def feed(self, line: str) -> str or None:
+        """
+        Advances past the next line of the file
+        :param line: The next line of the file
+        :return: The text of this line that is inside of block comments, None if there is none
+        """
+        segments = []
+        position = 0
+
+        while True:
+            if self.end is not None:
+                end = line.find(self.end, position)
+
+                if end < 0:
+                    segments.append(line[position:])
+                    break
+
+                segments.append(line[position:end])
+                position = end + len(self.end)
+                self.end = None
+            else:
+                # The first of the markers of this language to open a block comment opens it
+                starts = [
+                    (line.find(marker["start"], position), marker)
+                    for marker in self.markers
+                ]
+                starts = [(start, marker) for start, marker in starts if start >= 0]
+
+                if len(starts) == 0:
+                    break
+
+                start, marker = min(starts, key=lambda found: found[0])
+
+                line_comment = line.find(self.line_comment, position)
+                if 0 <= line_comment < start:
+                    break
+
+                position = start + len(marker["start"])
+                self.end = marker["end"]
+
+        if len(segments) == 0:
+            return None
+
+        return " ".join(segment.strip() for segment in segments)
+
+
+def parse_block_comment(comment: str, language: str) -> Hit or None:
+    """
+    :param comment: Text from inside of a block comment, as returned by BlockCommentTracker.feed()
+    :param language: The language the comment was written in (e.g. "python")
+    :return: A Hit with placeholder location if the comment contains a keyword, None otherwise
+    """
+    # Drop the leading decoration of e.g. Javadoc continuation lines
+    comment = comment.strip().lstrip("*").lstrip()
+
+    key_end = find_last_keyword_end(comment)
+    if key_end < 0:
+        return None
+
+    rest_of_comment = comment[key_end:].lstrip(" \t")
+
+    return build_hit(
+        "",
+        parse_comment_body(
+            comment[:key_end],
+            rest_of_comment if len(rest_of_comment) > 0 else None,
+            language,
+        ),
+    )
@@ -0,0 +1,155 @@
+import os
+
+import todo_or_not.todo_git as todo_git
+import todo_or_not.utility as util
+from todo_or_not.todo_grammar import resolve_language
+
+
+class _BlobResult:
+    """What was found in one blob, kept instead of its hits so memory grows with distinct blobs only"""
+
+    __slots__ = ("number_of_todo", "number_of_fixme", "found")
+
+    def __init__(self, hits: list):
+        self.number_of_todo = sum(1 for hit in hits if "todo" in hit.found_keys)
+        self.number_of_fixme = sum(1 for hit in hits if "fixme" in hit.found_keys)
+
+        # Fingerprint, title and line number of each hit
+        self.found = [
+            (util.sha1_hash(hit.get_title()), hit.get_title().strip(), hit.source_line)
+            for hit in hits
+        ]
+
+
+class TodoHistory:
+    """
+    Counts of the TODOs and FIXMEs at each commit of a range, and the commit each one was first seen in # todoon
+    """
+
+    def __init__(self, scan_content, selected):
+        """
+        :param scan_content: Called with the path and the contents of a file, returns its hits and detected
+         encoding (see find_hits_in_content)
+        :param selected: Called with the path of a file, returns whether it should be scanned at all
+        """
+        self.scan_content = scan_content
+        self.selected = selected
+
+        # Each distinct blob is only ever read and parsed once, keyed by object ID and language
+        self.blob_results = {}
+
+        # The blob of each file at the commit being walked, and its totals
+        self.state = {}
+        self.number_of_todo = 0
+        self.number_of_fixme = 0
+
+        # (commit, number of TODOs, number of FIXMEs) for each commit walked # todoon
+        self.commits = []
+
+        # Fingerprint of each hit to the commit, file, line and title it was first seen with
+        self.first_seen = {}
+
+        self._selected = {}
+
+    def _is_selected(self, path: str) -> bool:
+        if path not in self._selected:
+            self._selected[path] = self.selected(path)
+
+        return self._selected[path]
+
+    def _get_result(self, path: str, oid: str, blobs: todo_git.CatFileBatch):
+        key = (oid, resolve_language(path))
+
+        if key not in self.blob_results:
+            contents = blobs.read(oid)
+            hits, _enc = (
+                self.scan_content(path, contents)
+                if contents is not None
+                else ([], None)
+            )
+            self.blob_results[key] = _BlobResult(hits)
+
+        return self.blob_results[key]
+
+    def apply(self, commit: str, changes: dict, blobs: todo_git.CatFileBatch):
+        """
+        Moves the state to a commit
+        :param commit: The commit the changes were made in
+        :param changes: Object IDs of the files that changed keyed by their path, None if deleted
+        :param blobs: Where to read new blobs from
+        """
+        for path, oid in changes.items():
+            if not self._is_selected(path):
+                continue
+
+            before = self.state.pop(path, None)
+            if before is not None:
+                self.number_of_todo -= before.number_of_todo
+                self.number_of_fixme -= before.number_of_fixme
+
+            if oid is None:
+                continue
+
+            after = self._get_result(path, oid, blobs)
+            self.state[path] = after
+            self.number_of_todo += after.number_of_todo
+            self.number_of_fixme += after.number_of_fixme
+
+            for fingerprint, title, line in after.found:
+                if fingerprint not in self.first_seen:
+                    self.first_seen[fingerprint] = (
+                        commit,
+                        os.path.relpath(path, os.getcwd()),
+                        line,
+                        title,
+                    )
+
+    def walk(self, revision_range: str):
+        """
+        Walks every commit of the range from oldest to newest, the files that were already in the parent of the
+        oldest commit are credited to that parent
+        :param revision_range: Commits to walk, e.g. "v1.0.0..main", or "HEAD" for all of history
+        """
+        with todo_git.CatFileBatch() as blobs:
+            for commit, changes in todo_git.list_first_parent_changes(revision_range):
+                if len(self.commits) == 0:
+                    base = todo_git.get_first_parent(commit)
+
+                    if base is not None:
+                        self.apply(
+                            base, todo_git.list_tree_blobs(base, full_tree=True), blobs
+                        )
+
+                self.apply(commit, changes, blobs)
+                self.commits.append((commit, self.number_of_todo, self.number_of_fixme))
+
+    def to_dict(self) -> dict:
+        return {
+            "commits": [
+                {"commit": commit, "todo": todo, "fixme": fixme}
+                for commit, todo, fixme in self.commits
+            ],
+            "first_seen": [
+                {
+                    "fingerprint": fingerprint,
+                    "commit": commit,
+                    "file": path,
+                    "line": line,
+                    "title": title,
+                }
+                for fingerprint, (commit, path, line, title) in self.first_seen.items()
+            ],
+        }
+
+    def __str__(self):
+        output = ""
+
+        for commit, todo, fixme in self.commits:
+            output += f"{commit[:12]}  {todo} TODO | {fixme} FIXME\n"
+
+        output += "\n"
+
+        for commit, path, line, title in self.first_seen.values():
+            output += f"{commit[:12]}  {path}:{line}  {title}\n"
+
+        return output
@@ -3,6 +3,7 @@ import subprocess
 import sys
 
 import todo_or_not.utility as util
+from todo_or_not.todo_settings import Settings
 
 
 class Hit:
@@ -66,6 +67,37 @@ class Hit:
 
         return a
 
+    def to_dict(self) -> dict:
+        return {
+            "found_keys": self.found_keys,
+            "source_file": self.source_file,
+            "source_line": self.source_line,
+            "pertinent_lines": self.pertinent_lines,
+            "trigger_line_index": self.trigger_line_index,
+            "structured_title": self.structured_title,
+            "structured_body": self.structured_body,
+            "structured_labels": self.structured_labels,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """
+        :param data: The output of to_dict()
+        :return: An identical Hit
+        """
+        hit = cls(
+            data["source_file"],
+            data["source_line"],
+            data["found_keys"],
+            data["pertinent_lines"],
+            data["trigger_line_index"],
+        )
+        hit.structured_title = data.get("structured_title")
+        hit.structured_body = data.get("structured_body")
+        hit.structured_labels = data.get("structured_labels")
+
+        return hit
+
     def get_triggering_line(self):
         return self.pertinent_lines[self.trigger_line_index]
 
@@ -116,16 +148,18 @@ class Hit:
         return f"{self.get_found_keys()} - {self.get_triggering_line()}"
 
     def generate_issue(
-        self, _test: bool = False, log_level=util.LOG_LEVEL_NORMAL
+        self,
+        settings: Settings,
+        _test: bool = False,
+        log_level=util.LOG_LEVEL_NORMAL,
     ) -> str or bool:
-
         repo_uri = f"https://github.com/None"
 
         github_ref = "$NONE"
         triggered_by = "$NONE"
         owner, repo = "$NONE", "$NONE"
 
-        if not (util.get_is_debug() or _test):
+        if not (settings.is_debug or _test):
             repo_uri = f"https://github.com/{os.environ.get('GITHUB_REPOSITORY')}"
 
             github_ref = os.environ.get("GITHUB_REF_NAME", "$NONE")
@@ -138,28 +172,28 @@ class Hit:
             if github_ref == "$NONE":
                 util.print_wrap(
                     log_level=log_level,
-                    msg=f"{util.LOCALIZE[util.get_region()]['error_no_env']}: GITHUB_REF_NAME",
+                    msg=f"{util.loc('error_no_env', settings.region)}: GITHUB_REF_NAME",
                     file=sys.stderr,
                 )
                 missing_envs.append("GITHUB_REF_NAME")
             if triggered_by == "$NONE":
                 util.print_wrap(
                     log_level=log_level,
-                    msg=f"{util.LOCALIZE[util.get_region()]['error_no_env']}: GITHUB_TRIGGERING_ACTOR",
+                    msg=f"{util.loc('error_no_env', settings.region)}: GITHUB_TRIGGERING_ACTOR",
                     file=sys.stderr,
                 )
                 missing_envs.append("GITHUB_TRIGGERING_ACTOR")
             if owner == "$NONE":
                 util.print_wrap(
                     log_level=log_level,
-                    msg=f"{util.LOCALIZE[util.get_region()]['error_no_env']}: GITHUB_REPOSITORY",
+                    msg=f"{util.loc('error_no_env', settings.region)}: GITHUB_REPOSITORY",
                     file=sys.stderr,
                 )
                 missing_envs.append("GITHUB_REPOSITORY")
             if repo == "$NONE":
                 util.print_wrap(
                     log_level=log_level,
-                    msg=f"{util.LOCALIZE[util.get_region()]['error_no_env']}: GITHUB_REPOSITORY",
+                    msg=f"{util.loc('error_no_env', settings.region)}: GITHUB_REPOSITORY",
                     file=sys.stderr,
                 )
                 missing_envs.append("GITHUB_REPOSITORY")
@@ -167,14 +201,15 @@ class Hit:
             if len(missing_envs) > 0:
                 return False
 
-        reference_file = self.source_file.split(":")[0]
+        # Hits inside of an archive link to the archive
+        reference_file = self.source_file.split(":")[0].split("!/")[0]
 
         reference_uri = f"{repo_uri}/blob/{github_ref}/{reference_file}"
 
         body = (
             f"## {self if self.structured_body is None else self.structured_body}\n\n"
             f"{self.get_pertinent_lines()}\n\n"
-            f"{util.LOCALIZE[util.get_region()]['issue_body_reference_link']}: <a href=\"{reference_uri}\">{self.source_file}</a>"
+            f"{util.loc('issue_body_reference_link', settings.region)}: <a href=\"{reference_uri}\">{self.source_file}</a>"
         )
 
         # Sanitize @ to prevent abuse
@@ -203,7 +238,7 @@ class Hit:
                 api_call.append("-f")
                 api_call.append(f"labels[]={label}")
 
-        if not (util.get_is_debug() or _test):
+        if not (settings.is_debug or _test):
             try:
                 _output = subprocess.check_output(api_call)
             except subprocess.CalledProcessError as e:
@@ -211,6 +246,6 @@ class Hit:
                 _output = False
         else:
             _output = True
-            util.print_wrap(log_level=log_level, msg=str(api_call))
+            util.print_wrap(log_level=log_level, msg=str(api_call), file=sys.stderr)
 
         return _output
@@ -0,0 +1,534 @@
+import fnmatch
+import os
+import posixpath
+
+from todo_or_not.localize import SUPPORTED_ENCODINGS_TODOIGNORE
+
+
+def _is_literal(name: str) -> bool:
+    return not any(c in name for c in "*?[")
+
+
+def _is_wildcard(name: str) -> bool:
+    # As the top level .todo-ignore has always been read, "?" and "[" only match as glob does alongside a "*" # todoon
+    return "*" in name
+
+
+def _literal_prefix(name: str) -> str:
+    """
+    :return: The directories at the start of a glob that contain no wildcards, e.g. "a/b" for "a/b/*.py"
+    """
+    parts = name.split("/")
+
+    for i, part in enumerate(parts):
+        if not _is_literal(part):
+            return "/".join(parts[:i])
+
+    return name
+
+
+def _glob_matches(pattern: str, path: str) -> bool:
+    """
+    :param pattern: A wildcard entry, separated by "/"
+    :param path: A path relative to the same directory, separated by "/"
+    :return: Whether glob.glob(pattern, recursive=True) would list the path, so a hidden name is never matched by a
+     wildcard that does not start with "."
+    """
+
+    def _match(parts, names):
+        if len(parts) == 0:
+            return len(names) == 0
+
+        if parts[0] == "**":
+            # Spans any number of directories, none of them hidden
+            return _match(parts[1:], names) or (
+                len(names) > 0
+                and not names[0].startswith(".")
+                and _match(parts, names[1:])
+            )
+
+        if len(names) == 0:
+            return False
+        if (
+            names[0].startswith(".")
+            and not _is_literal(parts[0])
+            and not parts[0].startswith(".")
+        ):
+            return False
+
+        return fnmatch.fnmatchcase(names[0], parts[0]) and _match(parts[1:], names[1:])
+
+    return _match(pattern.split("/"), path.split("/"))
+
+
+def find_matches(pattern: str) -> list[str]:
+    """
+    Lists what a wildcard entry of a .todo-ignore matches on disk, as TodoIgnoreMatcher matches it # todoon
+    :param pattern: Path-like of the wildcard, e.g. the directory of the .todo-ignore joined with the entry # todoon
+    :return: Path-likes of the files and directories it matches
+    """
+    pattern = pattern.replace(os.sep, "/")
+    prefix = _literal_prefix(pattern)
+    remainder = pattern[len(prefix) :].lstrip("/")
+    parts = remainder.split("/")
+
+    # Without ** nothing deeper than the wildcard has as many parts can match
+    depth = None if "**" in parts else len(parts)
+    # Hidden directories can only be matched by a part that starts with "."
+    hidden = any(part.startswith(".") for part in parts)
+
+    top = prefix if len(prefix) > 0 else "."
+    matches = []
+
+    for dirpath, dirnames, filenames in os.walk(top, topdown=True):
+        relative = os.path.relpath(dirpath, top)
+        names = [] if relative == "." else relative.split(os.sep)
+
+        for name in dirnames + filenames:
+            if _glob_matches(remainder, "/".join(names + [name])):
+                matches.append(os.path.join(dirpath, name))
+
+        if depth is not None and len(names) + 1 >= depth:
+            dirnames[:] = []
+        elif not hidden:
+            dirnames[:] = [name for name in dirnames if not name.startswith(".")]
+
+    return matches
+
+
+class TodoIgnoreMatcher:
+    """
+    The lines of one .todo-ignore, compiled to match paths relative to its directory without touching the disk. # todoon
+    Every .todo-ignore is matched alike: an entry without a "*" ignores a file, or a directory and everything # todoon
+    under it, while a wildcard ignores the files glob would list for it, but never what is under a directory
+    """
+
+    def __init__(self, todo_ignore_lines: list[str]):  # todoon
+        """
+        :param todo_ignore_lines: The lines of the .todo-ignore # todoon
+        """
+        self.names = []
+        self.patterns = []
+
+        for line in todo_ignore_lines:
+            name = line.rstrip("\r\n")
+
+            if name.startswith("#") or len(name) == 0:
+                continue
+
+            name = posixpath.normpath(name.replace(os.sep, "/"))
+
+            if _is_wildcard(name):
+                self.patterns.append(name)
+            else:
+                self.names.append(name)
+
+    def matches(self, path: str, is_dir: bool = False) -> bool:
+        """
+        :param path: A path relative to the directory of the .todo-ignore, separated by "/" # todoon
+        :param is_dir: Whether the path is a directory, which wildcards do not ignore
+        :return: Whether the path is ignored
+        """
+        for name in self.names:
+            # A file, or a directory and everything under it
+            if path == name or path.startswith(name + "/"):
+                return True
+
+        if is_dir:
+            return False
+
+        for pattern in self.patterns:
+            if _glob_matches(pattern, path):
+                return True
+
+        return False
+
+    def without(self, paths: list[str]) -> "TodoIgnoreMatcher":
+        """
+        :param paths: Paths of directories relative to the directory of the .todo-ignore, separated by "/" # todoon
+        :return: A copy without the entries that ignore any of the directories
+        """
+        matcher = TodoIgnoreMatcher([])
+        matcher.names = [
+            name
+            for name in self.names
+            if not any(path == name or path.startswith(name + "/") for path in paths)
+        ]
+        # Wildcards never ignore a directory
+        matcher.patterns = list(self.patterns)
+
+        return matcher
+
+
+def match_todo_ignore(todo_ignore_lines: list[str], paths) -> set[str]:  # todoon
+    """
+    Matches the lines of a .todo-ignore against paths that are not on disk, e.g. those of a git tree # todoon
+    :param todo_ignore_lines: The lines of the .todo-ignore # todoon
+    :param paths: Paths relative to the directory of the .todo-ignore, separated by "/" # todoon
+    :return: The paths that are ignored
+    """
+    matcher = TodoIgnoreMatcher(todo_ignore_lines)
+
+    return {path for path in paths if matcher.matches(path)}
+
+
+def match_nested_todo_ignore(
+    todo_ignores: dict[str, list[str]], paths
+) -> set[str]:  # todoon
+    """
+    Matches paths that are not on disk against every .todo-ignore above them, as NestedTodoIgnore does for a walk # todoon
+    :param todo_ignores: The lines of each .todo-ignore by its directory, separated by "/" and "" for the top level # todoon
+    :param paths: Paths relative to the top level, separated by "/"
+    :return: The paths that are ignored, including every .todo-ignore # todoon
+    """
+    matchers = {
+        directory: TodoIgnoreMatcher(lines) for directory, lines in todo_ignores.items()
+    }
+    ignored = set()
+
+    for path in paths:
+        parts = path.split("/")
+
+        if parts[-1] == ".todo-ignore":  # todoon
+            ignored.add(path)
+            continue
+
+        for i in range(len(parts)):
+            matcher = matchers.get("/".join(parts[:i]))
+
+            if matcher is not None and matcher.matches("/".join(parts[i:])):
+                ignored.add(path)
+                break
+
+    return ignored
+
+
+def read_todo_ignore_lines(todo_ignore_path: str) -> list[str] or None:  # todoon
+    """
+    :param todo_ignore_path: Path-like pointing to a .todo-ignore # todoon
+    :return: Its lines, None if it does not exist or is not in a supported encoding
+    """
+    try:
+        with open(todo_ignore_path, "rb") as file:
+            contents = file.read()
+    except OSError:
+        return None
+
+    for encoding in SUPPORTED_ENCODINGS_TODOIGNORE:
+        try:
+            return contents.decode(encoding).splitlines()
+        except UnicodeDecodeError:
+            continue
+
+    return None
+
+
+class NestedTodoIgnore:
+    """
+    The .todo-ignore files below the top level, each ignoring paths relative to its own directory and only within # todoon
+    it. One is compiled when a walk enters its directory and discarded once the walk leaves, so each path is only
+    matched against the files above it
+    """
+
+    def __init__(
+        self,
+        root: str,
+        filename: str = ".todo-ignore",  # todoon
+        read_root: bool = False,
+    ):
+        """
+        :param root: Path-like of the top level
+        :param filename: Name of the ignore file read in each directory
+        :param read_root: Whether to also read the ignore file of the top level, which is otherwise read separately
+        """
+        self.root = os.path.abspath(root)
+        self.filename = filename
+        self.read_root = read_root
+
+        # Every ignore file read so far, whether or not it existed
+        self.read_paths = set()
+
+        root_matcher = None
+        if read_root:
+            self.read_paths.add(os.path.join(self.root, filename))
+            lines = read_todo_ignore_lines(os.path.join(self.root, filename))
+            root_matcher = TodoIgnoreMatcher(lines) if lines is not None else None
+
+        # The directories from the root down to the one being walked, with their compiled ignore file (or None)
+        self._entered = [(self.root, root_matcher)]
+
+    def enter(self, dirpath: str):
+        """
+        Moves the walk to a directory, leaving the directories that are not above it
+        :param dirpath: Path-like of a directory under the root, e.g. the dirpath of each step of os.walk
+        """
+        dirpath = os.path.abspath(dirpath)
+
+        while len(self._entered) > 1 and not (
+            dirpath == self._entered[-1][0]
+            or dirpath.startswith(self._entered[-1][0] + os.sep)
+        ):
+            self._entered.pop()
+
+        current = self._entered[-1][0]
+        if dirpath == current or not dirpath.startswith(current + os.sep):
+            return
+
+        # Enter each directory in between, a walk of a sorted list of paths may skip over them
+        for name in os.path.relpath(dirpath, current).split(os.sep):
+            current = os.path.join(current, name)
+            self.read_paths.add(os.path.join(current, self.filename))
+            lines = read_todo_ignore_lines(os.path.join(current, self.filename))
+
+            self._entered.append(
+                (current, TodoIgnoreMatcher(lines) if lines is not None else None)
+            )
+
+    def exempt(self, dirpath: str):
+        """
+        Enters a directory named explicitly, so the entries that ignore it or a directory above it no longer apply,
+        while those ignoring what is under it still do
+        :param dirpath: Path-like of a directory under the root
+        """
+        dirpath = os.path.abspath(dirpath)
+        self.enter(dirpath)
+
+        for i, (entered, matcher) in enumerate(self._entered):
+            if matcher is None or entered == dirpath:
+                continue
+
+            parts = os.path.relpath(dirpath, entered).split(os.sep)
+            self._entered[i] = (
+                entered,
+                matcher.without(
+                    ["/".join(parts[:j]) for j in range(1, len(parts) + 1)]
+                ),
+            )
+
+    def is_ignored(self, path: str, is_dir: bool = False) -> bool:
+        """
+        :param path: Path-like of a file or directory in the directory last entered
+        :param is_dir: Whether the path is a directory
+        :return: Whether any of the .todo-ignore files above it ignore it # todoon
+        """
+        path = os.path.abspath(path)
+
+        # The files themselves are never scanned, like the top level one
+        if os.path.basename(path) == self.filename and (
+            self.read_root or os.path.dirname(path) != self.root
+        ):
+            return True
+
+        for dirpath, matcher in self._entered:
+            if matcher is not None and matcher.matches(
+                os.path.relpath(path, dirpath).replace(os.sep, "/"), is_dir=is_dir
+            ):
+                return True
+
+        return False
+
+    def is_excluded(self, path: str, is_dir: bool = False) -> bool:
+        """
+        Like is_ignored, but also checks every directory above the path, for paths that do not come from a walk
+        :param path: Path-like of a file or directory under the root, which may not exist
+        :param is_dir: Whether the path is a directory
+        :return: Whether the path or any directory above it is ignored
+        """
+        path = os.path.abspath(path)
+        self.enter(os.path.dirname(path))
+
+        if self.is_ignored(path, is_dir=is_dir):
+            return True
+
+        for dirpath, matcher in self._entered:
+            if matcher is None:
+                continue
+
+            parts = os.path.relpath(path, dirpath).split(os.sep)
+
+            # Every directory between this .todo-ignore and the path # todoon
+            for i in range(1, len(parts)):
+                if matcher.matches("/".join(parts[:i]), is_dir=True):
+                    return True
+
+        return False
+
+
+def _normalise_todo_ignore_line(line: str) -> str or None:  # todoon
+    # Only the line ending, as read_todo_ignore does, " a.py" and "a.py" are different entries # todoon
+    name = line.rstrip("\r\n")
+
+    if len(name) == 0:
+        return None
+    if name.startswith("#"):
+        return name
+
+    return posixpath.normpath(name.replace(os.sep, "/"))
+
+
+def _under_directory(name: str, directories: set[str]) -> bool:
+    parts = name.split("/")
+
+    return any("/".join(parts[:i]) in directories for i in range(1, len(parts)))
+
+
+def compact_todo_ignore(
+    todo_ignore_lines: list[str], root: str
+) -> tuple[list[str], dict[str, int]]:  # todoon
+    """
+    Rewrites the lines of a .todo-ignore so they ignore the same paths with as few entries as possible. Comments # todoon
+    are kept where they are, and entries are only ever removed or merged, never reordered
+    :param todo_ignore_lines: The lines of the .todo-ignore # todoon
+    :param root: Path-like of the directory of the .todo-ignore, whose contents decide what can safely be merged # todoon
+    :return:
+     | The compacted lines
+     | How many entries were removed as "duplicates", "subsumed" by a directory or wildcard, or "merged" into a
+      wildcard, adding up to how many fewer entries there are
+    """
+    removed = {"duplicates": 0, "subsumed": 0, "merged": 0}
+
+    # Normalised, e.g. "./a//b/" and "a/b" are the same entry
+    entries = []
+    seen = set()
+
+    for line in todo_ignore_lines:
+        name = _normalise_todo_ignore_line(line)
+
+        if name is None:
+            continue
+        elif name.startswith("#"):
+            entries.append(name)
+        elif name in seen:
+            removed["duplicates"] += 1
+        else:
+            seen.add(name)
+            entries.append(name)
+
+    # A directory ignores everything under it, whether listed literally or by a wildcard
+    directories = {
+        name for name in entries if not name.startswith("#") and not _is_wildcard(name)
+    }
+
+    def _is_subsumed(name):
+        if not _is_wildcard(name):
+            return _under_directory(name, directories)
+
+        prefix = _literal_prefix(name)
+        return prefix in directories or _under_directory(prefix, directories)
+
+    kept = []
+    for name in entries:
+        if not name.startswith("#") and _is_subsumed(name):
+            removed["subsumed"] += 1
+        else:
+            kept.append(name)
+
+    wildcards = [
+        name for name in kept if _is_wildcard(name) and not name.startswith("#")
+    ]
+
+    def _is_file(name):
+        return os.path.isfile(os.path.join(root, name))
+
+    # A wildcard never ignores what is under a directory, so only files are left to them
+    entries, kept = kept, []
+    for name in entries:
+        if (
+            not name.startswith("#")
+            and not _is_wildcard(name)
+            and _is_file(name)
+            and any(_glob_matches(wildcard, name) for wildcard in wildcards)
+        ):
+            removed["subsumed"] += 1
+        else:
+            kept.append(name)
+
+    # Files of a directory that share an extension become one wildcard, but only if it would match nothing else
+    groups = {}
+    for name in kept:
+        basename = posixpath.basename(name)
+
+        # The wildcard replacing them must not turn a "?" or "[" of their names into a wildcard too
+        if (
+            name.startswith("#")
+            or not _is_literal(name)
+            or basename.startswith(".")
+            or basename.find(".", 1) == -1
+            or not _is_file(name)
+        ):
+            continue
+
+        extension = basename[basename.find(".", 1) :]
+        groups.setdefault((posixpath.dirname(name), extension), []).append(name)
+
+    merged = {}
+    for (dirname, extension), names in groups.items():
+        if len(names) < 2:
+            continue
+
+        wildcard = posixpath.join(dirname, "*" + extension)
+
+        try:
+            children = os.listdir(os.path.join(root, dirname))
+        except OSError:
+            continue
+
+        matched = {
+            posixpath.join(dirname, child)
+            for child in children
+            if _glob_matches(wildcard, posixpath.join(dirname, child))
+        }
+
+        if matched == set(names):
+            for name in names:
+                merged[name] = wildcard
+
+    entries, kept = kept, []
+    for name in entries:
+        if name not in merged:
+            kept.append(name)
+            continue
+
+        # The wildcard takes the place of the first of its files, so each of the others is one entry fewer
+        if merged[name] in kept:
+            removed["merged"] += 1
+        else:
+            kept.append(merged[name])
+
+    return kept, removed
+
+
+def ignores_alike(
+    todo_ignore_lines: list[str], other_lines: list[str], root: str
+) -> bool:  # todoon
+    """
+    Walks a directory once to compare what two versions of its .todo-ignore ignore. A directory both ignore is # todoon
+    never walked, since everything under it is ignored by both
+    :param todo_ignore_lines: The lines of the .todo-ignore # todoon
+    :param other_lines: The lines of the other version
+    :param root: Path-like of the directory of the .todo-ignore # todoon
+    :return: Whether the same paths are ignored by both
+    """
+    matcher = TodoIgnoreMatcher(todo_ignore_lines)
+    other = TodoIgnoreMatcher(other_lines)
+
+    for dirpath, dirnames, filenames in os.walk(root, topdown=True):
+        relative = os.path.relpath(dirpath, root).replace(os.sep, "/")
+        prefix = "" if relative == "." else relative + "/"
+
+        for name in filenames:
+            if matcher.matches(prefix + name) != other.matches(prefix + name):
+                return False
+
+        _kept = []
+        for name in dirnames:
+            ignored = matcher.matches(prefix + name, is_dir=True)
+
+            if ignored != other.matches(prefix + name, is_dir=True):
+                return False
+            if not ignored:
+                _kept.append(name)
+
+        dirnames[:] = _kept
+
+    return True
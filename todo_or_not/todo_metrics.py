@@ -0,0 +1,260 @@
+import bisect
+import json
+import time
+
+import todo_or_not.utility as util
+
+METRICS_FORMATS = ["prometheus", "json"]
+
+# Seconds, from a small file read from the page cache to a slow call to the GitHub API
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Attribute of TodoRun, metric name and help of each count exported. They are gauges, as each run counts from zero
+GAUGES = [
+    (
+        "number_of_files_scanned",
+        "todoon_files_scanned",
+        "Files todoon attempted to read, regardless of errors",
+    ),
+    (
+        "number_of_encoding_failures",
+        "todoon_encoding_failures",
+        "Files unread due to an unsupported encoding",
+    ),
+    ("number_of_hits", "todoon_hits", "Hits found"),
+    ("number_of_todo", "todoon_todos", "Hits found with a TODO"),  # todoon
+    ("number_of_fixme", "todoon_fixmes", "Hits found with a FIXME"),  # todoon
+    ("number_of_issues", "todoon_issues_generated", "Issues created"),
+    (
+        "number_of_duplicate_issues_avoided",
+        "todoon_duplicate_issues_avoided",
+        "Hits not made into issues because an open issue already has their title",
+    ),
+    (
+        "number_of_closed_issues",
+        "todoon_duplicate_closed_issues",
+        "Hits with the title of a closed issue",
+    ),
+]
+
+
+class Histogram:
+    """Counts observations into buckets, as a Prometheus histogram does"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        :param buckets: The upper bound of each bucket, ascending, +Inf is always added
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        # Buckets are inclusive of their upper bound
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def get_cumulative_counts(self) -> list[tuple[str, int]]:
+        """
+        :return: The upper bound of each bucket (e.g. "0.5" or "+Inf") and the observations less than or equal to it
+        """
+        cumulative = []
+        total = 0
+
+        for bound, count in zip(
+            [repr(float(bucket)) for bucket in self.buckets] + ["+Inf"], self.counts
+        ):
+            total += count
+            cumulative.append((bound, total))
+
+        return cumulative
+
+    def to_dict(self) -> dict:
+        return {
+            "buckets": dict(self.get_cumulative_counts()),
+            "sum": self.sum,
+            "count": self.count,
+        }
+
+
+class Timer:
+    """Observes the seconds spent inside of a with block"""
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.histogram.observe(time.perf_counter() - self._start)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict) -> str:
+    if len(labels) == 0:
+        return ""
+
+    return (
+        "{"
+        + ",".join(
+            f'{name}="{_escape_label(str(value))}"' for name, value in labels.items()
+        )
+        + "}"
+    )
+
+
+def get_histograms(this_run) -> list[tuple[str, str, dict, Histogram]]:
+    """
+    :param this_run: The TodoRun the histograms were observed in
+    :return: The metric name, help, labels and histogram of each histogram exported
+    """
+    histograms = [
+        (
+            "todoon_file_scan_duration_seconds",
+            "Seconds spent finding the hits of each file",
+            {},
+            this_run.file_scan_latency,
+        )
+    ]
+
+    for call, histogram in this_run.api_latency.items():
+        histograms.append(
+            (
+                "todoon_api_request_duration_seconds",
+                "Seconds spent on each call to the GitHub API",
+                {"call": call},
+                histogram,
+            )
+        )
+
+    return histograms
+
+
+def format_prometheus(this_run, labels: dict = None) -> str:
+    """
+    :param this_run: A finished TodoRun
+    :param labels: Added to every metric, e.g. {"repository": "owner/repository"}
+    :return: The metrics of the run in the Prometheus text exposition format, as read by the textfile collector
+    """
+    labels = labels or {}
+    lines = []
+
+    for attribute, name, _help in GAUGES:
+        lines.append(f"# HELP {name} {_help}")
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name}{_format_labels(labels)} {getattr(this_run, attribute)}")
+
+    lines.append("# HELP todoon_run_duration_seconds Seconds the run took")
+    lines.append("# TYPE todoon_run_duration_seconds gauge")
+    lines.append(
+        f"todoon_run_duration_seconds{_format_labels(labels)} {this_run.get_duration()}"
+    )
+
+    lines.append(
+        "# HELP todoon_last_run_timestamp_seconds When the run finished, in seconds since the epoch"
+    )
+    lines.append("# TYPE todoon_last_run_timestamp_seconds gauge")
+    lines.append(
+        f"todoon_last_run_timestamp_seconds{_format_labels(labels)} {time.time()}"
+    )
+
+    # Every series of a metric is written under one HELP and TYPE
+    written = set()
+    for name, _help, series_labels, histogram in get_histograms(this_run):
+        if name not in written:
+            lines.append(f"# HELP {name} {_help}")
+            lines.append(f"# TYPE {name} histogram")
+            written.add(name)
+
+        series_labels = {**labels, **series_labels}
+
+        for bound, count in histogram.get_cumulative_counts():
+            lines.append(
+                f"{name}_bucket{_format_labels({**series_labels, 'le': bound})} {count}"
+            )
+        lines.append(f"{name}_sum{_format_labels(series_labels)} {histogram.sum}")
+        lines.append(f"{name}_count{_format_labels(series_labels)} {histogram.count}")
+
+    return "\n".join(lines) + "\n"
+
+
+def format_json(this_run, labels: dict = None) -> str:
+    """
+    :param this_run: A finished TodoRun
+    :param labels: Describe the run, e.g. {"repository": "owner/repository"}
+    :return: The metrics of the run as a JSON object
+    """
+    histograms = {}
+    for name, _, series_labels, histogram in get_histograms(this_run):
+        histograms.setdefault(name, []).append(
+            {"labels": series_labels, **histogram.to_dict()}
+        )
+
+    return json.dumps(
+        {
+            "labels": labels or {},
+            "gauges": {
+                name: getattr(this_run, attribute) for attribute, name, _ in GAUGES
+            },
+            "run_duration_seconds": this_run.get_duration(),
+            "timestamp": time.time(),
+            "histograms": histograms,
+        },
+        indent=2,
+    )
+
+
+def get_metrics_format(path: str, metrics_format: str = None) -> str:
+    """
+    :param path: Path-like the metrics are written to
+    :param metrics_format: One of METRICS_FORMATS, if None it is "json" for a .json path and "prometheus" otherwise
+    :return: One of METRICS_FORMATS
+    :raises ValueError: If the format is not one of METRICS_FORMATS
+    """
+    if metrics_format is None:
+        return "json" if path.lower().endswith(".json") else "prometheus"
+
+    if metrics_format not in METRICS_FORMATS:
+        raise ValueError(metrics_format)
+
+    return metrics_format
+
+
+def write_metrics(path: str, this_run, metrics_format: str, labels: dict = None):
+    """
+    Writes the metrics of a run atomically, so a collector never reads half of them
+    :param path: Path-like of the file written, e.g. a .prom file in the directory of the textfile collector
+    :param this_run: A finished TodoRun
+    :param metrics_format: One of METRICS_FORMATS
+    :param labels: Added to every metric, e.g. {"repository": "owner/repository"}
+    :raises OSError: If the file can not be written
+    """
+    if metrics_format == "json":
+        contents = format_json(this_run, labels)
+    else:
+        contents = format_prometheus(this_run, labels)
+
+    util.write_atomically(path, contents.encode("utf-8"))
@@ -0,0 +1,216 @@
+import json
+import sys
+import time
+
+import todo_or_not
+import todo_or_not.utility as util
+from todo_or_not.todo_hit import Hit
+
+OUTPUT_FORMATS = ["text", "jsonl", "sarif"]
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+# FIXMEs are something that is broken, TODOs only something that is missing
+SARIF_LEVELS = {"fixme": "warning", "todo": "note"}
+
+
+def hit_to_record(hit: Hit, with_context: bool = False) -> dict:
+    """
+    :param hit: A hit found by todoon
+    :param with_context: Whether to include the lines around the hit
+    :return: The hit as JSON-serializable data for other tools
+    """
+    record = {
+        "file": hit.source_file.replace("\\", "/"),
+        "line": hit.source_line,
+        "keywords": hit.found_keys,
+        "text": hit.get_triggering_line().strip(),
+        "title": hit.get_title().strip(),
+        "body": hit.structured_body,
+        "labels": hit.structured_labels or [],
+    }
+
+    if with_context:
+        record["context"] = {
+            "start_line": hit.source_line - hit.trigger_line_index,
+            "lines": hit.pertinent_lines,
+        }
+
+    return record
+
+
+class _BatchedWriter:
+    """Writes serialized hits to a stream a batch at a time, at least every flush_interval seconds"""
+
+    def __init__(self, stream, batch_size: int = 64, flush_interval: float = 0.5):
+        """
+        :param stream: A text stream, e.g. sys.stdout
+        :param batch_size: Hits written at once
+        :param flush_interval: The most seconds a hit waits to be written, as long as more hits are found
+        """
+        self.stream = stream
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.number_written = 0
+        self._pending = []
+        self._last_flush = time.monotonic()
+
+    def _append(self, text: str):
+        self._pending.append(text)
+
+        if (
+            len(self._pending) >= self.batch_size
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        if len(self._pending) > 0:
+            self.stream.write("".join(self._pending))
+            self._pending = []
+
+        self.stream.flush()
+        self._last_flush = time.monotonic()
+
+
+class TextWriter:
+    """Prints each hit as a line of text, as todoon always has"""
+
+    def __init__(self, log_level=util.LOG_LEVEL_NORMAL, stream=None):
+        """
+        :param log_level: The importance of any feedback prints (e.g. 0=NONE, 3=VERBOSE)
+        :param stream: Where the lines are printed, stderr if not given
+        """
+        self.log_level = log_level
+        self.stream = stream
+        self.number_written = 0
+
+    def write(self, hit: Hit):
+        # Only made into text if it will be printed
+        util.print_wrap(
+            log_level=self.log_level,
+            msg=hit,
+            file=self.stream if self.stream is not None else sys.stderr,
+        )
+        self.number_written += 1
+
+    def close(self):
+        pass
+
+
+class JsonLinesWriter(_BatchedWriter):
+    """Writes each hit as a JSON object on its own line"""
+
+    def __init__(self, stream, with_context: bool = False, **kwargs):
+        """
+        :param stream: A text stream, e.g. sys.stdout
+        :param with_context: Whether to include the lines around each hit
+        """
+        super().__init__(stream, **kwargs)
+        self.with_context = with_context
+
+    def write(self, hit: Hit):
+        self._append(json.dumps(hit_to_record(hit, self.with_context)) + "\n")
+        self.number_written += 1
+
+    def close(self):
+        self.flush()
+
+
+class SarifWriter(_BatchedWriter):
+    """
+    Writes a SARIF log with a result per hit, e.g. for GitHub code scanning. The document is written as hits are
+    found, only closed once the scan is done
+    """
+
+    def __init__(self, stream, with_context: bool = False, **kwargs):
+        """
+        :param stream: A text stream, e.g. sys.stdout
+        :param with_context: Whether to include the lines around each hit
+        """
+        super().__init__(stream, **kwargs)
+        self.with_context = with_context
+
+        driver = {
+            "name": "todo-or-not",
+            "version": todo_or_not.__version__,
+            "informationUri": "https://github.com/Start-Out/todo-or-not",
+            "rules": [
+                {"id": key, "shortDescription": {"text": key.upper()}}
+                for key in SARIF_LEVELS.keys()
+            ],
+        }
+
+        # Everything up to the first result, the rest is closed in close()
+        header = json.dumps(
+            {
+                "$schema": SARIF_SCHEMA,
+                "version": "2.1.0",
+                "runs": [{"tool": {"driver": driver}, "results": []}],
+            }
+        )
+        self._append(header[: -len("]}]}")])
+
+    def write(self, hit: Hit):
+        record = hit_to_record(hit, self.with_context)
+        keyword = "fixme" if "fixme" in hit.found_keys else "todo"
+
+        region = {"startLine": record["line"], "snippet": {"text": record["text"]}}
+        location = {
+            "physicalLocation": {
+                "artifactLocation": {"uri": record["file"]},
+                "region": region,
+            }
+        }
+
+        if self.with_context:
+            location["physicalLocation"]["contextRegion"] = {
+                "startLine": record["context"]["start_line"],
+                "snippet": {"text": "".join(record["context"]["lines"])},
+            }
+
+        result = {
+            "ruleId": keyword,
+            "level": SARIF_LEVELS[keyword],
+            "message": {"text": record["title"]},
+            "locations": [location],
+            "properties": {
+                "keywords": record["keywords"],
+                "body": record["body"],
+                "labels": record["labels"],
+            },
+        }
+
+        self._append(("," if self.number_written > 0 else "") + json.dumps(result))
+        self.number_written += 1
+
+    def close(self):
+        self._append("]}]}\n")
+        self.flush()
+
+
+def create_writer(
+    output_format: str,
+    stream=None,
+    with_context: bool = False,
+    log_level=util.LOG_LEVEL_NORMAL,
+):
+    """
+    :param output_format: One of OUTPUT_FORMATS
+    :param stream: Where hits are written, stdout for jsonl and sarif and stderr for text if not given
+    :param with_context: Whether to include the lines around each hit, text never does
+    :param log_level: The importance of any feedback prints, only text follows it
+    :return: A TextWriter, JsonLinesWriter or SarifWriter, each with write(hit) and close()
+    :raises ValueError: If the format is not one of OUTPUT_FORMATS
+    """
+    if output_format == "text":
+        return TextWriter(log_level, stream)
+    elif output_format == "jsonl":
+        return JsonLinesWriter(
+            stream if stream is not None else sys.stdout, with_context
+        )
+    elif output_format == "sarif":
+        return SarifWriter(stream if stream is not None else sys.stdout, with_context)
+
+    raise ValueError(output_format)
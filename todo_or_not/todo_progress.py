@@ -0,0 +1,169 @@
+import json
+import os
+import time
+
+import todo_or_not.utility as util
+
+
+def get_weight(path: str) -> int:
+    """
+    :param path: Path-like of a file to be scanned
+    :return: How much of the scan it is, its size in bytes but never less than 1 so that empty files (or blobs that
+     are not on disk) still count
+    """
+    try:
+        return max(os.path.getsize(path), 1)
+    except OSError:
+        return 1
+
+
+class ProgressReporter:
+    """
+    Tracks how much of a scan is done by the bytes scanned rather than the number of files, so one large file does
+    not leave the progress at 99%. Progress is only published (to TODOON_PROGRESS, a status file and a progress bar)
+    up to rate times per second, however many files are scanned
+    """
+
+    def __init__(
+        self,
+        total_bytes: int = None,
+        total_files: int = None,
+        rate: float = 4.0,
+        status_file: str = None,
+        bar=None,
+        file_unit: str = "file",
+        clock=time.monotonic,
+    ):
+        """
+        :param total_bytes: The sum of the weights of every file to be scanned, None if not known (e.g. streamed
+         targets), in which case there is no progress or ETA but still a throughput
+        :param total_files: The number of files to be scanned, None if not known
+        :param rate: The most times per second progress is published, 0 to only publish when asked
+        :param status_file: If given, the progress is written here as JSON each time it is published
+        :param bar: If given, a tqdm bar counting bytes that is updated each time progress is published
+        :param file_unit: Shown beside the number of files scanned on the bar
+        :param clock: Seconds from an arbitrary point, only ever increasing
+        """
+        self.total_bytes = total_bytes
+        self.total_files = total_files
+        self.interval = 1 / rate if rate > 0 else None
+        self.status_file = status_file
+        self.bar = bar
+        self.file_unit = file_unit
+        self.clock = clock
+
+        self.bytes_scanned = 0
+        self.files_scanned = 0
+        self.number_published = 0
+
+        # The first error writing the status file, it is not written again after one
+        self.status_file_error = None
+
+        self._start = clock()
+        self._last_publish = None
+
+    def advance(self, weight: int):
+        """
+        :param weight: The weight of the file just scanned, see get_weight
+        """
+        self.bytes_scanned += weight
+        self.files_scanned += 1
+
+        if self.interval is not None and (
+            self._last_publish is None
+            or self.clock() - self._last_publish >= self.interval
+        ):
+            self.publish()
+
+    def get_progress(self) -> float or None:
+        """
+        :return: Percent of the bytes scanned, None if the total is not known
+        """
+        if self.total_bytes is None:
+            return None
+        if self.total_bytes <= 0:
+            return 100.0
+
+        return min(100.0, 100.0 * self.bytes_scanned / self.total_bytes)
+
+    def get_throughput(self) -> float:
+        """
+        :return: Bytes scanned per second so far
+        """
+        elapsed = self.clock() - self._start
+
+        return self.bytes_scanned / elapsed if elapsed > 0 else 0.0
+
+    def get_eta(self) -> float or None:
+        """
+        :return: Seconds until every byte is scanned at the throughput so far, None if that can not be known yet
+        """
+        throughput = self.get_throughput()
+
+        if self.total_bytes is None or throughput <= 0:
+            return None
+
+        return max(0.0, (self.total_bytes - self.bytes_scanned) / throughput)
+
+    def get_status(self, status: str) -> dict:
+        """
+        :param status: What todoon is doing, as in TODOON_STATUS
+        :return: Everything published to the status file
+        """
+        progress = self.get_progress()
+        eta = self.get_eta()
+
+        return {
+            "status": status,
+            "progress": round(progress, 1) if progress is not None else None,
+            "files_scanned": self.files_scanned,
+            "files_total": self.total_files,
+            "bytes_scanned": self.bytes_scanned,
+            "bytes_total": self.total_bytes,
+            "bytes_per_second": round(self.get_throughput(), 1),
+            "eta_seconds": round(eta, 1) if eta is not None else None,
+            "elapsed_seconds": round(self.clock() - self._start, 1),
+        }
+
+    def publish(self, status: str = "scanning-files"):
+        """
+        Publishes the progress now, however recently it was last published
+        :param status: What todoon is doing, as in TODOON_STATUS
+        """
+        self._last_publish = self.clock()
+        self.number_published += 1
+
+        progress = self.get_progress()
+        if progress is not None:
+            # Percent, as the final "100.0" always was
+            os.environ["TODOON_PROGRESS"] = str(round(progress, 1))
+
+        if self.bar is not None:
+            self.bar.update(self.bytes_scanned - self.bar.n)
+            self.bar.set_postfix_str(
+                f"{self.files_scanned} {self.file_unit}", refresh=False
+            )
+
+        if self.status_file is not None:
+            try:
+                util.write_atomically(
+                    self.status_file,
+                    json.dumps(self.get_status(status)).encode("utf-8"),
+                )
+            except OSError as e:
+                self.status_file_error = e
+                self.status_file = None
+
+    def finish(self, status: str = "finished"):
+        """
+        Publishes the progress a last time, with everything scanned
+        :param status: What todoon is doing, as in TODOON_STATUS
+        """
+        if self.total_bytes is None:
+            self.total_bytes = self.bytes_scanned
+            self.total_files = self.files_scanned
+
+        self.publish(status)
+
+        if self.bar is not None:
+            self.bar.close()
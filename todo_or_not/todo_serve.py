@@ -0,0 +1,244 @@
+import json
+import os
+import socket
+import socketserver
+import sys
+
+import todo_or_not.utility as util
+from todo_or_not.todo_app import TodoRun
+from todo_or_not.todo_settings import Settings
+from todo_or_not.todo_watch import HitIndex
+from todo_or_not.utility import loc
+
+
+def _stat_key(path: str) -> tuple[int, int] or None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    return stat.st_mtime_ns, stat.st_size
+
+
+class TodoDaemon:
+    """
+    Scanning state kept between requests: the hits of every file along with the size and modification time they
+    were found at, and the compiled .todo-ignore, which is compiled again whenever it or any other ignore file it # todoon
+    read changes
+    """
+
+    def __init__(
+        self,
+        scan,
+        load_paths,
+        todo_ignore_path: str,
+        run_options: dict,
+        settings: Settings,
+    ):
+        """
+        :param scan: Called with the path of a file, returns its hits and detected encoding (see find_hits)
+        :param load_paths: Called without arguments, compiles the .todo-ignore into WatchedPaths # todoon
+        :param todo_ignore_path: Path-like pointing to the .todo-ignore, watched for changes # todoon
+        :param run_options: The options the daemon was started with, used to summarize each request
+        :param settings: Settings resolved for this daemon
+        """
+        self.scan = scan
+        self.load_paths = load_paths
+        self.todo_ignore_path = todo_ignore_path
+        self.run_options = run_options
+        self.settings = settings
+
+        self.paths = None
+        self.index = None
+
+        # The stat of the .todo-ignore and of the .gitignore and nested .todo-ignore files read while walking # todoon
+        self._ignore_stats = {}
+        self._scanned_stats = {}
+
+    def _get_ignore_stats(self) -> dict:
+        paths = {self.todo_ignore_path}
+        if self.paths is not None:
+            paths.update(self.paths.get_ignore_files())
+
+        return {path: _stat_key(path) for path in paths}
+
+    def refresh_ignore(self):
+        """
+        Compiles the .todo-ignore again and forgets every hit if it or any other ignore file read since changed, # todoon
+        was created or was removed
+        """
+        if self.paths is None or any(
+            _stat_key(path) != stat for path, stat in self._ignore_stats.items()
+        ):
+            self.paths = self.load_paths()
+            self.index = HitIndex(self.scan)
+            self._scanned_stats = {}
+            self._ignore_stats = self._get_ignore_stats()
+
+    def scan_files(self, files: list[str] = None) -> list[str]:
+        """
+        Scans files, only reading those that changed since they were last scanned
+        :param files: Path-likes of the files to scan, every file not ignored is scanned if not given
+        :return: Paths of the files that were scanned
+        """
+        self.refresh_ignore()
+
+        if files is None or len(files) == 0:
+            targets = list(self.paths.walk())
+
+            # Files that were deleted since the last scan of the whole tree
+            for path in set(self.index.hits.keys()) - set(targets):
+                self.index.update(path)
+                self._scanned_stats.pop(path, None)
+        else:
+            targets = [os.path.abspath(file) for file in files]
+
+        for target in targets:
+            stat = _stat_key(target)
+
+            if stat is None or stat != self._scanned_stats.get(target):
+                self.index.update(target)
+
+                if stat is None:
+                    self._scanned_stats.pop(target, None)
+                else:
+                    self._scanned_stats[target] = stat
+
+        # Walking reads the ignore files of the directories it enters for the first time
+        for path, stat in self._get_ignore_stats().items():
+            self._ignore_stats.setdefault(path, stat)
+
+        return targets
+
+    def handle(self, request: dict) -> dict:
+        """
+        Answers a single request
+        :param request:
+         | {"command": "scan", "files": [...], "silent": bool} rescans the files (or the whole tree) first
+         | {"command": "query", "files": [...], "silent": bool} answers from the hits already found
+         | {"command": "shutdown"} stops the daemon
+        :return: The hits found, a summary and the exit code todoon would have exited with
+        """
+        command = request.get("command", "scan")
+        files = request.get("files")
+
+        if command == "shutdown":
+            return {"stopping": True}
+        elif command == "scan":
+            targets = self.scan_files(files)
+        elif command == "query":
+            self.refresh_ignore()
+            targets = (
+                [os.path.abspath(file) for file in files]
+                if files
+                else list(self.index.hits.keys())
+            )
+        else:
+            return {
+                "error": f"{loc('error_unknown_command', self.settings.region)}: {command}"
+            }
+
+        run_options = dict(self.run_options)
+        run_options["silent"] = bool(request.get("silent", run_options["silent"]))
+
+        this_run = TodoRun(run_options, self.settings)
+        self.index.fill_run(this_run, targets)
+
+        hits = [
+            str(hit) for target in targets for hit in self.index.hits.get(target, [])
+        ]
+
+        return {
+            "hits": hits,
+            "summary": this_run.generate_summary_message(),
+            "exit_code": (
+                1 if this_run.number_of_hits > 0 and not this_run.silent else 0
+            ),
+        }
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        # One JSON request per line, a client may send several over one connection
+        for line in self.rfile:
+            region = self.server.daemon.settings.region
+
+            try:
+                request = json.loads(line)
+            except ValueError:
+                request = None
+
+            if not isinstance(request, dict):
+                response = {"error": loc("error_malformed_request", region)}
+            else:
+                # A request the daemon can not answer must not end the connection or the daemon
+                try:
+                    response = self.server.daemon.handle(request)
+                except Exception as e:
+                    response = {"error": f"{loc('error_request_failed', region)}: {e}"}
+
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+            if response.get("stopping"):
+                self.server.stopping = True
+                return
+
+
+class _DaemonServer(socketserver.UnixStreamServer):
+    def __init__(self, socket_path: str, daemon: TodoDaemon):
+        self.daemon = daemon
+        self.stopping = False
+
+        super().__init__(socket_path, _RequestHandler)
+
+
+def serve(socket_path: str, daemon: TodoDaemon, log_level=util.LOG_LEVEL_NORMAL):
+    """
+    Answers requests on a Unix socket until interrupted or asked to shut down, one request at a time
+    :param socket_path: Path-like of the socket to create
+    :param daemon: The daemon answering each request
+    :param log_level: The importance of any feedback prints (e.g. 0=NONE, 3=VERBOSE)
+    """
+    if os.path.exists(socket_path):
+        # Only take over the socket of a daemon that is no longer running
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as _probe:
+                _probe.connect(socket_path)
+        except OSError:
+            os.remove(socket_path)
+        else:
+            util.print_wrap(
+                log_level=log_level,
+                msg=f"{loc('error_daemon_already_running', daemon.settings.region)}: {socket_path}",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+
+    # Scan everything up front so the first request is as fast as the rest
+    daemon.scan_files()
+
+    # The socket is created only readable and writable by its owner, there is no moment anyone else can connect
+    previous_umask = os.umask(0o177)
+    try:
+        server = _DaemonServer(socket_path, daemon)
+    finally:
+        os.umask(previous_umask)
+
+    os.environ["TODOON_STATUS"] = "serving"
+    util.print_wrap(
+        log_level=log_level,
+        msg=f"{loc('info_daemon_started', daemon.settings.region)}: {socket_path}",
+        file=sys.stderr,
+    )
+    util.flush_output()
+
+    try:
+        while not server.stopping:
+            server.handle_request()
+            util.flush_output()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.remove(socket_path)
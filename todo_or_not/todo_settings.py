@@ -0,0 +1,150 @@
+import dataclasses
+import os
+import sys
+import tomllib
+
+import todo_or_not.utility as util
+from todo_or_not.localize import LOCALIZE
+
+
+@dataclasses.dataclass(frozen=True)
+class Settings:
+    """
+    Settings for a run of todoon, resolved once at startup so nothing on a hot path has to read the environment.
+    Later sources override earlier ones: defaults, [tool.todoon] in pyproject.toml, environment variables, then
+    command line options.
+    """
+
+    region: str = "en_us"
+    operating_system: str = "default"
+    is_debug: bool = False
+    max_issues: int = 8
+    pertinent_line_limit: int = 8
+    engine: str = "ply"
+    block_comments: bool = False
+
+    @classmethod
+    def resolve(
+        cls,
+        cli_options: dict = None,
+        pyproject_path: str = None,
+        log_level=util.LOG_LEVEL_NORMAL,
+    ) -> "Settings":
+        """
+        :param cli_options: Settings given on the command line, keyed by field name, None values are ignored
+        :param pyproject_path: Path-like pointing to the pyproject.toml to read, defaults to the one in the CWD
+        :param log_level: The importance of any feedback prints (e.g. 0=NONE, 3=VERBOSE)
+        :return: The resolved settings
+        """
+        if pyproject_path is None:
+            pyproject_path = os.path.join(os.getcwd(), "pyproject.toml")
+
+        resolved = {}
+
+        # Reported once the region they are reported in is resolved
+        warnings = []
+
+        # [tool.todoon] in pyproject.toml
+        pyproject_settings = read_pyproject_settings(pyproject_path)
+
+        if pyproject_settings is None:
+            warnings.append(("warning_pyproject_not_read", pyproject_path))
+            pyproject_settings = {}
+
+        for key, value in pyproject_settings.items():
+            field = key.replace("-", "_")
+
+            if field in _FIELD_TYPES:
+                resolved[field] = value
+            else:
+                warnings.append(("warning_unknown_setting", key))
+
+        # Environment variables
+        for variable, field in _ENVIRONMENT_VARIABLES.items():
+            if variable in os.environ:
+                resolved[field] = os.environ[variable]
+
+        # Command line options
+        if cli_options is not None:
+            for field, value in cli_options.items():
+                if value is not None:
+                    resolved[field] = value
+
+        settings = cls._from_raw(resolved, log_level)
+
+        for key, detail in warnings:
+            util.print_wrap(
+                log_level=log_level,
+                msg=f"{util.loc(key, settings.region)}: {detail}",
+                file=sys.stderr,
+            )
+
+        return settings
+
+    @classmethod
+    def _from_raw(cls, raw: dict, log_level=util.LOG_LEVEL_NORMAL) -> "Settings":
+        defaults = cls()
+        values = {}
+
+        for field, _type in _FIELD_TYPES.items():
+            if field not in raw:
+                continue
+
+            if _type is bool:
+                values[field] = util.parse_bool(raw[field])
+            elif _type is int:
+                values[field] = util.parse_int(raw[field], getattr(defaults, field))
+            else:
+                values[field] = str(raw[field])
+
+        # Validate that we support the region and OS, otherwise default to something we have
+        region = values.get("region", defaults.region)
+        if region not in LOCALIZE:
+            util.print_wrap(
+                log_level=log_level,
+                msg=f"{LOCALIZE['en_us']['warning_using_default_region']} {region}",
+                file=sys.stderr,
+            )
+            region = defaults.region
+        values["region"] = region
+
+        _os = values.get("operating_system", defaults.operating_system).lower()
+        if _os not in LOCALIZE:
+            util.print_wrap(
+                log_level=log_level,
+                msg=f"{util.loc('warning_using_default_os', region)} {_os}",
+                file=sys.stderr,
+            )
+            _os = defaults.operating_system
+        values["operating_system"] = _os
+
+        return cls(**values)
+
+
+_FIELD_TYPES = {field.name: field.type for field in dataclasses.fields(Settings)}
+
+_ENVIRONMENT_VARIABLES = {
+    "REGION": "region",
+    "OS": "operating_system",
+    "DEBUG": "is_debug",
+    "MAXIMUM_ISSUES_GENERATED": "max_issues",
+    "PERTINENT_LINE_LIMIT": "pertinent_line_limit",
+}
+
+
+def read_pyproject_settings(pyproject_path: str) -> dict or None:
+    """
+    :param pyproject_path: Path-like pointing to a pyproject.toml
+    :return: The contents of its [tool.todoon] table, empty if there is no such file or table, None if the file can
+     not be read
+    """
+    try:
+        with open(pyproject_path, "rb") as pyproject:
+            _pyproject = tomllib.load(pyproject)
+    except FileNotFoundError:
+        return {}
+    # e.g. a directory or a file without read permission where the pyproject.toml would be
+    except (OSError, tomllib.TOMLDecodeError, UnicodeDecodeError):
+        return None
+
+    return _pyproject.get("tool", {}).get("todoon", {})
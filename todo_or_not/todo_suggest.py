@@ -0,0 +1,329 @@
+import codecs
+import os
+import re
+import time
+
+from todo_or_not.localize import SUPPORTED_ENCODINGS_TODO_CHECK
+from todo_or_not.utility import loc
+
+# Directories that are nearly always someone else's code or build output, by name
+DIRECTORY_REASONS = {
+    "node_modules": "vendored",
+    "bower_components": "vendored",
+    "vendor": "vendored",
+    "third_party": "vendored",
+    "third-party": "vendored",
+    "site-packages": "vendored",
+    ".venv": "vendored",
+    "venv": "vendored",
+    "dist": "generated",
+    "build": "generated",
+    "__pycache__": "generated",
+    ".tox": "generated",
+    ".mypy_cache": "generated",
+    ".pytest_cache": "generated",
+    ".git": "generated",
+    ".hg": "generated",
+    ".svn": "generated",
+}
+
+# Files that are written by tools rather than people, by name
+GENERATED_FILE_PATTERNS = [
+    re.compile(pattern)
+    for pattern in [
+        r".*\.min\.(js|css)",
+        r".*\.(js|css)\.map",
+        r".*_pb2(_grpc)?\.pyi?",
+        r".*\.pb\.(go|cc|h)",
+        r".*\.(g|generated)\.\w+",
+        r"package-lock\.json",
+        r"yarn\.lock",
+        r"pnpm-lock\.yaml",
+        r"poetry\.lock",
+        r"Cargo\.lock",
+        r"go\.sum",
+    ]
+]
+
+# Markers tools leave in the first lines of what they generate
+GENERATED_MARKERS = [b"@generated", b"DO NOT EDIT", b"auto-generated", b"autogenerated"]
+
+# A line longer than this in the first block of a file is taken to be minified code or data
+LONG_LINE_LENGTH = 1000
+
+SAMPLE_SIZE = 8192
+
+# The order suggestions of the same cost are listed in
+REASONS = ["vendored", "generated", "minified", "binary", "encoding", "long-lines"]
+
+# What each reason is called in a comment of the .todo-ignore # todoon
+REASON_KEYS = {
+    "vendored": "suggest_reason_vendored",
+    "generated": "suggest_reason_generated",
+    "minified": "suggest_reason_minified",
+    "binary": "suggest_reason_binary",
+    "encoding": "suggest_reason_encoding",
+    "long-lines": "suggest_reason_long_lines",
+}
+
+
+class Suggestion:
+    """An entry the .todo-ignore could have, with what scanning the paths it ignores costs"""  # todoon
+
+    __slots__ = ("entry", "reason", "size", "number_of_files")
+
+    def __init__(
+        self, entry: str, reason: str, size: int = 0, number_of_files: int = 0
+    ):
+        """
+        :param entry: The line of the .todo-ignore, relative to its directory and "/" separated # todoon
+        :param reason: Why it is suggested, one of REASONS
+        :param size: Bytes of the files it ignores
+        :param number_of_files: How many files it ignores
+        """
+        self.entry = entry
+        self.reason = reason
+        self.size = size
+        self.number_of_files = number_of_files
+
+    def __repr__(self):
+        return f"Suggestion({self.entry!r}, {self.reason!r}, {self.size}, {self.number_of_files})"
+
+
+def _is_text(sample: bytes) -> bool:
+    # Text in UTF-16 is mostly NUL bytes, but starts with a byte order mark
+    if sample.startswith(codecs.BOM_UTF16_LE) or sample.startswith(codecs.BOM_UTF16_BE):
+        return True
+
+    return b"\0" not in sample
+
+
+def _decodes(sample: bytes) -> bool:
+    for encoding in SUPPORTED_ENCODINGS_TODO_CHECK:
+        # A sample may end part of the way through a character
+        decoder = codecs.getincrementaldecoder(encoding)()
+
+        try:
+            decoder.decode(sample, final=False)
+        except UnicodeError:
+            continue
+
+        return True
+
+    return False
+
+
+def classify_file(path: str, sample_size: int = SAMPLE_SIZE) -> str or None:
+    """
+    Decides whether a file is worth ignoring from its name and its first block, without scanning it
+    :param path: Path-like of the file
+    :param sample_size: How many bytes at the start of the file are read
+    :return: Why it should be ignored (one of REASONS), None if it should not be
+    """
+    basename = os.path.basename(path)
+
+    try:
+        with open(path, "rb") as file:
+            sample = file.read(sample_size)
+    except OSError:
+        return None
+
+    if not _is_text(sample):
+        return "binary"
+    if not _decodes(sample):
+        return "encoding"
+
+    lines = sample.split(b"\n")
+
+    if any(pattern.fullmatch(basename) for pattern in GENERATED_FILE_PATTERNS):
+        return "minified" if ".min." in basename else "generated"
+    if any(marker in line for line in lines[:5] for marker in GENERATED_MARKERS):
+        return "generated"
+    if max(len(line) for line in lines) > LONG_LINE_LENGTH:
+        return "long-lines"
+
+    return None
+
+
+def suggest_todo_ignore(
+    paths: list[str], root: str, failed_encodings: set[str] = None
+) -> tuple[list[Suggestion], int]:  # todoon
+    """
+    Finds what the .todo-ignore could ignore to make scans faster, from a dry walk of the files they would scan # todoon
+    :param paths: Path-likes of the files todoon would scan
+    :param root: Path-like of the directory of the .todo-ignore # todoon
+    :param failed_encodings: Path-likes of files already known not to be in a supported encoding, e.g. from a cache
+    :return:
+     | The suggestions, most bytes first. A directory is suggested instead of its files if all of them are
+      generated or minified
+     | Bytes of the files todoon would scan
+    """
+    root = os.path.abspath(root)
+    failed_encodings = {os.path.abspath(path) for path in failed_encodings or []}
+
+    # Relative, "/" separated path of each file to why it should be ignored (or None) and its size
+    files = {}
+    total_size = 0
+
+    for path in paths:
+        path = os.path.abspath(path)
+        relative_path = os.path.relpath(path, root).replace(os.sep, "/")
+
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            continue
+
+        total_size += size
+        parts = relative_path.split("/")
+
+        # Known directories are suggested whole, their files are not read at all
+        directory_reason = None
+        for i, part in enumerate(parts[:-1]):
+            if part in DIRECTORY_REASONS:
+                directory_reason = ("/".join(parts[: i + 1]), DIRECTORY_REASONS[part])
+                break
+
+        if directory_reason is not None:
+            files[relative_path] = (directory_reason, size)
+        elif path in failed_encodings:
+            files[relative_path] = ((None, "encoding"), size)
+        else:
+            files[relative_path] = ((None, classify_file(path)), size)
+
+    # How many files are under each directory, and whether every one of them is generated or minified
+    generated_dirs = {}
+    for relative_path, ((directory, reason), _size) in files.items():
+        if directory is not None:
+            continue
+
+        parts = relative_path.split("/")
+        for i in range(1, len(parts)):
+            _directory = "/".join(parts[:i])
+            number_of_files, is_generated = generated_dirs.get(_directory, (0, True))
+
+            generated_dirs[_directory] = (
+                number_of_files + 1,
+                is_generated and reason in ("generated", "minified"),
+            )
+
+    suggestions = {}
+
+    for relative_path, ((directory, reason), size) in files.items():
+        if directory is None and reason is None:
+            continue
+
+        if directory is None:
+            parts = relative_path.split("/")
+
+            # The highest directory that has nothing but generated files, and more than one of them
+            for i in range(1, len(parts)):
+                number_of_files, is_generated = generated_dirs["/".join(parts[:i])]
+
+                if is_generated and number_of_files > 1:
+                    directory = "/".join(parts[:i])
+                    reason = "generated"
+                    break
+
+        entry = directory + "/" if directory is not None else relative_path
+
+        if entry not in suggestions:
+            suggestions[entry] = Suggestion(entry, reason)
+
+        suggestions[entry].size += size
+        suggestions[entry].number_of_files += 1
+
+    ranked = sorted(
+        suggestions.values(),
+        key=lambda suggestion: (
+            -suggestion.size,
+            REASONS.index(suggestion.reason),
+            suggestion.entry,
+        ),
+    )
+
+    return ranked, total_size
+
+
+def measure_throughput(paths: list[str], scan, budget: int = 1 << 20) -> float or None:
+    """
+    Times scanning some of the files todoon would scan, to estimate how long the rest would take
+    :param paths: Path-likes of files to scan, until the budget is spent
+    :param scan: Callable scanning one path
+    :param budget: Bytes to scan at most
+    :return: Bytes scanned per second, None if nothing was
+    """
+    scanned = 0
+    paths = iter(paths)
+
+    # Parsers are built the first time a language is scanned, once per run rather than per file
+    for path in paths:
+        if os.path.isfile(path):
+            scan(path)
+            break
+
+    start = time.perf_counter()
+
+    for path in paths:
+        if scanned >= budget:
+            break
+
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            continue
+
+        scan(path)
+        scanned += size
+
+    elapsed = time.perf_counter() - start
+
+    if scanned == 0 or elapsed <= 0:
+        return None
+
+    return scanned / elapsed
+
+
+def format_size(size: int) -> str:
+    """
+    :param size: A number of bytes
+    :return: The size in the largest unit it is at least one of, e.g. "1.5 MiB"
+    """
+    for unit in ["B", "KiB", "MiB", "GiB"]:
+        if size < 1024 or unit == "GiB":
+            return f"{size} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def format_suggestions(
+    suggestions: list[Suggestion],
+    total_size: int,
+    region: str,
+    throughput: float = None,
+) -> str:
+    """
+    :param suggestions: See suggest_todo_ignore
+    :param total_size: See suggest_todo_ignore
+    :param region: Region the comments are written for
+    :param throughput: Bytes scanned per second (see measure_throughput), times are not estimated if not given
+    :return: The suggestions as lines of a .todo-ignore, each after a comment with its cost # todoon
+    """
+    output = [
+        f"# {loc('suggest_would_be_scanned', region)}: {format_size(total_size)}, "
+        f"{loc('suggest_save_the_most', region)}"
+    ]
+
+    for suggestion in suggestions:
+        cost = f"{format_size(suggestion.size)}"
+        if total_size > 0:
+            cost += f" ({100 * suggestion.size / total_size:.1f}%)"
+        if throughput:
+            cost += f", ~{suggestion.size / throughput:.2f}s"
+
+        output.append(
+            f"# {loc(REASON_KEYS[suggestion.reason], region)}: {cost}, "
+            f"{suggestion.number_of_files} {loc('suggest_files', region)}"
+        )
+        output.append(suggestion.entry)
+
+    return "\n".join(output)
@@ -0,0 +1,590 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+import todo_or_not.utility as util
+from todo_or_not.localize import LOCALIZE
+from todo_or_not.todo_app import TodoRun
+from todo_or_not.todo_gitignore import GitIgnore
+from todo_or_not.todo_ignore import NestedTodoIgnore, find_matches
+from todo_or_not.todo_hit import Hit
+from todo_or_not.todo_settings import Settings
+from todo_or_not.utility import loc
+
+
+class WatchedPaths:
+    """
+    The files todoon would scan, decided by the .todo-ignore as it was compiled at startup or by the paths given
+    on the command line
+    """
+
+    def __init__(
+        self,
+        roots: list[str],
+        ignored_files: list[str] = None,
+        ignored_dirs: list[str] = None,
+        ignored_patterns: list[str] = None,
+        gitignore: GitIgnore = None,
+        nested_ignore: NestedTodoIgnore = None,
+    ):
+        """
+        :param roots: Path-likes of the files and directories to watch
+        :param ignored_files: Path-likes of files to never scan
+        :param ignored_dirs: Path-likes of directories to never descend into
+        :param ignored_patterns: Wildcard paths from the .todo-ignore, matched again as files appear
+        :param gitignore: If given, what it ignores is not scanned either
+        :param nested_ignore: If given, what the .todo-ignore files below the top level ignore is not scanned either
+        """
+        self.roots = [os.path.abspath(root) for root in roots]
+        self.ignored_patterns = ignored_patterns or []
+        self.gitignore = gitignore
+        self.nested_ignore = nested_ignore
+
+        self._ignored_files = {os.path.realpath(f) for f in ignored_files or []}
+        self._ignored_dirs = {os.path.realpath(d) for d in ignored_dirs or []}
+        self._ignored_matches = set()
+
+        self.refresh()
+
+    def refresh(self):
+        """
+        Resolves the wildcards of the .todo-ignore again, so files created since they were last resolved are ignored
+        """
+        self._ignored_matches = set()
+
+        for pattern in self.ignored_patterns:
+            for match in find_matches(pattern):
+                self._ignored_matches.add(os.path.realpath(match))
+
+    def get_ignore_files(self) -> set[str]:
+        """
+        :return: Paths of the .gitignore and nested .todo-ignore files read so far, including those that did not exist # todoon
+        """
+        paths = set()
+
+        if self.gitignore is not None:
+            paths.update(self.gitignore.read_paths)
+        if self.nested_ignore is not None:
+            paths.update(self.nested_ignore.read_paths)
+
+        return paths
+
+    def should_descend(self, dirpath: str) -> bool:
+        """
+        :param dirpath: Path-like of a directory
+        :return: Whether the files in this directory may be scanned
+        """
+        if self.gitignore is not None and self.gitignore.is_excluded(
+            dirpath, is_dir=True
+        ):
+            return False
+
+        if self.nested_ignore is not None and self.nested_ignore.is_excluded(
+            dirpath, is_dir=True
+        ):
+            return False
+
+        return os.path.realpath(dirpath) not in self._ignored_dirs
+
+    def should_scan(self, path: str) -> bool:
+        """
+        :param path: Path-like of a file, which may no longer exist
+        :return: Whether this file is watched and not ignored
+        """
+        path = os.path.abspath(path)
+
+        if not any(
+            path == root or path.startswith(root + os.sep) for root in self.roots
+        ):
+            return False
+
+        real_path = os.path.realpath(path)
+        if real_path in self._ignored_files or real_path in self._ignored_matches:
+            return False
+
+        if self.gitignore is not None and self.gitignore.is_excluded(path):
+            return False
+
+        if self.nested_ignore is not None and self.nested_ignore.is_excluded(path):
+            return False
+
+        parent = os.path.dirname(real_path)
+        while True:
+            if parent in self._ignored_dirs:
+                return False
+
+            _next = os.path.dirname(parent)
+            if _next == parent:
+                return True
+            parent = _next
+
+    def walk(self, root: str = None):
+        """
+        Yields every file under the root that should be scanned, without descending into ignored directories
+        :param root: Path-like of a file or directory to walk, defaults to all watched roots
+        """
+        for _root in [root] if root is not None else self.roots:
+            if os.path.isfile(_root):
+                if self.should_scan(_root):
+                    yield _root
+                continue
+
+            for dirpath, dirnames, filenames in os.walk(_root, topdown=True):
+                dirnames[:] = [
+                    dirname
+                    for dirname in dirnames
+                    if self.should_descend(os.path.join(dirpath, dirname))
+                ]
+
+                for filename in filenames:
+                    path = os.path.join(dirpath, filename)
+
+                    if self.should_scan(path):
+                        yield path
+
+
+def _hit_key(hit: Hit) -> tuple:
+    # Hits are told apart by their text rather than their line number, so editing above a hit doesn't report it
+    return (
+        hit.source_file,
+        tuple(sorted(hit.found_keys)),
+        hit.get_triggering_line().strip(),
+    )
+
+
+def _difference(hits: list[Hit], other_hits: list[Hit]) -> list[Hit]:
+    """
+    :return: The hits that are not in the other hits, counting repeated hits individually
+    """
+    remaining = {}
+    for hit in other_hits:
+        key = _hit_key(hit)
+        remaining[key] = remaining.get(key, 0) + 1
+
+    output = []
+    for hit in hits:
+        key = _hit_key(hit)
+
+        if remaining.get(key, 0) > 0:
+            remaining[key] -= 1
+        else:
+            output.append(hit)
+
+    return output
+
+
+class HitIndex:
+    """
+    In-memory index of the hits in each scanned file, so a change to one file only needs that file rescanned
+    """
+
+    def __init__(self, scan):
+        """
+        :param scan: Called with the path of a file, returns its hits and detected encoding (see find_hits)
+        """
+        self.scan = scan
+        self.hits = {}
+        self.encodings = {}
+
+    def update(self, path: str) -> tuple[list[Hit], list[Hit]]:
+        """
+        Rescans a file, or forgets it if it no longer exists
+        :param path: Path-like of the file that changed
+        :return: The hits added and the hits removed by the change
+        """
+        before = self.hits.pop(path, [])
+        self.encodings.pop(path, None)
+
+        after = []
+        if os.path.isfile(path):
+            try:
+                after, self.encodings[path] = self.scan(path)
+                self.hits[path] = after
+            except OSError:
+                # Deleted or replaced while being read, the next event for it will bring it back
+                after = []
+
+        return _difference(after, before), _difference(before, after)
+
+    def fill_run(self, this_run: TodoRun, paths: list[str] = None):
+        """
+        Sets the counters of a TodoRun from the index
+        :param this_run: The run to fill in
+        :param paths: Only count these files, counts every file in the index if not given
+        """
+        if paths is None:
+            paths = self.encodings.keys()
+        paths = [path for path in paths if path in self.encodings]
+
+        this_run.number_of_files_scanned = len(paths)
+        this_run.number_of_encoding_failures = sum(
+            1 for path in paths if self.encodings[path] is None
+        )
+
+        for path in paths:
+            for hit in self.hits[path]:
+                this_run.number_of_hits += 1
+                this_run.number_of_todo += 1 if "todo" in hit.found_keys else 0
+                this_run.number_of_fixme += 1 if "fixme" in hit.found_keys else 0
+
+
+class PollingWatcher:
+    """
+    Finds changed files by comparing the size and modification time of every watched file, works anywhere
+    """
+
+    def __init__(self, paths: WatchedPaths, interval: float = 1.0):
+        """
+        :param paths: The files to watch
+        :param interval: Seconds to wait between each look at the files
+        """
+        self.paths = paths
+        self.interval = interval
+
+        self._snapshot = self._take_snapshot()
+
+    def _take_snapshot(self) -> dict:
+        snapshot = {}
+
+        for path in self.paths.walk():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+
+        return snapshot
+
+    def wait(self) -> set[str] or None:
+        """
+        Blocks until at least one watched file has been modified, created or deleted
+        :return: The paths of the changed files
+        """
+        while True:
+            time.sleep(self.interval)
+
+            snapshot = self._take_snapshot()
+            changed = {
+                path
+                for path in snapshot.keys() | self._snapshot.keys()
+                if snapshot.get(path) != self._snapshot.get(path)
+            }
+            self._snapshot = snapshot
+
+            if len(changed) > 0:
+                return changed
+
+    def close(self):
+        pass
+
+
+# From <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """
+    Finds changed files with Linux's inotify, so an idle tree costs nothing to watch
+    """
+
+    # IN_CLOSE_WRITE rather than IN_MODIFY so files are not scanned while they are still being written
+    mask = (
+        IN_CLOSE_WRITE
+        | IN_MOVED_FROM
+        | IN_MOVED_TO
+        | IN_CREATE
+        | IN_DELETE
+        | IN_DELETE_SELF
+    )
+
+    def __init__(self, paths: WatchedPaths, settle: float = 0.1):
+        """
+        :param paths: The files to watch
+        :param settle: Seconds without any new event before a batch of changes is reported
+        :raises OSError: If inotify is not available on this platform
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+
+        self.paths = paths
+        self.settle = settle
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self._watches = {}
+
+        try:
+            for root in self.paths.roots:
+                if os.path.isdir(root):
+                    self._add_tree(root)
+                else:
+                    self._add_watch(os.path.dirname(root))
+        except OSError:
+            self.close()
+            raise
+
+    def _add_watch(self, dirpath: str):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dirpath), self.mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed: {dirpath}")
+
+        self._watches[wd] = dirpath
+
+    def _drop_tree(self, dirpath: str):
+        """
+        Stops watching a directory and every directory under it, e.g. once it was moved away, as their events would
+        otherwise be reported under paths that no longer exist
+        """
+        for wd, watched in list(self._watches.items()):
+            if watched == dirpath or watched.startswith(os.path.join(dirpath, "")):
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._watches[wd]
+
+    def _add_tree(self, dirpath: str) -> set[str]:
+        """
+        Watches a directory and every directory under it
+        :return: The files already in the tree, as they may have been written before the watches were added
+        """
+        found = set()
+
+        for _dirpath, dirnames, filenames in os.walk(dirpath, topdown=True):
+            dirnames[:] = [
+                dirname
+                for dirname in dirnames
+                if self.paths.should_descend(os.path.join(_dirpath, dirname))
+            ]
+
+            self._add_watch(_dirpath)
+
+            found.update(os.path.join(_dirpath, filename) for filename in filenames)
+
+        return found
+
+    def _read_events(self) -> set[str] or None:
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+
+        while offset < len(data):
+            wd, event_mask, _cookie, length = _INOTIFY_EVENT.unpack_from(data, offset)
+            offset += _INOTIFY_EVENT.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+
+            # Events were lost, the caller must treat every file as changed
+            if event_mask & IN_Q_OVERFLOW:
+                return None
+
+            if event_mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+
+            dirpath = self._watches.get(wd)
+            if dirpath is None:
+                continue
+
+            # The kernel drops the watch of a deleted directory by itself, only IN_IGNORED follows
+            if event_mask & IN_DELETE_SELF:
+                del self._watches[wd]
+                changed.add(dirpath)
+                continue
+
+            path = os.path.join(dirpath, name)
+
+            if event_mask & IN_ISDIR and event_mask & IN_MOVED_FROM:
+                # If it was moved within the tree, IN_MOVED_TO watches it again under its new path
+                self._drop_tree(path)
+                changed.add(path)
+            elif event_mask & IN_ISDIR and event_mask & (IN_CREATE | IN_MOVED_TO):
+                if self.paths.should_descend(path):
+                    try:
+                        changed.update(self._add_tree(path))
+                    except OSError:
+                        # Gone again already
+                        continue
+            else:
+                changed.add(path)
+
+        return changed
+
+    def wait(self) -> set[str] or None:
+        """
+        Blocks until at least one watched file has been modified, created or deleted
+        :return: The paths of the changed files (or directories, if removed), None if events were lost
+        """
+        changed = set()
+
+        while len(changed) == 0:
+            timeout = None
+
+            # Editors often save in several steps, keep gathering events until they settle
+            while select.select([self._fd], [], [], timeout)[0]:
+                _changed = self._read_events()
+                if _changed is None:
+                    return None
+
+                changed.update(_changed)
+                timeout = self.settle
+
+        return changed
+
+    def close(self):
+        os.close(self._fd)
+
+
+def create_watcher(
+    paths: WatchedPaths, settings: Settings, log_level=util.LOG_LEVEL_NORMAL
+):
+    """
+    :param settings: Settings resolved for this run
+    :return: An InotifyWatcher where inotify is available, otherwise a PollingWatcher
+    """
+    try:
+        return InotifyWatcher(paths)
+    except (OSError, AttributeError, TypeError):
+        util.print_wrap(
+            log_level=log_level,
+            msg_level=util.LOG_LEVEL_VERBOSE,
+            msg=loc("info_watch_polling", settings.region),
+            file=sys.stderr,
+        )
+        return PollingWatcher(paths)
+
+
+def watch(
+    targets: list[str],
+    paths: WatchedPaths,
+    scan,
+    run_options: dict,
+    settings: Settings,
+    log_level=util.LOG_LEVEL_NORMAL,
+    watcher=None,
+    max_batches: int = None,
+):
+    """
+    Scans the targets once, then rescans only the files that change and prints the hits added and removed by
+    each change along with an updated summary, until interrupted
+    :param targets: Path-likes of the files to scan at first
+    :param paths: The files to watch afterward
+    :param scan: Called with the path of a file, returns its hits and detected encoding (see find_hits)
+    :param run_options: The options todoon was run with, used to summarize each change
+    :param settings: Settings resolved for this run
+    :param log_level: The importance of any feedback prints (e.g. 0=NONE, 3=VERBOSE)
+    :param watcher: Watcher to wait on for changes, created with create_watcher if not given
+    :param max_batches: Stop after this many batches of changes, watches forever if not given
+    """
+    index = HitIndex(scan)
+
+    os.environ["TODOON_STATUS"] = "scanning-files"
+
+    for target in targets:
+        added, _ = index.update(os.path.abspath(target))
+
+        for hit in added:
+            util.print_wrap(log_level=log_level, msg=hit, file=sys.stderr)
+
+    _print_summary(index, run_options, settings, log_level)
+
+    if watcher is None:
+        watcher = create_watcher(paths, settings, log_level)
+
+    os.environ["TODOON_STATUS"] = "watching"
+    util.print_wrap(
+        log_level=log_level,
+        msg=f"{loc('info_watch_started', settings.region)} "
+        f"[{LOCALIZE[settings.operating_system]['shell_sigint']}]",
+        file=sys.stderr,
+    )
+    util.flush_output()
+
+    batches = 0
+    try:
+        while max_batches is None or batches < max_batches:
+            changed = watcher.wait()
+            batches += 1
+
+            paths.refresh()
+
+            if changed is None:
+                # Events were lost, so anything may have changed
+                changed = set(index.hits.keys()) | set(paths.walk())
+
+            changed_files = set()
+            for path in changed:
+                path = os.path.abspath(path)
+
+                if path in index.hits or os.path.isfile(path):
+                    changed_files.add(path)
+                else:
+                    # A removed directory takes all of its files with it
+                    changed_files.update(
+                        indexed
+                        for indexed in index.hits.keys()
+                        if indexed.startswith(path + os.sep)
+                    )
+
+            any_changes = False
+            for path in sorted(changed_files):
+                if path not in index.hits and not paths.should_scan(path):
+                    continue
+
+                added, removed = index.update(path)
+
+                for hit in removed:
+                    util.print_wrap(
+                        log_level=log_level, msg=lambda: f"- {hit}", file=sys.stderr
+                    )
+                for hit in added:
+                    util.print_wrap(
+                        log_level=log_level, msg=lambda: f"+ {hit}", file=sys.stderr
+                    )
+
+                any_changes = any_changes or len(added) > 0 or len(removed) > 0
+
+            if any_changes:
+                _print_summary(index, run_options, settings, log_level)
+
+            # Each batch of changes is shown as soon as it has been scanned
+            util.flush_output()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+        util.flush_output()
+
+    return index
+
+
+def _print_summary(index: HitIndex, run_options: dict, settings: Settings, log_level):
+    this_run = TodoRun(run_options, settings)
+    index.fill_run(this_run)
+
+    util.print_wrap(
+        log_level=log_level,
+        msg_level=util.LOG_LEVEL_SUMMARY_ONLY,
+        msg=this_run.generate_summary_message,
+        file=sys.stderr,
+    )
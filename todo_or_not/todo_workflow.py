@@ -0,0 +1,158 @@
+import os
+import uuid
+
+from todo_or_not.todo_output import hit_to_record
+from todo_or_not.utility import loc
+
+# The most written to $GITHUB_ENV or $GITHUB_OUTPUT at once, far more than todoon ever sets
+MAX_WORKFLOW_FILE_WRITE = 64 * 1024
+
+# GitHub rejects a job summary of more than 1 MiB per step, so the summary is kept well under that
+MAX_STEP_SUMMARY_SIZE = 256 * 1024
+
+# Hits listed in the job summary, the rest are only counted
+MAX_STEP_SUMMARY_HITS = 200
+
+
+def format_workflow_variables(variables: dict) -> list[str]:
+    """
+    :param variables: Names and values, e.g. {"TODOON_STATUS": "finished"}
+    :return: An entry for each, as read from $GITHUB_ENV and $GITHUB_OUTPUT. Values spanning lines are written
+     between delimiters, so they can not set other variables
+    """
+    entries = []
+
+    for name, value in variables.items():
+        value = str(value)
+
+        if "\n" in value or "\r" in value:
+            delimiter = f"ghadelimiter_{uuid.uuid4()}"
+            entries.append(f"{name}<<{delimiter}\n{value}\n{delimiter}\n")
+        else:
+            entries.append(f"{name}={value}\n")
+
+    return entries
+
+
+def append_to_workflow_file(
+    path: str, entries: list[str], max_size: int = MAX_WORKFLOW_FILE_WRITE
+) -> int:
+    """
+    Appends to a file the runner reads between steps in one write, so it is never read with half of an entry and
+    lines of other processes appending to it are never interleaved with these
+    :param path: Path-like of the file, e.g. $GITHUB_ENV
+    :param entries: Appended in order, only whole entries are appended
+    :param max_size: The most bytes appended, entries past this are left out
+    :return: The number of entries appended
+    :raises OSError: If the file can not be written
+    """
+    contents = bytearray()
+    number_appended = 0
+
+    for entry in entries:
+        encoded = entry.encode("utf-8")
+
+        if len(contents) + len(encoded) > max_size:
+            break
+
+        contents.extend(encoded)
+        number_appended += 1
+
+    descriptor = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    try:
+        view = memoryview(contents)
+        while len(view) > 0:
+            view = view[os.write(descriptor, view) :]
+    finally:
+        os.close(descriptor)
+
+    return number_appended
+
+
+def _cell(value) -> str:
+    # Pipes would end the cell and new lines the row
+    return str(value).replace("|", "\\|").replace("\n", " ").strip()
+
+
+def _timing_row(name: str, histogram) -> str:
+    mean = 1000 * histogram.sum / histogram.count if histogram.count > 0 else 0.0
+
+    return f"| {name} | {histogram.count} | {histogram.sum:.3f} | {mean:.1f} |\n"
+
+
+def format_step_summary(
+    this_run,
+    hits: list,
+    max_hits: int = MAX_STEP_SUMMARY_HITS,
+    max_size: int = MAX_STEP_SUMMARY_SIZE,
+) -> str:
+    """
+    :param this_run: A finished TodoRun
+    :param hits: The first hits found, no more than max_hits are listed however many there are
+    :param max_hits: The most hits listed
+    :param max_size: The most bytes of Markdown, hits past this are only counted
+    :return: A Markdown summary of the run for $GITHUB_STEP_SUMMARY in the region of the run, its counts, timings
+     and a table of hits
+    """
+    region = this_run.resolved_settings.region
+
+    summary = (
+        "## todoon\n\n"
+        f"| TODO | FIXME | {loc('step_summary_files_scanned', region)} | "  # todoon
+        f"{loc('step_summary_encoding_errors', region)} | {loc('step_summary_issues_created', region)} |\n"
+        "| ---: | ---: | ---: | ---: | ---: |\n"
+        f"| {this_run.number_of_todo} | {this_run.number_of_fixme} | {this_run.number_of_files_scanned} | "
+        f"{this_run.number_of_encoding_failures} | {this_run.number_of_issues} |\n\n"
+        f"| {loc('step_summary_timing', region)} | {loc('step_summary_count', region)} | "
+        f"{loc('step_summary_total_seconds', region)} | {loc('step_summary_mean_milliseconds', region)} |\n"
+        "| :--- | ---: | ---: | ---: |\n"
+        + _timing_row(
+            loc("step_summary_scanning_files", region), this_run.file_scan_latency
+        )
+        + _timing_row(
+            loc("step_summary_listing_issues", region),
+            this_run.api_latency["list_issues"],
+        )
+        + _timing_row(
+            loc("step_summary_creating_issues", region),
+            this_run.api_latency["create_issue"],
+        )
+        + f"| {loc('step_summary_whole_run', region)} | 1 | {this_run.get_duration():.3f} | "
+        f"{1000 * this_run.get_duration():.1f} |\n"
+    )
+
+    if this_run.number_of_hits == 0:
+        return summary
+
+    summary += (
+        f"\n| {loc('step_summary_file', region)} | {loc('step_summary_line', region)} | "
+        f"{loc('step_summary_keywords', region)} | {loc('step_summary_title', region)} |\n"
+        "| :--- | ---: | :--- | :--- |\n"
+    )
+
+    # Room is kept for the note of how many hits are not listed
+    remaining = max_size - len(summary.encode("utf-8")) - 64
+    number_listed = 0
+
+    for hit in hits[:max_hits]:
+        record = hit_to_record(hit)
+        row = (
+            f"| `{_cell(record['file'])}` | {record['line']} | "
+            f"{_cell(', '.join(record['keywords']))} | {_cell(record['title'])} |\n"
+        )
+
+        remaining -= len(row.encode("utf-8"))
+        if remaining < 0:
+            break
+
+        summary += row
+        number_listed += 1
+
+    if number_listed < this_run.number_of_hits:
+        summary += (
+            f"\n_{this_run.number_of_hits - number_listed} "
+            f"{loc('step_summary_hits_not_listed', region)}_\n"
+        )
+
+    return summary
@@ -1,6 +1,10 @@
+import atexit
 import hashlib
 import os
+import stat
 import sys
+import tempfile
+import threading
 
 import todo_or_not
 from todo_or_not.localize import LOCALIZE
@@ -11,11 +15,112 @@ LOG_LEVEL_NORMAL = 2
 LOG_LEVEL_VERBOSE = 3
 
 
-def print_wrap(
-    msg: str, msg_level=LOG_LEVEL_NORMAL, log_level=LOG_LEVEL_NORMAL, file=sys.stdout
-):
-    if msg_level <= log_level:
-        print(msg, file=file)
+class _OutputBuffer:
+    """
+    Lines printed through print_wrap, written to their stream a block at a time rather than one write per line.
+    Lines for another stream write out what is pending first, so lines keep their order
+    """
+
+    def __init__(self, limit: int = 64 * 1024):
+        """
+        :param limit: Characters held before they are written
+        """
+        self.limit = limit
+
+        self._file = None
+        self._pending = []
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def write(self, text: str, file):
+        with self._lock:
+            if file is not self._file:
+                self._flush()
+                self._file = file
+
+            self._pending.append(text)
+            self._size += len(text)
+
+            if self._size >= self.limit:
+                self._flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if self._file is not None and len(self._pending) > 0:
+            try:
+                self._file.write("".join(self._pending))
+                self._file.flush()
+            except (OSError, ValueError):
+                # The stream was closed, e.g. stdout of a pipe whose reader has exited
+                pass
+
+        self._pending = []
+        self._size = 0
+
+
+_output_buffer = _OutputBuffer()
+
+
+def flush_output():
+    """
+    Writes out everything printed through print_wrap so far, at the end of each phase of a run and at exit
+    """
+    _output_buffer.flush()
+
+
+atexit.register(flush_output)
+
+
+def print_wrap(msg, msg_level=LOG_LEVEL_NORMAL, log_level=LOG_LEVEL_NORMAL, file=None):
+    """
+    :param msg: What to print, or a callable returning it, which is only called (and the message only built) if it
+     will be printed
+    :param msg_level: The importance of the message, it is printed if it is no greater than log_level
+    :param log_level: The importance of any feedback prints (e.g. 0=NONE, 3=VERBOSE)
+    :param file: The stream to print to, stdout if not given. The line is buffered, see flush_output
+    """
+    if msg_level > log_level:
+        return
+
+    if callable(msg):
+        msg = msg()
+
+    _output_buffer.write(f"{msg}\n", file if file is not None else sys.stdout)
+
+
+def write_atomically(path: str, contents: bytes):
+    """
+    Writes a file through a temporary file in the same directory, so readers only ever see it whole. The file keeps
+    its mode if it already exists, otherwise it is created as open() would create it
+    :param path: Path-like of the file written
+    :param contents: Everything written to it
+    """
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        # The umask can only be read by setting it
+        umask = os.umask(0o022)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+
+    descriptor, temporary_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp"
+    )
+
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(contents)
+
+        # mkstemp creates the file only readable and writable by its owner
+        os.chmod(temporary_path, mode)
+
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
 
 
 def version_callback(log_level=LOG_LEVEL_NORMAL):
@@ -30,34 +135,34 @@ def get_todo_ignore_path():  # todoon
     return os.path.join(os.getcwd(), ".todo-ignore")  # todoon
 
 
-def get_is_debug():
-    _debug = os.environ.get("DEBUG", "False").lower()
-    if _debug == "true" or _debug == "yes"  or _debug == "y" or _debug == "1":
+def parse_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+
+    _value = str(value).lower()
+    if _value == "true" or _value == "yes" or _value == "y" or _value == "1":
         return True
     else:
         return False
 
 
-def get_max_issues():
-    _max_issues = os.environ.get("MAXIMUM_ISSUES_GENERATED", "8")
-
+def parse_int(value, default: int) -> int:
     try:
-        max_issues = int(_max_issues)
-    except ValueError:
-        max_issues = 8
+        return int(value)
+    except (TypeError, ValueError):
+        return default
 
-    return max_issues
 
+def get_is_debug():
+    return parse_bool(os.environ.get("DEBUG", "False"))
 
-def get_pertinent_line_limit():
-    _pertinent_line_limit = os.environ.get("PERTINENT_LINE_LIMIT", "8")
 
-    try:
-        pertinent_line_limit = int(_pertinent_line_limit)
-    except ValueError:
-        pertinent_line_limit = 8
+def get_max_issues():
+    return parse_int(os.environ.get("MAXIMUM_ISSUES_GENERATED", "8"), 8)
+
 
-    return pertinent_line_limit
+def get_pertinent_line_limit():
+    return parse_int(os.environ.get("PERTINENT_LINE_LIMIT", "8"), 8)
 
 
 def get_region(log_level=LOG_LEVEL_NORMAL):
@@ -97,11 +202,10 @@ def sha1_hash(hit_str: str):
     return m.hexdigest()
 
 
-def loc(key: str):
+def loc(key: str, region: str):
     try:
-        localization = LOCALIZE[get_region()][key]
+        localization = LOCALIZE[region][key]
     except KeyError:
         localization = LOCALIZE["en_us"][key]
 
     return localization
-